@@ -0,0 +1,6 @@
+"""
+Benchmarks of the data layer and of the tournament logic.
+
+Each module can be launched from the src directory, for instance:
+python -m benchmarks.lookup
+"""
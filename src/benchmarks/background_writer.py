@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the time the arbiter waits when a finished tournament is saved
+synchronously and when it is handed over to the background writer.
+"""
+
+
+import os
+import tempfile
+import time
+
+from chess.models.database import DataBaseHandler
+from chess.models.writer import BackgroundWriter
+
+from benchmarks.fixtures import make_actors, play_tournament
+
+
+NB_TOURNAMENTS = 300
+NB_SAVES = 20
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        handler = DataBaseHandler(os.path.join(directory, "db.json"), write_behind=False)
+        actors = make_actors(64)
+        tournaments = []
+        for num in range(NB_TOURNAMENTS + 2 * NB_SAVES):
+            tournament = play_tournament(actors[num % 56:], seed=num)
+            tournament.tournament_id = f"{num + 1:08d}"
+            tournaments.append(tournament)
+        handler._upsert_documents([('tournament', handler._tournaments_index, 'tournament_id',
+                                    [tournament.tournament_to_dict() for tournament in tournaments[:NB_TOURNAMENTS]])])
+
+        start = time.perf_counter()
+        for tournament in tournaments[NB_TOURNAMENTS:NB_TOURNAMENTS + NB_SAVES]:
+            handler.export_finished_tournament(tournament)
+        synchronous = (time.perf_counter() - start) / NB_SAVES
+
+        writer = BackgroundWriter()
+        waited = 0
+        for tournament in tournaments[NB_TOURNAMENTS + NB_SAVES:]:
+            start = time.perf_counter()
+            writer.submit(handler.export_finished_tournament, tournament)
+            waited += time.perf_counter() - start
+            writer.flush()
+        print(f"{NB_TOURNAMENTS} tournaments in the database")
+        print(f"synchronous save:  {synchronous * 1e3:8.2f} ms")
+        print(f"background writer: {waited / NB_SAVES * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Pairs the next round of many sections of a league day, one after the other
+and with the batch pairing across processes, and checks that the rounds are the same.
+
+The speedup depends on the number of processors, and includes the start of the spawned workers.
+It has not been measured yet on a machine with several processors: on a single processor,
+the workers only add their start-up and the transfer of the jobs.
+"""
+
+
+import copy
+import os
+import random
+import time
+
+from chess.models.batch import init_next_rounds
+from chess.models.tournament import Tournament
+
+from benchmarks.fixtures import make_actors
+
+
+NB_SECTIONS = 32
+NB_PLAYERS = 400
+NB_PLAYED = 6
+
+
+def make_sections():
+    generator = random.Random(0)
+    sections = []
+    for num in range(NB_SECTIONS):
+        tournament = Tournament(f"Section {num + 1}", "Paris", "Bz", "")
+        tournament.define_players(make_actors(NB_PLAYERS + num % 2, seed=num))
+        for num_round in range(NB_PLAYED):
+            tournament.init_round(num_round)
+            winners = [generator.randint(0, 2) for _ in tournament.rounds[num_round].matches]
+            tournament.register_round_results(num_round, winners)
+        sections.append(tournament)
+    return sections
+
+
+def describe(rounds):
+    return [([(match.player1.player_id, match.player2.player_id) for match in r0und.matches.values()],
+             None if r0und.bye is None else r0und.bye.player_id) for r0und in rounds]
+
+
+def main():
+    sections = make_sections()
+    serial = copy.deepcopy(sections)
+    start = time.perf_counter()
+    for tournament in serial:
+        tournament.init_round(NB_PLAYED)
+    serial_time = time.perf_counter() - start
+    expected = describe([tournament.rounds[-1] for tournament in serial])
+    print(f"{NB_SECTIONS} sections of {NB_PLAYERS} players, round {NB_PLAYED + 1}, {os.cpu_count()} processors")
+    print(f"   init_round one by one: {serial_time * 1e3:7.1f} ms")
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        batch = copy.deepcopy(sections)
+        start = time.perf_counter()
+        rounds = init_next_rounds(batch, max_workers=workers)
+        duration = time.perf_counter() - start
+        assert describe(rounds) == expected
+        print(f"{workers:>3} worker processes: {duration * 1e3:7.1f} ms, speedup {serial_time / duration:4.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the number of writes and the bytes written by the export of new actors,
+one by one or with a single batch.
+"""
+
+
+import json
+import os
+import tempfile
+
+from chess.models.database import DataBaseHandler
+
+from benchmarks.fixtures import make_actors
+
+
+NB_ACTORS = 500
+
+
+def count_writes(handler):
+    """ Wraps the write method of the handler storage to count the writes and the bytes written.
+
+    :param handler: instance of DataBaseHandler.
+    :return: the dictionary of the counters, updated at each write.
+    """
+    counters = {"writes": 0, "bytes": 0}
+    write = handler.database.storage.write
+
+    def counting_write(data):
+        counters["writes"] += 1
+        counters["bytes"] += len(json.dumps(data))
+        write(data)
+
+    handler.database.storage.write = counting_write
+    return counters
+
+
+def bench_export(actors, one_by_one):
+    """ Exports the actors in an empty database.
+
+    :param actors: the actors to export.
+    :param one_by_one: True to export the actors one by one.
+    :return: the counters of writes and bytes.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        handler = DataBaseHandler(os.path.join(directory, "db.json"))
+        counters = count_writes(handler)
+        if one_by_one:
+            for actor in actors:
+                handler.export_actor(actor)
+        else:
+            handler.export_actors(actors)
+        handler.close()
+    return counters
+
+
+def main():
+    actors = make_actors(NB_ACTORS)
+    for label, one_by_one in [("one by one", True), ("batch", False)]:
+        counters = bench_export(actors, one_by_one)
+        print(f"{label:>12}: {counters['writes']:>5} writes, {counters['bytes']:>12} bytes written")
+
+
+if __name__ == "__main__":
+    main()
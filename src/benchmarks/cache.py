@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Replays the navigation of the report menus, which finds the same tournaments again and again,
+without cache and with the LRU cache of the deserialized tournaments, for each backend.
+"""
+
+
+import os
+import random
+import tempfile
+import time
+
+from chess.models.cache import TournamentCache
+from chess.models.database import DataBaseHandler
+from chess.models.packed_archive import PackedDataBaseHandler, write_packed_archive
+from chess.models.sqlite_database import SQLiteDataBaseHandler
+
+from benchmarks.fixtures import make_actors, play_tournament
+
+
+NB_TOURNAMENTS = 1000
+NB_LOOKUPS = 2000
+NB_VIEWED = 20
+
+
+def replay(handler, identifiers):
+    start = time.perf_counter()
+    for identifier in identifiers:
+        handler.find_tournament_by_id(identifier)
+    return time.perf_counter() - start
+
+
+def main():
+    generator = random.Random(0)
+    actors = make_actors(64)
+    serialized_tournaments = []
+    for num in range(NB_TOURNAMENTS):
+        tournament = play_tournament(actors[num % 56:], seed=num)
+        tournament.tournament_id = f"{num + 1:08d}"
+        serialized_tournaments.append(tournament.tournament_to_dict())
+    viewed = [f"{generator.randrange(NB_TOURNAMENTS) + 1:08d}" for _ in range(NB_VIEWED)]
+    identifiers = [generator.choice(viewed) for _ in range(NB_LOOKUPS)]
+    with tempfile.TemporaryDirectory() as directory:
+        handler = DataBaseHandler(os.path.join(directory, "db.json"), write_behind=False)
+        handler._upsert_documents([('tournament', handler._tournaments_index,
+                                    'tournament_id', serialized_tournaments)])
+        sqlite = SQLiteDataBaseHandler(os.path.join(directory, "db.sqlite3"))
+        with sqlite.connection:
+            for serialized_tournament in serialized_tournaments:
+                sqlite._insert_tournament(serialized_tournament, interrupted=False)
+        write_packed_archive(handler, os.path.join(directory, "archive.pack"))
+        packed = PackedDataBaseHandler(os.path.join(directory, "archive.pack"))
+        print(f"{NB_LOOKUPS} lookups among {NB_VIEWED} tournaments of {NB_TOURNAMENTS}")
+        for name, backend in [("tinydb", handler), ("sqlite", sqlite), ("packed", packed)]:
+            backend.cache = TournamentCache(max_entries=0)
+            without_cache = replay(backend, identifiers)
+            backend.cache = TournamentCache()
+            with_cache = replay(backend, identifiers)
+            stats = backend.cache.stats()
+            print(f"{name:>7}: without cache {without_cache * 1e3:8.1f} ms, with cache {with_cache * 1e3:6.1f} ms, "
+                  f"{stats['hits']} hits, {stats['misses']} misses, {stats['bytes'] / 1e3:.0f} kB cached")
+        packed.close()
+        sqlite.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the computation of the tie-breaks of a large open, from the matches of the rounds
+player by player, against the crosstable with loops and with NumPy when it is installed,
+and checks that they give the same values.
+"""
+
+
+import random
+import time
+
+from chess.models import crosstable
+from chess.models.crosstable import Crosstable, python_tie_breaks, numpy_tie_breaks
+from chess.models.tournament import Tournament
+
+from benchmarks.fixtures import make_actors
+
+
+SIZES = [64, 1000, 4000]
+NB_ROUND = 11
+
+
+def play(nb_players):
+    generator = random.Random(0)
+    tournament = Tournament("Open", "Paris", "Bz", "")
+    tournament.define_players(make_actors(nb_players))
+    for num_round in range(NB_ROUND):
+        tournament.init_round(num_round)
+        winners = [generator.randint(0, 2) for _ in tournament.rounds[num_round].matches]
+        tournament.register_round_results(num_round, winners)
+    return tournament
+
+
+def scan_buchholz(tournament):
+    """ Buchholz of each player, looking for its matches in every round. """
+    buchholz = []
+    for player in tournament.list_of_players:
+        total = 0.0
+        for r0und in tournament.rounds:
+            for match in r0und.matches.values():
+                if match.player1 is player:
+                    total += match.player2.points
+                elif match.player2 is player:
+                    total += match.player1.points
+        buchholz.append(total)
+    return buchholz
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1e3
+
+
+def main():
+    print(f"{NB_ROUND} rounds, NumPy {'installed' if crosstable.numpy is not None else 'not installed'}")
+    for nb_players in SIZES:
+        tournament = play(nb_players)
+        scanned, scan_time = timed(scan_buchholz, tournament)
+        table, build_time = timed(Crosstable, tournament)
+        python_values, python_time = timed(python_tie_breaks, table)
+        assert python_values['buchholz'] == scanned
+        line = f"{nb_players:>5} players: Buchholz by scan {scan_time:9.1f} ms | crosstable {build_time:6.1f} ms, " \
+               f"all tie-breaks with loops {python_time:6.1f} ms"
+        if crosstable.numpy is not None:
+            numpy_values, numpy_time = timed(numpy_tie_breaks, table)
+            assert numpy_values == python_values
+            line += f", with NumPy {numpy_time:5.1f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module builds fake actors and tournaments for the benchmarks.
+"""
+
+
+import datetime
+import random
+
+from chess.models.actors import Actor
+from chess.models.tournament import Tournament, NB_ROUND, NB_PLAYERS
+
+
+def make_actors(number, seed=0):
+    """ Creates a list of fake actors.
+
+    :param number: the number of actors to create.
+    :param seed: the seed of the random generator.
+    :return: the list of actors.
+    """
+    generator = random.Random(seed)
+    actors = []
+    for num in range(number):
+        actor = Actor(f"Nom{num}",
+                      f"Prenom{num}",
+                      datetime.date(1950 + num % 50, 1 + num % 12, 1 + num % 28),
+                      generator.choice(["F", "M"]),
+                      generator.randint(1, 3000))
+        actors.append(actor)
+    return actors
+
+
+def play_tournament(actors, seed=0, name="Open"):
+    """ Creates a tournament with the given actors and plays all its rounds randomly.
+
+    :param actors: the actors of the tournament, at least NB_PLAYERS.
+    :param seed: the seed of the random generator.
+    :param name: the name of the tournament.
+    :return: the finished tournament.
+    """
+    generator = random.Random(seed)
+    tournament = Tournament(name, "Paris", "Bz", "")
+    tournament.start_date = datetime.date.today()
+    tournament.define_players(actors[:NB_PLAYERS])
+    for num_round in range(NB_ROUND):
+        tournament.init_round(num_round)
+        winners = [generator.randint(0, 2) for _ in tournament.rounds[num_round].matches]
+        tournament.register_round_results(num_round, winners)
+    tournament.end_tournament()
+    return tournament
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the cost of the history of an actor and of a head-to-head between two actors,
+deserializing every tournament against reading only those found by the reverse index,
+and checks that every backend gives the same answer.
+"""
+
+
+import os
+import random
+import tempfile
+import timeit
+
+from chess.models.cache import TournamentCache
+from chess.models.database import DataBaseHandler
+from chess.models.packed_archive import PackedDataBaseHandler, write_packed_archive
+from chess.models.sqlite_database import SQLiteDataBaseHandler
+
+from benchmarks.fixtures import make_actors, play_tournament
+
+
+NB_ACTORS = 200
+NB_TOURNAMENTS = 1000
+REPEAT = 3
+
+
+def scan_history(handler, actor_id):
+    return [(tournament, player) for tournament in handler.iter_tournaments()
+            for player in tournament.list_of_players if player.actor.actor_id == actor_id]
+
+
+def scan_head_to_head(handler, actor_id, other_actor_id):
+    matches = []
+    for tournament in handler.iter_tournaments():
+        for r0und in tournament.rounds:
+            for match in r0und.matches.values():
+                if {match.player1.actor.actor_id, match.player2.actor.actor_id} == {actor_id, other_actor_id}:
+                    matches.append(match)
+    return matches
+
+
+def describe(history, matches):
+    return ([(tournament.tournament_id, player.player_id, player.points) for tournament, player in history],
+            [(match.tournament_ID, match.round_nb, match.match_nb) for match in matches])
+
+
+def main():
+    generator = random.Random(0)
+    actors = make_actors(NB_ACTORS)
+    serialized_tournaments = []
+    for num in range(NB_TOURNAMENTS):
+        tournament = play_tournament(generator.sample(actors, 8), seed=num)
+        tournament.tournament_id = f"{num + 1:08d}"
+        serialized_tournaments.append(tournament.tournament_to_dict())
+    actor_id, other_actor_id = actors[0].actor_id, actors[1].actor_id
+    with tempfile.TemporaryDirectory() as directory:
+        handler = DataBaseHandler(os.path.join(directory, "db.json"), write_behind=False)
+        handler._upsert_documents([('tournament', handler._tournaments_index,
+                                    'tournament_id', serialized_tournaments)])
+        handler._build_history_index()
+        sqlite = SQLiteDataBaseHandler(os.path.join(directory, "db.sqlite3"))
+        with sqlite.connection:
+            for serialized_tournament in serialized_tournaments:
+                sqlite._insert_tournament(serialized_tournament, interrupted=False)
+        write_packed_archive(handler, os.path.join(directory, "archive.pack"))
+        packed = PackedDataBaseHandler(os.path.join(directory, "archive.pack"))
+        expected = describe(scan_history(handler, actor_id), scan_head_to_head(handler, actor_id, other_actor_id))
+        print(f"{NB_TOURNAMENTS} tournaments of {NB_ACTORS} actors: {len(expected[0])} played by the actor, "
+              f"{len(expected[1])} matches between the two actors")
+        for name, backend in [("tinydb", handler), ("sqlite", sqlite), ("packed", packed)]:
+            found = describe(backend.player_history(actor_id), backend.head_to_head(actor_id, other_actor_id))
+            assert found == expected, name
+            backend.cache = TournamentCache(max_entries=0)
+            timings = [timeit.timeit(lambda: scan_history(backend, actor_id), number=REPEAT),
+                       timeit.timeit(lambda: backend.player_history(actor_id), number=REPEAT),
+                       timeit.timeit(lambda: scan_head_to_head(backend, actor_id, other_actor_id), number=REPEAT),
+                       timeit.timeit(lambda: backend.head_to_head(actor_id, other_actor_id), number=REPEAT)]
+            timings = [timing / REPEAT * 1e3 for timing in timings]
+            print(f"{name:>7}: history scan {timings[0]:8.1f} ms, index {timings[1]:7.2f} ms | "
+                  f"head-to-head scan {timings[2]:8.1f} ms, index {timings[3]:7.2f} ms")
+        packed.close()
+        sqlite.close()
+
+
+if __name__ == "__main__":
+    main()
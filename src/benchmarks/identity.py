@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Counts the actors and players built when loading a large archive in the former embedded schema,
+against the embedded copies of the players in the archive, and compares the load time
+through the identity map with the load time after a normalization of each tournament.
+"""
+
+
+import gc
+import time
+
+from chess.models.actors import Actor, Player
+from chess.models.database import deserialize_tournament
+from chess.models.migration import normalize_tournament
+
+from benchmarks.fixtures import make_actors, play_tournament
+from benchmarks.schema import legacy_tournament
+
+
+NB_TOURNAMENTS = 2000
+
+
+def count_instances(cls):
+    return sum(1 for instance in gc.get_objects() if type(instance) is cls)
+
+
+def count_embedded_players(legacy):
+    copies = len(legacy['list_of_players'])
+    for serialized_round in legacy['rounds']:
+        copies += len(serialized_round['players']) + 2 * len(serialized_round['matches'])
+    return copies
+
+
+def load(documents, function):
+    start = time.perf_counter()
+    tournaments = [function(document) for document in documents]
+    return tournaments, time.perf_counter() - start
+
+
+def main():
+    actors = make_actors(64)
+    normalized = [play_tournament(actors[num % 56:], seed=num).tournament_to_dict() for num in range(NB_TOURNAMENTS)]
+    legacy = [legacy_tournament(document) for document in normalized]
+    del actors
+    print(f"{NB_TOURNAMENTS} tournaments, {sum(map(count_embedded_players, legacy))} embedded copies of players")
+    for label, documents, function in [
+            ("embedded, normalized first", legacy, lambda document: deserialize_tournament(normalize_tournament(document))),
+            ("embedded, identity map", legacy, deserialize_tournament),
+            ("normalized, identity map", normalized, deserialize_tournament)]:
+        gc.collect()
+        before = count_instances(Actor), count_instances(Player)
+        tournaments, duration = load(documents, function)
+        built = count_instances(Actor) - before[0], count_instances(Player) - before[1]
+        print(f"{label:>27}: {duration * 1e3:7.1f} ms, {built[0]} actors, {built[1]} players")
+        del tournaments
+
+
+if __name__ == "__main__":
+    main()
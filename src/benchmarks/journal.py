@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the cost of saving one match result by rewriting the interrupted tournament
+in the database and by appending a record to the journal, as the archive grows.
+"""
+
+
+import os
+import tempfile
+import timeit
+
+from chess.models.database import DataBaseHandler
+from chess.models.journal import TournamentJournal
+
+from benchmarks.fixtures import make_actors, play_tournament
+
+
+ARCHIVE_SIZES = [0, 50, 200]
+REPEAT = 20
+
+
+def main():
+    actors = make_actors(64)
+    print(f"{'archived':>9} {'db rewrite (ms)':>16} {'journal (ms)':>13}")
+    for size in ARCHIVE_SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            handler = DataBaseHandler(os.path.join(directory, "db.json"))
+            for num in range(size):
+                handler.export_finished_tournament(play_tournament(actors[num % 56:], seed=num))
+            tournament = play_tournament(actors, seed=size)
+            journal = TournamentJournal(tournament, os.path.join(directory, "journal"))
+            rewrite = timeit.timeit(lambda: handler.export_interrupted_tournament(tournament),
+                                    number=REPEAT) / REPEAT
+            append = timeit.timeit(lambda: journal.append("result", round_nb=0, match_nb=0, winner=1),
+                                   number=REPEAT) / REPEAT
+            journal.close()
+            print(f"{size:>9} {rewrite * 1e3:>16.2f} {append * 1e3:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
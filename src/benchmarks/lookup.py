@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Measures the cost of a lookup by identifier as the actors table grows.
+
+With the identifier index of DataBaseHandler, the lookup cost must stay flat.
+"""
+
+
+import os
+import tempfile
+import timeit
+
+from chess.models.database import DataBaseHandler
+
+from benchmarks.fixtures import make_actors
+
+
+SIZES = [100, 1000, 10000, 30000]
+LOOKUPS = 1000
+
+
+def bench_lookup(size):
+    """ Fills a database with size actors and times the lookups by identifier.
+
+    :param size: the number of actors in the table.
+    :return: the mean time of one lookup, in microseconds.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "db.json")
+        actors = make_actors(size)
+        handler = DataBaseHandler(path)
+        handler.database.table('actors').insert_multiple(actor.actor_to_dict() for actor in actors)
+        handler.close()
+        handler = DataBaseHandler.open(path)
+        identifiers = [actors[num * size // LOOKUPS].actor_id for num in range(LOOKUPS)]
+        duration = timeit.timeit(lambda: [handler.import_actor(identifier) for identifier in identifiers],
+                                 number=1)
+        handler.close()
+    return duration / LOOKUPS * 1e6
+
+
+def main():
+    print(f"{'actors':>10} {'lookup (µs)':>12}")
+    for size in SIZES:
+        print(f"{size:>10} {bench_lookup(size):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
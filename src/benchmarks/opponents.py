@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the former opponent history, a list serialized as a spaced string,
+with the set packed as a bitmask or a spaced string, on the players of a small and of a large
+tournament: cost of the rematch checks, of the serialization and of the deserialization, and size.
+"""
+
+
+import random
+import timeit
+
+from chess.models.tournament import Tournament
+from chess.utils.conversion import list_to_str_space, str_space_to_int_list, pack_ids, unpack_ids
+
+from benchmarks.fixtures import make_actors
+
+
+SIZES = [(8, 7), (1024, 11)]
+NB_CHECKS = 200000
+REPEAT = 5
+
+
+def play(nb_players, nb_round, generator):
+    tournament = Tournament("Open", "Paris", "Bz", "")
+    tournament.define_players(make_actors(nb_players))
+    for num_round in range(nb_round):
+        tournament.init_round(num_round)
+        winners = [generator.randint(0, 2) for _ in tournament.rounds[num_round].matches]
+        tournament.register_round_results(num_round, winners)
+    return tournament.list_of_players
+
+
+def main():
+    generator = random.Random(0)
+    for nb_players, nb_round in SIZES:
+        players = play(nb_players, nb_round, generator)
+        checks = [(generator.choice(players), generator.choice(players)) for _ in range(NB_CHECKS)]
+        lists = {player.player_id: sorted(player.opponents) for player in players}
+        former = [list_to_str_space(lists[player.player_id]) for player in players]
+        packed = [pack_ids(player.opponents) for player in players]
+        assert [set(str_space_to_int_list(string)) for string in former] == [unpack_ids(string) for string in packed]
+        timings = {
+            'list check': lambda: [player2.player_id in lists[player1.player_id] for player1, player2 in checks],
+            'set check': lambda: [player1.has_played(player2) for player1, player2 in checks],
+            'list dump': lambda: [list_to_str_space(lists[player.player_id]) for player in players],
+            'packed dump': lambda: [pack_ids(player.opponents) for player in players],
+            'list load': lambda: [str_space_to_int_list(string) for string in former],
+            'packed load': lambda: [unpack_ids(string) for string in packed]}
+        print(f"{nb_players} players, {nb_round} rounds, {NB_CHECKS} rematch checks")
+        for label, function in timings.items():
+            print(f"{label:>12}: {timeit.timeit(function, number=REPEAT) / REPEAT * 1e3:7.2f} ms")
+        print(f"serialized size: spaced strings {sum(map(len, former))} characters, "
+              f"packed {sum(map(len, packed))} characters")
+
+
+if __name__ == "__main__":
+    main()
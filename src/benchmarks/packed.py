@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the cost of a report process opening the database and finding one tournament,
+with the TinyDB file and with the packed archive read through mmap.
+"""
+
+
+import os
+import tempfile
+import timeit
+
+from chess.models.database import DataBaseHandler, deserialize_tournament
+from chess.models.packed_archive import PackedDataBaseHandler, write_packed_archive
+from chess.models.storage import AtomicJSONStorage
+
+from benchmarks.fixtures import make_actors, play_tournament
+
+
+NB_TOURNAMENTS = [100, 1000]
+REPEAT = 5
+
+
+def open_and_find_tinydb(path, identifier):
+    tables = AtomicJSONStorage(path).read()
+    for serialized_tournament in tables['tournament'].values():
+        if serialized_tournament['tournament_id'] == identifier:
+            return deserialize_tournament(serialized_tournament)
+
+
+def open_and_find_packed(path, identifier):
+    handler = PackedDataBaseHandler(path)
+    tournament = handler.find_tournament_by_id(identifier)
+    handler.close()
+    return tournament
+
+
+def main():
+    actors = make_actors(64)
+    print(f"{'tournaments':>11} {'tinydb':>10} {'packed':>10} {'packed, opened':>15}")
+    for nb_tournaments in NB_TOURNAMENTS:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "db.json")
+            handler = DataBaseHandler(path, write_behind=False)
+            serialized_tournaments = []
+            for num in range(nb_tournaments):
+                tournament = play_tournament(actors[num % 56:], seed=num)
+                tournament.tournament_id = f"{num + 1:08d}"
+                serialized_tournaments.append(tournament.tournament_to_dict())
+            handler._upsert_documents([('tournament', handler._tournaments_index,
+                                        'tournament_id', serialized_tournaments)])
+            packed_path = os.path.join(directory, "archive.pack")
+            write_packed_archive(handler, packed_path)
+            identifier = f"{nb_tournaments // 2 + 1:08d}"
+            packed = PackedDataBaseHandler(packed_path)
+            timings = [timeit.timeit(lambda: open_and_find_tinydb(path, identifier), number=REPEAT),
+                       timeit.timeit(lambda: open_and_find_packed(packed_path, identifier), number=REPEAT),
+                       timeit.timeit(lambda: packed._read_tournament(identifier), number=REPEAT)]
+            packed.close()
+            timings = [timing / REPEAT * 1e3 for timing in timings]
+            print(f"{nb_tournaments:>11} {timings[0]:>7.2f} ms {timings[1]:>7.2f} ms {timings[2]:>12.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
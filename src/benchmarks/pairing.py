@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Times the pairing of the rounds of tournaments of growing size, with random results,
+and counts the rematches and the players exempted twice.
+"""
+
+
+import random
+import time
+
+from chess.models.tournament import Tournament
+
+from benchmarks.fixtures import make_actors
+
+
+SIZES = [8, 64, 256, 600, 1024]
+NB_ROUND = 9
+
+
+def play(nb_players, seed=0):
+    generator = random.Random(seed)
+    tournament = Tournament("Open", "Paris", "Bz", "")
+    tournament.define_players(make_actors(nb_players, seed))
+    timings = []
+    rematches = 0
+    for num_round in range(NB_ROUND):
+        opponents = {player.player_id: set(player.opponents) for player in tournament.list_of_players}
+        start = time.perf_counter()
+        tournament.init_round(num_round)
+        timings.append(time.perf_counter() - start)
+        r0und = tournament.rounds[num_round]
+        rematches += sum(1 for match in r0und.matches.values()
+                         if match.player2.player_id in opponents[match.player1.player_id])
+        tournament.register_round_results(num_round, [generator.randint(0, 2) for _ in r0und.matches])
+    byes = [r0und.bye.player_id for r0und in tournament.rounds if r0und.bye is not None]
+    return timings, rematches, len(byes) - len(set(byes))
+
+
+def main():
+    print(f"{NB_ROUND} rounds, random results")
+    for nb_players in SIZES:
+        for size in (nb_players, nb_players + 1):
+            timings, rematches, double_byes = play(size)
+            print(f"{size:>5} players: mean {sum(timings) / len(timings) * 1e3:7.2f} ms, "
+                  f"worst {max(timings) * 1e3:7.2f} ms per round, "
+                  f"{rematches} rematches, {double_byes} double byes")
+
+
+if __name__ == "__main__":
+    main()
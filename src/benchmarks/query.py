@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the cost of finding the tournaments of a location in a date range,
+scanning and filtering all the summaries against the secondary indexes,
+and checks that every backend gives the same answer.
+"""
+
+
+import datetime
+import os
+import random
+import tempfile
+import timeit
+
+from chess.models.database import DataBaseHandler
+from chess.models.packed_archive import PackedDataBaseHandler, write_packed_archive
+from chess.models.sqlite_database import SQLiteDataBaseHandler
+
+from benchmarks.fixtures import make_actors, play_tournament
+
+
+NB_TOURNAMENTS = 10000
+NB_DISTINCT = 50
+REPEAT = 20
+LOCATIONS = [f"Ville{num}" for num in range(100)]
+TIMER_TYPES = ["Bu", "Bz", "Ra"]
+START = datetime.date(2000, 1, 1)
+CRITERIA = {'location': "Ville7", 'start_after': datetime.date(2010, 1, 1), 'start_before': datetime.date(2015, 12, 31)}
+
+
+def scan(handler, location, start_after, start_before):
+    return [summary for summary in handler.list_tournament_summaries()
+            if summary.location == location and summary.start_date is not None
+            and start_after <= summary.start_date <= start_before]
+
+
+def main():
+    generator = random.Random(0)
+    actors = make_actors(64)
+    templates = [play_tournament(actors[num % 56:], seed=num).tournament_to_dict() for num in range(NB_DISTINCT)]
+    serialized_tournaments = []
+    for num in range(NB_TOURNAMENTS):
+        serialized_tournament = dict(templates[num % NB_DISTINCT])
+        start_date = START + datetime.timedelta(days=generator.randrange(9000))
+        serialized_tournament.update(tournament_id=f"{num + 1:08d}", name=f"Open {num}",
+                                     location=generator.choice(LOCATIONS), timer_type=generator.choice(TIMER_TYPES),
+                                     start_date=str(start_date), end_date=str(start_date + datetime.timedelta(days=2)))
+        serialized_tournaments.append(serialized_tournament)
+    with tempfile.TemporaryDirectory() as directory:
+        handler = DataBaseHandler(os.path.join(directory, "db.json"), write_behind=False)
+        handler._upsert_documents([('tournament', handler._tournaments_index,
+                                    'tournament_id', serialized_tournaments)])
+        handler._build_query_index()
+        sqlite = SQLiteDataBaseHandler(os.path.join(directory, "db.sqlite3"))
+        with sqlite.connection:
+            for serialized_tournament in serialized_tournaments:
+                sqlite._insert_tournament(serialized_tournament, interrupted=False)
+        write_packed_archive(handler, os.path.join(directory, "archive.pack"))
+        packed = PackedDataBaseHandler(os.path.join(directory, "archive.pack"))
+        expected = sorted(summary.tournament_id for summary in scan(handler, **CRITERIA))
+        print(f"{NB_TOURNAMENTS} tournaments, {len(expected)} matching {CRITERIA['location']} "
+              f"from {CRITERIA['start_after']} to {CRITERIA['start_before']}")
+        for name, backend in [("tinydb", handler), ("sqlite", sqlite), ("packed", packed)]:
+            found = [summary.tournament_id for summary in backend.query_tournaments(**CRITERIA)]
+            assert found == expected, name
+            timings = [timeit.timeit(lambda: scan(backend, **CRITERIA), number=REPEAT),
+                       timeit.timeit(lambda: backend.query_tournaments(**CRITERIA), number=REPEAT)]
+            timings = [timing / REPEAT * 1e3 for timing in timings]
+            print(f"{name:>7}: scan {timings[0]:8.2f} ms, query {timings[1]:8.3f} ms")
+        packed.close()
+        sqlite.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the size and the load time of an archive in the former embedded schema
+and in the normalized schema, and times the migration between them.
+"""
+
+
+import json
+import os
+import tempfile
+import time
+
+from chess.models.database import DataBaseHandler
+from chess.models.migration import migrate_database
+
+from benchmarks.fixtures import make_actors, play_tournament
+
+
+NB_TOURNAMENTS = 300
+
+
+def legacy_tournament(serialized_tournament):
+    """ Converts a normalized tournament into the former schema, where players and actors are embedded.
+
+    :param serialized_tournament: normalized dictionary.
+    :return: the dictionary in the former schema.
+    """
+    actors = {actor['actor_id']: actor for actor in serialized_tournament['actors']}
+    players = {}
+    for serialized_player in serialized_tournament['list_of_players']:
+        player = dict(serialized_player)
+        player['actor'] = actors[player.pop('actor_id')]
+        players[player['player_id']] = player
+    legacy = dict(serialized_tournament)
+    del legacy['actors']
+    legacy['list_of_players'] = list(players.values())
+    legacy['rounds'] = []
+    for serialized_round in serialized_tournament['rounds']:
+        r0und = dict(serialized_round)
+        r0und['players'] = [players[player_id] for player_id in serialized_round['players']]
+        r0und['matches'] = {}
+        for match_nb, serialized_match in serialized_round['matches'].items():
+            match = dict(serialized_match)
+            match['player1'] = players[serialized_match['player1']]
+            match['player2'] = players[serialized_match['player2']]
+            r0und['matches'][match_nb] = match
+        legacy['rounds'].append(r0und)
+    return legacy
+
+
+def time_load(path):
+    """ Times the parse of the file and the deserialization of all the tournaments.
+
+    :param path: path of the database.
+    :return: the duration in seconds.
+    """
+    start = time.perf_counter()
+    handler = DataBaseHandler(path)
+    handler.import_tournaments()
+    return time.perf_counter() - start
+
+
+def main():
+    actors = make_actors(64)
+    tournaments = [play_tournament(actors[num % 56:], seed=num).tournament_to_dict()
+                   for num in range(NB_TOURNAMENTS)]
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_path = os.path.join(directory, "legacy.json")
+        normalized_path = os.path.join(directory, "normalized.json")
+        with open(legacy_path, "w", encoding="utf-8") as handle:
+            json.dump({"tournament": {str(num + 1): legacy_tournament(tournament)
+                                      for num, tournament in enumerate(tournaments)}}, handle)
+        start = time.perf_counter()
+        migrate_database(legacy_path, normalized_path)
+        migration = time.perf_counter() - start
+
+        print(f"{NB_TOURNAMENTS} tournaments of 8 players and 4 rounds")
+        for label, path in [("embedded", legacy_path), ("normalized", normalized_path)]:
+            print(f"{label:>11}: {os.path.getsize(path) / 1e6:6.2f} MB, load {time_load(path) * 1e3:8.1f} ms")
+        print(f"  migration: {migration * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
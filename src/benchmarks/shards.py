@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the cost of opening one tournament, and of listing the tournaments,
+from a fresh process: the whole TinyDB file against the catalog and a shard.
+"""
+
+
+import os
+import shutil
+import tempfile
+import timeit
+
+from chess.models.database import DataBaseHandler, deserialize_tournament, deserialize_tournament_summary
+from chess.models.sharded_database import shard_database, CATALOG_NAME
+from chess.models.storage import AtomicJSONStorage
+
+from benchmarks.fixtures import make_actors, play_tournament
+
+
+NB_TOURNAMENTS = [10, 100, 1000]
+REPEAT = 5
+
+
+def open_from_tinydb(path, identifier):
+    tables = AtomicJSONStorage(path).read()
+    for serialized_tournament in tables['tournament'].values():
+        if serialized_tournament['tournament_id'] == identifier:
+            return deserialize_tournament(serialized_tournament)
+
+
+def open_from_shard(directory, identifier):
+    catalog = AtomicJSONStorage(os.path.join(directory, CATALOG_NAME)).read()
+    shard = AtomicJSONStorage(os.path.join(directory, catalog[identifier]['shard']))
+    return deserialize_tournament(shard.read())
+
+
+def list_from_tinydb(path):
+    tables = AtomicJSONStorage(path).read()
+    return [deserialize_tournament_summary(value) for value in tables['tournament'].values()]
+
+
+def list_from_catalog(directory):
+    catalog = AtomicJSONStorage(os.path.join(directory, CATALOG_NAME)).read()
+    return [deserialize_tournament_summary(entry) for entry in catalog.values()]
+
+
+def main():
+    actors = make_actors(64)
+    print(f"{'tournaments':>11} {'open tinydb':>12} {'open shard':>11} {'list tinydb':>12} {'list catalog':>13}")
+    for nb_tournaments in NB_TOURNAMENTS:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "db.json")
+            handler = DataBaseHandler(path)
+            serialized_tournaments = []
+            for num in range(nb_tournaments):
+                tournament = play_tournament(actors[num % 56:], seed=num)
+                tournament.tournament_id = f"{num + 1:08d}"
+                serialized_tournaments.append(tournament.tournament_to_dict())
+            handler._upsert_documents([('tournament', handler._tournaments_index,
+                                        'tournament_id', serialized_tournaments)])
+            sharded_path = os.path.join(directory, "sharded.json")
+            shutil.copy(path, sharded_path)
+            shards = os.path.join(directory, "tournaments")
+            shard_database(sharded_path, shards)
+            identifier = f"{nb_tournaments // 2 + 1:08d}"
+            timings = [timeit.timeit(lambda: open_from_tinydb(path, identifier), number=REPEAT),
+                       timeit.timeit(lambda: open_from_shard(shards, identifier), number=REPEAT),
+                       timeit.timeit(lambda: list_from_tinydb(path), number=REPEAT),
+                       timeit.timeit(lambda: list_from_catalog(shards), number=REPEAT)]
+            timings = [timing / REPEAT * 1e3 for timing in timings]
+            print(f"{nb_tournaments:>11} {timings[0]:>9.2f} ms {timings[1]:>8.2f} ms "
+                  f"{timings[2]:>9.2f} ms {timings[3]:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
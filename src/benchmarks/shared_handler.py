@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the cost of a menu hop when each controller parses db.json again
+and when the controllers share the handler of the process.
+"""
+
+
+import os
+import tempfile
+import timeit
+
+from tinydb import TinyDB
+
+from chess.models.database import DataBaseHandler
+
+from benchmarks.fixtures import make_actors, play_tournament
+
+
+NB_TOURNAMENTS = 200
+HOPS = 20
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "db.json")
+        actors = make_actors(64)
+        handler = DataBaseHandler(path)
+        for num in range(NB_TOURNAMENTS):
+            handler.export_finished_tournament(play_tournament(actors[num % 56:], seed=num))
+        print(f"db.json: {os.path.getsize(path) / 1e6:.1f} MB, {NB_TOURNAMENTS} tournaments")
+
+        def parse_again():
+            database = TinyDB(path)
+            database.table('tournament').all()
+            database.table('actors').all()
+            database.close()
+
+        DataBaseHandler.shared = handler
+        per_hop = timeit.timeit(parse_again, number=HOPS) / HOPS
+        shared = timeit.timeit(DataBaseHandler.get_shared, number=HOPS) / HOPS
+        print(f"parse at each hop: {per_hop * 1e3:8.2f} ms")
+        print(f"shared handler:    {shared * 1e6:8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the former ranking, which sorts all the players again, with the incremental standings
+of the tournament, on a large tournament: ranking once per round, ranking after each result
+for live standings, and displaying the ranking by place.
+"""
+
+
+import random
+import time
+from operator import attrgetter
+
+from chess.models.standings import Standings
+from chess.models.tournament import Tournament
+
+from benchmarks.fixtures import make_actors
+
+
+NB_PLAYERS = 1000
+NB_ROUND = 11
+
+
+def sort_again(players):
+    sorted_players = sorted(players, key=attrgetter("rank"))
+    sorted_players = sorted(sorted_players, key=attrgetter("points"), reverse=True)
+    for rank in range(len(sorted_players)):
+        sorted_players[rank].place = rank + 1
+
+
+def scan_places(players):
+    return [[player for player in players if player.place == rank] for rank in range(1, len(players) + 1)]
+
+
+def map_places(players):
+    players_by_place = {player.place: player for player in players}
+    return [players_by_place.get(rank) for rank in range(1, len(players) + 1)]
+
+
+def play_rounds():
+    generator = random.Random(0)
+    tournament = Tournament("Open", "Paris", "Bz", "")
+    tournament.define_players(make_actors(NB_PLAYERS))
+    for num_round in range(NB_ROUND):
+        tournament.init_round(num_round)
+        winners = [generator.randint(0, 2) for _ in tournament.rounds[num_round].matches]
+        tournament.register_round_results(num_round, winners)
+    return tournament
+
+
+def replay(tournament, standings, after_each_result):
+    for player in tournament.list_of_players:
+        player.points = 0
+    if standings is not None:
+        standings = Standings(tournament.list_of_players)
+    duration = 0
+    places = []
+    for r0und in tournament.rounds:
+        start = time.perf_counter()
+        for match in r0und.matches.values():
+            match.assign_points(standings)
+            if after_each_result:
+                if standings is None:
+                    sort_again(tournament.list_of_players)
+                else:
+                    standings.assign_places()
+        if standings is None:
+            sort_again(tournament.list_of_players)
+        else:
+            standings.assign_places()
+        duration += time.perf_counter() - start
+        places.append([player.place for player in tournament.list_of_players])
+    return duration, places
+
+
+def main():
+    tournament = play_rounds()
+    print(f"{NB_PLAYERS} players, {NB_ROUND} rounds")
+    results = {}
+    for label, standings, after_each_result in [("sort once per round", None, False),
+                                                ("standings once per round", True, False),
+                                                ("sort after each result", None, True),
+                                                ("standings after each result", True, True)]:
+        duration, places = replay(tournament, standings, after_each_result)
+        results[label] = places
+        print(f"{label:>28}: {duration * 1e3:8.1f} ms")
+    assert all(places == results["sort once per round"] for places in results.values())
+    for label, function in [("display scanning places", scan_places), ("display mapping places", map_places)]:
+        start = time.perf_counter()
+        function(tournament.list_of_players)
+        print(f"{label:>28}: {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
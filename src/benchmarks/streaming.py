@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the peak memory and the time of reading the actors and the tournaments of a large
+TinyDB file, with json.load and with the streaming reader.
+"""
+
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from chess.models.database import DataBaseHandler, deserialize_actor, deserialize_tournament
+from chess.models.streaming import iter_documents
+
+from benchmarks.fixtures import make_actors, play_tournament
+
+
+NB_ACTORS = 5000
+NB_TOURNAMENTS = 1000
+
+
+def measure(function, *args):
+    """ Measures the time and the peak memory of a function. """
+    tracemalloc.start()
+    start = time.perf_counter()
+    function(*args)
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duration, peak
+
+
+def count_with_json_load(path, table_name, deserialize):
+    with open(path, encoding="utf-8") as handle:
+        tables = json.load(handle)
+    return sum(1 for document in tables[table_name].values() if deserialize(document))
+
+
+def count_with_streaming(path, table_name, deserialize):
+    return sum(1 for document in iter_documents(path, table_name) if deserialize(document))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "db.json")
+        handler = DataBaseHandler(path, write_behind=False)
+        actors = make_actors(NB_ACTORS)
+        tournaments = []
+        for num in range(NB_TOURNAMENTS):
+            tournament = play_tournament(actors[num % 56:num % 56 + 64], seed=num)
+            tournament.tournament_id = f"{num + 1:08d}"
+            tournaments.append(tournament.tournament_to_dict())
+        handler._upsert_documents([('actors', handler._actors_index, 'actor_id',
+                                    [actor.actor_to_dict() for actor in actors]),
+                                   ('tournament', handler._tournaments_index, 'tournament_id', tournaments)])
+        print(f"{NB_ACTORS} actors and {NB_TOURNAMENTS} tournaments, {os.path.getsize(path) / 1e6:.2f} MB")
+        for table_name, deserialize in [('actors', deserialize_actor), ('tournament', deserialize_tournament)]:
+            for name, function in [("json.load", count_with_json_load), ("streaming", count_with_streaming)]:
+                duration, peak = measure(function, path, table_name, deserialize)
+                print(f"{table_name:>10} {name:>9}: {duration * 1e3:8.1f} ms, peak {peak / 1e6:7.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Compares the list of tournaments built from the full tournaments and from their summaries.
+"""
+
+
+import os
+import tempfile
+import timeit
+
+from chess.models.database import DataBaseHandler
+
+from benchmarks.fixtures import make_actors, play_tournament
+
+
+NB_TOURNAMENTS = 300
+REPEAT = 5
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        handler = DataBaseHandler(os.path.join(directory, "db.json"))
+        actors = make_actors(64)
+        for num in range(NB_TOURNAMENTS):
+            handler.export_finished_tournament(play_tournament(actors[num % 56:], seed=num))
+        full = timeit.timeit(handler.import_tournaments, number=REPEAT) / REPEAT
+        summaries = timeit.timeit(handler.list_tournament_summaries, number=REPEAT) / REPEAT
+        print(f"{NB_TOURNAMENTS} tournaments")
+        print(f"import_tournaments:        {full * 1e3:8.2f} ms")
+        print(f"list_tournament_summaries: {summaries * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
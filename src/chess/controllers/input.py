@@ -11,7 +11,6 @@ from chess.utils.conversion import str_into_date
 
 DATE_FORMAT = ["day", "month", "year"]
 ID_WIDTH = 8
-NB_MATCH = 4
 
 
 def prompt_number(message, mini=None, maxi=None):
@@ -212,19 +211,24 @@ def tournament_inputs():
     return tournament_arguments
 
 
-def input_match_results(r0und):
+def input_match_results(r0und, on_result=None):
     """ Asks to fill in the results of a round
 
     We start by choosing a match by designating its number
     then we indicate a winner (1 or 2) or a draw by 0.
+    The matches already finished, in a resumed round, are not asked again.
 
     :param r0und: the round being played
+    :param on_result: if provided, called with the match number and the winner of each result input
     :return: the list of the results
     """
     remaining_matchs = {}
+    results = [0]*len(r0und.matches)
     for num, match in r0und.matches.items():
-        remaining_matchs[num+1] = f"Match {num+1}: {match.player1.name} vs {match.player2.name}"
-    results = [0]*NB_MATCH
+        if match.finished:
+            results[num] = match.winner
+        else:
+            remaining_matchs[num+1] = f"Match {num+1}: {match.player1.name} vs {match.player2.name}"
     while remaining_matchs != {}:
         num_match = prompt_propositions(remaining_matchs, integer=True)
         print(r0und.matches[num_match - 1])
@@ -232,6 +236,8 @@ def input_match_results(r0und):
                                " par 1 ou 2, ou inscrivez 0"
                                " pour le match nul ", 0, 2)
         results[num_match-1] = result
+        if on_result is not None:
+            on_result(num_match - 1, result)
         del remaining_matchs[num_match]
     return results
 
@@ -8,9 +8,16 @@ This module handles the menu and the navigation between them.
 
 import datetime
 
+from chess.settings import ACTOR_ID_BLOCK
 from chess.models.tournament import Tournament
 from chess.models.actors import Actor
-from chess.models.database import DataBaseHandler
+from chess.models.batch import init_next_rounds
+from chess.models.crosstable import Crosstable, assign_final_places
+from chess.models.database import DataBaseHandler, ACTOR_SEQUENCE, TOURNAMENT_SEQUENCE
+from chess.models.storage import flush_storages
+from chess.models.writer import submit, flush_writer
+from chess.models.journal import TournamentJournal, load_tournament, journaled_summaries
+from chess.models.packed_archive import ReadOnlyArchiveError
 
 from chess.views.menuview import MenuView
 from chess.views.flow import view_validation_new_actor, view_input_new_actor,\
@@ -19,7 +26,8 @@ from chess.views.flow import view_validation_new_actor, view_input_new_actor,\
     view_validation_actors_imported, view_tournament_final, \
     view_validation_actors_exported, view_validation_players, \
     view_import_no_tournament, view_players_rank, view_actors_menu, \
-    view_no_actor_id
+    view_no_actor_id, view_paused_tournaments, view_read_only_database, \
+    view_league_day, view_no_league_day
 
 from chess.views.reports import report_actors_by_alpha, report_actors_by_rank, \
     report_tournaments_list, report_tournament_players, \
@@ -40,19 +48,30 @@ ID_WIDTH = 8
 
 class BrowseControllers:
     """ Handles the navigation between controllers. """
-    def __init__(self):
-        """ The attribute controller stores the next controller."""
+    def __init__(self, handler=None):
+        """ The attribute controller stores the next controller.
+
+        If a handler of the database is given, it is shared by all the controllers.
+        """
         self.controller = None
+        if handler is not None:
+            DataBaseHandler.shared = handler
 
     def start(self):
         """
         Launches the home menu.
         A loop while to browse between the controllers.
+        With the read-only packed archive as database, the controllers
+        which write in it go back to the home menu with a message.
         :return: None
         """
         self.controller = HomeMenuController()
         while self.controller:
-            self.controller = self.controller()
+            try:
+                self.controller = self.controller()
+            except ReadOnlyArchiveError:
+                view_read_only_database()
+                self.controller = HomeMenuController()
 
 
 class HomeMenuController:
@@ -74,6 +93,7 @@ class HomeMenuController:
         self.menu.add("auto", "Rentrer ou modifier des joueurs", ActorsMenu())
         self.menu.add("auto", "Lancer un tournoi", TournamentCreation())
         self.menu.add("auto", "Reprendre un tournoi", ResumeTournament())
+        self.menu.add("auto", "Journée de championnat : apparier tous les tournois en pause", LeagueDay())
         self.menu.add("auto", "Obtenir un rapport", ReportMenu())
         self.menu.add("q", "Quitter", Ending())
 
@@ -118,8 +138,14 @@ class Actors:
     the keys are the actors id and the values
     are the instances of actors.
 
+    The identifiers are reserved in the database by blocks of ACTOR_ID_BLOCK,
+    then handed out from the class attribute reserved_ids: the database is written
+    once per block rather than once per actor. The identifiers of a block
+    left unused are never handed out again.
+
     """
     actors = {}
+    reserved_ids = []
 
     def __init__(self):
         """ Defines the next menu. """
@@ -129,17 +155,21 @@ class Actors:
         """
         Calls the display and the input of a new player.
         Then the corresponding actor instance is created.
+        The identifier is taken from the block reserved in the database.
         The instance is stored in the class attribute actors
         in a dictionary and it calls the display of the
         validation of the new player creation.
         """
         view_input_new_actor()
         actor_arguments = input_actor()
+        if not Actors.reserved_ids:
+            Actors.reserved_ids = DataBaseHandler.get_shared().reserve_ids(ACTOR_SEQUENCE, ACTOR_ID_BLOCK)
         actor = Actor(actor_arguments[0],
                       actor_arguments[1],
                       actor_arguments[2],
                       actor_arguments[3],
-                      actor_arguments[4])
+                      actor_arguments[4],
+                      Actors.reserved_ids.pop(0))
         Actors.actors[actor.actor_id] = actor
         view_validation_new_actor(actor)
         return self.next_menu
@@ -157,13 +187,12 @@ class ImportActors:
         The imported players fulfill the class attribute Actors.actors.
         The database table is cleared after the import.
         """
-        handler = DataBaseHandler()
+        handler = DataBaseHandler.get_shared()
         num_actors, actors = handler.import_actors()
         view_validation_actors_imported(actors)
         for actor in actors:
             Actors.actors[actor.actor_id] = actor
-        actors_table = handler.database.table("actors")
-        actors_table.truncate()
+        handler.truncate_actors()
         return self.next_menu()
 
 
@@ -174,40 +203,50 @@ class ExportActors:
         self.actors = actors
 
     def __call__(self):
-        """ Exports actor on by one and updates the last id"""
-        handler = DataBaseHandler()
-        for actor in self.actors:
-            handler.export_actor(actor)
-        Actor.last_actor_id = "0" * ID_WIDTH
+        """ Exports the actors in a single write """
+        handler = DataBaseHandler.get_shared()
+        handler.export_actors(self.actors)
         view_validation_actors_exported(self.actors)
         return HomeMenuController()
 
 
 class ActorsRank:
-    """ Handles the modification of a player's ranking. """
-    def __init__(self, next_menu=ActorsMenu()):
+    """ Handles the modification of a player's ranking.
+
+    During a tournament, the rank of the corresponding player's actor
+    is changed too and recorded in the journal of the tournament.
+
+    """
+    def __init__(self, next_menu=ActorsMenu(), tournament=None):
         self.menu = Menu()
         self.view = MenuView(self.menu)
         self.next_menu = next_menu
+        self.tournament = tournament
 
     def __call__(self):
         actor_id = input_actor_id()
-        database = DataBaseHandler()
-        actor = {}
-        if not database.import_actor(actor_id) and actor_id not in Actors.actors:
+        if actor_id in Actors.actors:
+            actor = Actors.actors[actor_id]
+        else:
+            database = DataBaseHandler.get_shared()
+            actor = database.import_actor(actor_id)
+        if not actor:
             view_no_actor_id()
         else:
-            if actor_id in Actors.actors:
-                actor = Actors.actors[actor_id]
-            elif database.import_actor(actor_id):
-                actor = database.import_actor(actor_id)
             view_validation_new_actor(actor)
             new_rank = input_actor_new_rank()
             actor.rank = new_rank
             Actors.actors[actor.actor_id] = actor
             view_validation_new_actor(actor)
+            if self.tournament is not None:
+                for player in self.tournament.list_of_players:
+                    if player.actor.actor_id == actor.actor_id:
+                        player.actor.rank = new_rank
+                        TournamentJournal.of(self.tournament).rank_changed(player.actor)
 
-        self.menu.add("auto", "Modifier le classement d'un autre joueur", ActorsRank(self.next_menu))
+        self.menu.add("auto",
+                      "Modifier le classement d'un autre joueur",
+                      ActorsRank(self.next_menu, self.tournament))
         self.menu.add("auto", "Retour", self.next_menu)
 
         user_choice = self.view.get_user_choice()
@@ -221,14 +260,14 @@ class TournamentCreation:
         self.last_id = "0" * ID_WIDTH
 
     def __call__(self):
-        handler = DataBaseHandler()
-        Tournament.last_tournament_id = handler.import_last_tournament_id()
+        handler = DataBaseHandler.get_shared()
         view_tournament_creation()
         tournament_arguments = tournament_inputs()
         self.tournament = Tournament(tournament_arguments[0],
                                      tournament_arguments[1],
                                      tournament_arguments[2],
-                                     tournament_arguments[3])
+                                     tournament_arguments[3],
+                                     handler.new_id(TOURNAMENT_SEQUENCE))
         self.tournament.start_date = datetime.date.today()
         return TournamentPlayersMenu(self.tournament)
 
@@ -307,6 +346,14 @@ class LaunchTournament:
     between LaunchTournament and TournamentPause
     for the 4 rounds.
 
+    Each round started, result and round finished is recorded
+    in the journal of the tournament. A round left unfinished
+    by a crash is resumed with its remaining matches.
+
+    The finished tournament and the actors of its players are transformed in dictionaries here,
+    then saved by the background writer, which never reads the instances still used by the menus.
+    The journal is removed once the tournament is saved.
+
     """
     def __init__(self, tournament):
         self.tournament = tournament
@@ -315,23 +362,46 @@ class LaunchTournament:
         if not self.tournament or self.tournament.finished:
             view_import_no_tournament()
             return HomeMenuController()
+        journal = TournamentJournal.of(self.tournament)
         num_round = len(self.tournament.rounds)
-        if num_round == 0:
-            view_launch_tournament(self.tournament)
-        if num_round == 4:
-            view_tournament_final(self.tournament)
+        if num_round > 0 and not self.tournament.rounds[-1].finished:
+            num_round -= 1
+        elif num_round == 4:
+            tie_breaks = Crosstable(self.tournament).tie_breaks()
+            assign_final_places(self.tournament.list_of_players, tie_breaks)
+            view_tournament_final(self.tournament, tie_breaks)
             self.tournament.end_tournament()
-            database = DataBaseHandler()
-            database.export_finished_tournament(self.tournament)
+            submit(self.save_finished_tournament, DataBaseHandler.get_shared(), journal,
+                   self.tournament.tournament_to_dict(),
+                   [player.actor.actor_to_dict() for player in self.tournament.list_of_players])
             return HomeMenuController()
         else:
+            if num_round == 0:
+                view_launch_tournament(self.tournament)
             self.tournament.init_round(num_round)
-            view_round_matches(self.tournament.rounds[num_round])
-            winners = input_match_results(self.tournament.rounds[num_round])
-            self.tournament.register_round_results(num_round, winners)
-            view_round_matches(self.tournament.rounds[num_round])
-            view_players_rank(self.tournament.list_of_players)
-            return TournamentPause(self.tournament)
+            journal.round_started(self.tournament.rounds[num_round])
+        view_round_matches(self.tournament.rounds[num_round])
+        winners = input_match_results(self.tournament.rounds[num_round],
+                                      lambda match_nb, winner:
+                                      journal.result_declared(num_round, match_nb, winner))
+        self.tournament.register_round_results(num_round, winners)
+        journal.round_finished(self.tournament.rounds[num_round])
+        view_round_matches(self.tournament.rounds[num_round])
+        view_players_rank(self.tournament.list_of_players)
+        return TournamentPause(self.tournament)
+
+    @staticmethod
+    def save_finished_tournament(database, journal, serialized_tournament, serialized_actors):
+        """ Exports the finished tournament, then closes its journal.
+
+        :param database: the handler of the database.
+        :param journal: the journal of the tournament.
+        :param serialized_tournament: the tournament transformed in a dictionary.
+        :param serialized_actors: the actors of its players transformed in dictionaries.
+        :return: None
+        """
+        database.export_serialized_finished_tournament(serialized_tournament, serialized_actors)
+        journal.close()
 
 
 class TournamentPause:
@@ -352,7 +422,7 @@ class TournamentPause:
                       LaunchTournament(self.tournament))
         self.menu.add("auto",
                       "Changer le classement d'un joueur",
-                      ActorsRank(TournamentPause(self.tournament)))
+                      ActorsRank(TournamentPause(self.tournament), self.tournament))
         self.menu.add("auto",
                       "Interrompre le tournoi",
                       TournamentInterruption(self.tournament))
@@ -365,30 +435,119 @@ class TournamentInterruption:
     """
     Interrupts the tournament and load the datas in the database
     to be able to resume it.
+    The journal of the tournament is compacted in a snapshot.
+    The tournament is transformed in a dictionary here, then both are saved
+    by the background writer, waited for when leaving: the writer never reads
+    the instance of tournament.
     """
     def __init__(self, tournament):
         self.tournament = tournament
-        handler = DataBaseHandler()
-        handler.export_interrupted_tournament(self.tournament)
 
     def __call__(self):
+        submit(self.save_interrupted_tournament, DataBaseHandler.get_shared(),
+               TournamentJournal.of(self.tournament), self.tournament.tournament_to_dict())
         return Ending()
 
+    @staticmethod
+    def save_interrupted_tournament(handler, journal, serialized_tournament):
+        """ Exports the interrupted tournament, then compacts its journal.
+
+        :param handler: the handler of the database.
+        :param journal: the journal of the tournament.
+        :param serialized_tournament: the tournament transformed in a dictionary.
+        :return: None
+        """
+        handler.export_serialized_interrupted_tournament(serialized_tournament)
+        handler.flush()
+        journal.snapshot(serialized_tournament)
+
 
 class ResumeTournament:
-    """Resumes a tournament.
+    """ Defines a menu to choose the paused tournament to resume.
 
-    It imports the datas and progress of
-    the last tournament interrupt.
+    The paused tournaments are the tournaments in progress which have a journal,
+    from the most recent, and the interrupted tournaments of the database.
+    Only their summaries are read to build the menu.
 
     """
+    def __init__(self):
+        self.menu = Menu()
+        self.view = MenuView(self.menu)
+
     def __call__(self):
-        handler = DataBaseHandler()
-        tournament = handler.import_interrupted_tournament()
-        if tournament.list_of_players:
-            return LaunchTournament(tournament)
-        else:
+        summaries = paused_summaries()
+        if not summaries:
+            view_import_no_tournament()
+            return HomeMenuController()
+        view_paused_tournaments()
+        for summary in summaries:
+            self.menu.add("auto",
+                          f"{summary.tournament_id} - {summary.name} ({summary.location})",
+                          ResumeTournamentById(summary.tournament_id))
+        self.menu.add("auto", "Retour au Menu Principal", HomeMenuController())
+        self.menu.add("q", "Quitter", Ending())
+
+        user_choice = self.view.get_user_choice()
+        return user_choice.next_menu
+
+
+class ResumeTournamentById:
+    """ Resumes the paused tournament with the given identifier.
+
+    It rebuilds the tournament from its journal, even after a crash.
+    Without journal, it imports the datas and progress of the
+    interrupted tournament from the database.
+
+    """
+    def __init__(self, tournament_id):
+        self.tournament_id = tournament_id
+
+    def __call__(self):
+        tournament = load_paused_tournament(self.tournament_id)
+        if tournament and not tournament.list_of_players:
             return TournamentPlayersMenu(tournament)
+        return LaunchTournament(tournament)
+
+
+class LeagueDay:
+    """ Starts at once the next round of all the paused tournaments waiting for it,
+    the sections of a league day.
+
+    The rounds are paired in parallel by init_next_rounds, with PAIRING_WORKERS processes.
+    Each round started is recorded in the journal of its tournament: the results are then
+    entered section by section by resuming the tournaments, even after a crash.
+
+    """
+    def __call__(self):
+        tournaments = []
+        for summary in paused_summaries():
+            tournament = load_paused_tournament(summary.tournament_id)
+            if tournament and tournament.list_of_players and len(tournament.rounds) < NB_ROUND \
+                    and (not tournament.rounds or tournament.rounds[-1].finished):
+                tournaments.append(tournament)
+        if not tournaments:
+            view_no_league_day()
+            return HomeMenuController()
+        view_league_day(tournaments)
+        for r0und in self.start_next_rounds(tournaments):
+            view_round_matches(r0und)
+        return ResumeTournament()
+
+    @staticmethod
+    def start_next_rounds(tournaments):
+        """ Pairs the next round of the tournaments and records each round in the journal of its tournament.
+
+        The journals are opened before the rounds are added, so that the snapshot
+        of a journal opened here does not include its round already.
+
+        :param tournaments: the tournaments, whose current round is finished.
+        :return: the list of the new rounds, in the order of the tournaments.
+        """
+        journals = [TournamentJournal.of(tournament) for tournament in tournaments]
+        rounds = init_next_rounds(tournaments)
+        for journal, r0und in zip(journals, rounds):
+            journal.round_started(r0und)
+        return rounds
 
 
 class ReportMenu:
@@ -446,9 +605,8 @@ class ActorsListAlphabetical:
         self.view = MenuView(self.menu)
 
     def __call__(self):
-        handler = DataBaseHandler()
-        num_actors, actors_list = handler.import_actors()
-        report_actors_by_alpha(actors_list)
+        handler = DataBaseHandler.get_shared()
+        report_actors_by_alpha(handler.iter_actors())
         self.menu.add("auto", "Retour au choix du tri", ActorsList())
         self.menu.add("auto", "Obtenir un autre rapport", ReportMenu())
         self.menu.add("auto",
@@ -467,9 +625,8 @@ class ActorsListRank:
         self.view = MenuView(self.menu)
 
     def __call__(self):
-        handler = DataBaseHandler()
-        num_actors, actors_list = handler.import_actors()
-        report_actors_by_rank(actors_list)
+        handler = DataBaseHandler.get_shared()
+        report_actors_by_rank(handler.iter_actors())
         self.menu.add("auto", "Retour au choix du tri", ActorsList())
         self.menu.add("auto", "Obtenir un autre rapport", ReportMenu())
         self.menu.add("auto",
@@ -488,9 +645,9 @@ class TournamentsList:
         self.view = MenuView(self.menu)
 
     def __call__(self):
-        handler = DataBaseHandler()
-        tournaments = handler.import_tournaments()
-        report_tournaments_list(tournaments)
+        handler = DataBaseHandler.get_shared()
+        summaries = handler.list_tournament_summaries()
+        report_tournaments_list(summaries)
         self.menu.add("auto", "Obtenir un autre rapport", ReportMenu())
         self.menu.add("auto",
                       "Retour au Menu principal",
@@ -505,7 +662,7 @@ class TournamentReportInput:
     """ Asks for the tournament we want to get reports from """
     def __call__(self):
         tournament_id = input_tournament_id()
-        db = DataBaseHandler()
+        db = DataBaseHandler.get_shared()
         tournament = db.find_tournament_by_id(tournament_id)
         if tournament:
             handler = TournamentReportMenu(tournament)
@@ -655,4 +812,35 @@ class Ending:
         self.view = MenuView(self.menu)
 
     def __call__(self):
+        flush_writer()
+        flush_storages()
         print("Aurevoir")  # A modifier -> views
+
+
+def paused_summaries():
+    """ Lists the summaries of the paused tournaments.
+
+    They are the tournaments in progress which have a journal, from the most recent,
+    then the interrupted tournaments of the database.
+
+    :return: list of tournament summaries.
+    """
+    handler = DataBaseHandler.get_shared()
+    summaries = journaled_summaries()
+    journaled = {summary.tournament_id for summary in summaries}
+    for summary in handler.list_interrupted_tournaments():
+        if summary.tournament_id not in journaled:
+            summaries.append(summary)
+    return summaries
+
+
+def load_paused_tournament(tournament_id):
+    """ Rebuilds a paused tournament from its journal, or imports it from the database without journal.
+
+    :param tournament_id: the identifier of the tournament.
+    :return: the instance of tournament, [] if there is none.
+    """
+    tournament = load_tournament(tournament_id)
+    if tournament is None:
+        tournament = DataBaseHandler.get_shared().import_interrupted_tournament(tournament_id)
+    return tournament
@@ -6,7 +6,7 @@ This module handles the players and actors
 """
 
 
-from chess.utils.conversion import list_to_str_space
+from chess.utils.conversion import list_to_str_space, pack_ids
 from chess.utils.utils import get_new_id
 
 
@@ -14,12 +14,18 @@ ACTOR_ID_WIDTH = 8
 
 
 class Actor:
-    """ An actor is the identity of player of the different tournaments. """
+    """ An actor is the identity of player of the different tournaments.
+
+    Without actor_id, the identifier is the next one of the class counter.
+
+    """
     last_actor_id = "0" * ACTOR_ID_WIDTH
 
-    def __init__(self, last_name, first_name, birthdate, gender, rank):
-        Actor.last_actor_id = get_new_id(Actor.last_actor_id, ACTOR_ID_WIDTH)
-        self.actor_id = Actor.last_actor_id
+    def __init__(self, last_name, first_name, birthdate, gender, rank, actor_id=None):
+        if actor_id is None:
+            Actor.last_actor_id = get_new_id(Actor.last_actor_id, ACTOR_ID_WIDTH)
+            actor_id = Actor.last_actor_id
+        self.actor_id = actor_id
         self.last_name = last_name
         self.first_name = first_name
         self.birthdate = birthdate
@@ -49,7 +55,11 @@ class Actor:
 
 
 class Player:
-    """ Defines player in a specific tournament """
+    """ Defines player in a specific tournament
+
+    The previous opponents are kept in a set of player_id, packed by pack_ids when serialized.
+
+    """
     def __init__(self, actor, tournament_id, player_id):
         self.actor = actor
         self.name = self.actor.first_name + " " + self.actor.last_name
@@ -59,7 +69,7 @@ class Player:
         self.ranking = 0
         self.points = 0
         self.place = 0
-        self.opponents = []
+        self.opponents = set()
 
     def __str__(self):
         return f"Nom: {self.name} \n" \
@@ -68,11 +78,13 @@ class Player:
                f"Dans le tournoi {self.tournament_ID}: \n" \
                f"Place: {self.place}\n" \
                f"Points: {self.points}\n" \
-               f"A joué contre: {self.opponents} \n"
+               f"A joué contre: {sorted(self.opponents)} \n"
 
     def player_to_dict(self):
         """ Converts an actor into a dictionary
 
+        The actor is referenced by its identifier.
+
         :return: dictionary of the player serialiazed
 
         """
@@ -81,6 +93,14 @@ class Player:
         for attribute in string_attributes:
             serialized_player[attribute] = getattr(self, attribute)
         # no_string_attributes = ['actor', 'opponents']
-        serialized_player['actor'] = self.actor.actor_to_dict()
-        serialized_player['opponents'] = list_to_str_space(self.opponents)
+        serialized_player['actor_id'] = self.actor.actor_id
+        serialized_player['opponents'] = pack_ids(self.opponents)
         return serialized_player
+
+    def has_played(self, player):
+        """ Tells whether the player has already played against another player of the tournament.
+
+        :param player: instance of player.
+        :return: True if they have already met.
+        """
+        return player.player_id in self.opponents
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module pairs the next round of many tournaments at once, on league days with many sections.
+
+The rounds are created and the players ranked in the main process. Only what the pairing needs
+is sent to the worker processes, in plain tuples: the player_id, place, points and previous
+opponents of each player, and the players who already had a bye. The workers give back
+the pairs of player_id, and the matches are created in the main process, with the players
+of the tournaments.
+
+The pairing is deterministic: the rounds are the same as with Tournament.init_round,
+whatever the number of processes.
+
+The worker processes are spawned, not forked: the background writer and the timers
+of the write-behind storages are threads which may hold a lock at the time of a fork,
+and a forked worker would inherit the lock held forever.
+
+"""
+
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from chess.models.pairing import pair_players
+from chess.settings import PAIRING_WORKERS
+
+
+class PairingEntry:
+    """ The part of a player needed by the pairing, rebuilt in the worker processes. """
+    __slots__ = ['player_id', 'place', 'points', 'opponents']
+
+    def __init__(self, player_id, place, points, opponents):
+        self.player_id = player_id
+        self.place = place
+        self.points = points
+        self.opponents = opponents
+
+    def has_played(self, player):
+        """ Tells whether the player has already played against another player of the tournament.
+
+        :param player: instance of pairing entry.
+        :return: True if they have already met.
+        """
+        return player.player_id in self.opponents
+
+
+def pairing_job(r0und, byes):
+    """ Gathers what the pairing of a round needs, in tuples quick to send to another process.
+
+    :param r0und: the round, with its players ranked.
+    :param byes: the player_id of the players who already had a bye in the tournament.
+    :return: the tuple (round number, tuples (player_id, place, points, opponents) of the players, byes).
+    """
+    entries = [(player.player_id, player.place, player.points, tuple(player.opponents))
+               for player in r0und.players]
+    return r0und.round_nb, entries, list(byes)
+
+
+def pair_job(job):
+    """ Pairs a round in a worker process.
+
+    :param job: the tuple given by pairing_job.
+    :return: the list of the pairs of player_id in the order of the boards, and the player_id of the bye or None.
+    """
+    round_nb, entries, byes = job
+    entries = [PairingEntry(player_id, place, points, set(opponents))
+               for player_id, place, points, opponents in entries]
+    pairs, bye = pair_players(entries, round_nb, byes)
+    return [(player1.player_id, player2.player_id) for player1, player2 in pairs], \
+        None if bye is None else bye.player_id
+
+
+def init_next_rounds(tournaments, max_workers=PAIRING_WORKERS):
+    """ Launches the next round of each tournament, the pairings being computed in parallel.
+
+    The rounds started are not recorded in the journals: it is up to the caller,
+    as LeagueDay.start_next_rounds does.
+
+    :param tournaments: the tournaments, whose current round is finished.
+    :param max_workers: the number of processes, 0 for one per processor, 1 to pair in this process.
+    :return: the list of the new rounds, in the order of the tournaments.
+    """
+    rounds = [tournament.new_round(len(tournament.rounds)) for tournament in tournaments]
+    byes = [tournament.byes() for tournament in tournaments]
+    workers = min(max_workers or os.cpu_count() or 1, len(rounds))
+    if workers <= 1:
+        for r0und, tournament_byes in zip(rounds, byes):
+            r0und.define_matches(tournament_byes)
+    else:
+        jobs = [pairing_job(r0und, tournament_byes) for r0und, tournament_byes in zip(rounds, byes)]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(pair_job, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+        for r0und, (pairs, bye) in zip(rounds, results):
+            players = {player.player_id: player for player in r0und.players}
+            r0und.set_matches([(players[player1], players[player2]) for player1, player2 in pairs],
+                              None if bye is None else players[bye])
+    for tournament, r0und in zip(tournaments, rounds):
+        tournament.rounds.append(r0und)
+    return rounds
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module keeps the last deserialized tournaments in memory.
+
+The cache is bounded by a number of tournaments and by an approximate size in bytes:
+when one of the bounds is exceeded, the least recently used tournaments are dropped.
+The handlers invalidate a tournament each time they export it, and clear the cache
+when the database has been modified by someone else.
+
+The cached tournaments are shared by all the readers: a tournament got from the cache
+must not be modified without being exported again.
+
+"""
+
+
+import sys
+import threading
+from collections import OrderedDict
+
+from chess.settings import TOURNAMENT_CACHE_SIZE, TOURNAMENT_CACHE_BYTES
+
+
+def approximate_size(tournament):
+    """ Estimates the memory used by a tournament, its players, actors, rounds and matches.
+
+    Only the instances and their attribute dictionaries are counted, not the strings they share.
+
+    :param tournament: instance of tournament.
+    :return: the approximate size in bytes.
+    """
+    instances = [tournament]
+    for player in tournament.list_of_players:
+        instances += [player, player.actor]
+    for r0und in tournament.rounds:
+        instances.append(r0und)
+        instances += r0und.matches.values()
+    return sum(sys.getsizeof(instance) + sys.getsizeof(instance.__dict__) for instance in instances)
+
+
+class TournamentCache:
+    """ LRU cache of the deserialized tournaments, keyed by their identifier.
+
+    A bound of 0 means no bound on the size in bytes, and no cache at all for the number of tournaments.
+    The hits and the misses are counted since the creation of the cache.
+
+    """
+    def __init__(self, max_entries=TOURNAMENT_CACHE_SIZE, max_bytes=TOURNAMENT_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, identifier):
+        """ Gives a cached tournament and marks it as the most recently used.
+
+        :param identifier: the identifier of the tournament.
+        :return: instance of tournament, None if it is not cached.
+        """
+        with self.lock:
+            if identifier not in self.entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(identifier)
+            return self.entries[identifier][0]
+
+    def put(self, identifier, tournament):
+        """ Caches a tournament, then drops the least recently used ones beyond the bounds.
+
+        :param identifier: the identifier of the tournament.
+        :param tournament: instance of tournament.
+        :return: None
+        """
+        if self.max_entries <= 0:
+            return
+        size = approximate_size(tournament)
+        with self.lock:
+            self._pop(identifier)
+            self.entries[identifier] = (tournament, size)
+            self.size += size
+            while self.entries and (len(self.entries) > self.max_entries
+                                    or 0 < self.max_bytes < self.size):
+                self._pop(next(iter(self.entries)))
+
+    def _pop(self, identifier):
+        """ Drops a tournament, the lock being held.
+
+        :param identifier: the identifier of the tournament.
+        :return: None
+        """
+        if identifier in self.entries:
+            self.size -= self.entries.pop(identifier)[1]
+
+    def invalidate(self, identifier):
+        """ Drops a tournament, after it has been exported.
+
+        :param identifier: the identifier of the tournament.
+        :return: None
+        """
+        with self.lock:
+            self._pop(identifier)
+
+    def clear(self):
+        """ Drops all the tournaments, the counters are kept.
+
+        :return: None
+        """
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """ Gives the counters of the cache.
+
+        :return: dictionary with the hits, the misses, the number of tournaments and their approximate size.
+        """
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(self.entries), 'bytes': self.size}
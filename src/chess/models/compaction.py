@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module compacts a TinyDB file.
+
+TinyDB never reuses the identifiers of its documents, so the truncates and inserts
+of every session leave the tables numbered with holes. The compaction rewrites the
+database with the documents of each table renumbered from 1, drops the interrupted
+tournaments which have been finished since, and keeps a single copy of each actor,
+in the actors table as well as in each tournament.
+
+"""
+
+
+import json
+import os
+import time
+
+from chess.models.migration import TOURNAMENT_TABLES, normalize_tournament
+from chess.models.storage import AtomicJSONStorage, atomic_file
+
+
+def unique_by(documents, key):
+    """ Keeps the last document of each identifier, in the order of their first appearance.
+
+    :param documents: list of dictionaries.
+    :param key: the identifier key of the documents.
+    :return: the list of the documents without duplicates.
+    """
+    unique = {}
+    for document in documents:
+        unique[document[key]] = document
+    return list(unique.values())
+
+
+def compact_tournament(serialized_tournament):
+    """ Normalizes a serialized tournament and keeps a single copy of each of its actors.
+
+    :param serialized_tournament: structured dictionary.
+    :return: the compacted dictionary.
+    """
+    compacted = dict(normalize_tournament(serialized_tournament))
+    compacted['actors'] = unique_by(compacted['actors'], 'actor_id')
+    return compacted
+
+
+def load_time(path):
+    """ Measures the time to read and parse a TinyDB file.
+
+    :param path: path of the file.
+    :return: the time in seconds.
+    """
+    start = time.perf_counter()
+    AtomicJSONStorage(path).read()
+    return time.perf_counter() - start
+
+
+def compact_database(source, destination=None, finished_ids=()):
+    """ Rewrites a TinyDB file compactly.
+
+    - the documents of each table are renumbered from 1, in the order of their identifiers;
+    - an actor, a tournament, an interrupted tournament or a sequence stored twice is kept once,
+      the last copy;
+    - the interrupted tournaments which are also finished tournaments are dropped;
+    - each tournament is normalized and keeps a single copy of each of its actors.
+
+    :param source: path of the database to compact.
+    :param destination: path of the compacted database, the source itself by default.
+    :param finished_ids: identifiers of tournaments finished outside of the file, in shards.
+    :return: dictionary of the figures of the compaction: size and load time
+     before and after, number of documents dropped.
+    """
+    if destination is None:
+        destination = source
+    figures = {'size_before': os.path.getsize(source), 'load_time_before': load_time(source)}
+    tables = AtomicJSONStorage(source).read() or {}
+    nb_documents = sum(len(documents) for documents in tables.values())
+    documents_by_table = {}
+    for table_name, documents in tables.items():
+        documents_by_table[table_name] = [documents[doc_id] for doc_id in sorted(documents, key=int)]
+    for table_name in TOURNAMENT_TABLES:
+        if table_name in documents_by_table:
+            documents_by_table[table_name] = unique_by(
+                [compact_tournament(document) for document in documents_by_table[table_name]],
+                'tournament_id')
+    if 'actors' in documents_by_table:
+        documents_by_table['actors'] = unique_by(documents_by_table['actors'], 'actor_id')
+    if 'sequences' in documents_by_table:
+        documents_by_table['sequences'] = unique_by(documents_by_table['sequences'], 'name')
+    if 'interrupted_tournament' in documents_by_table:
+        finished = set(finished_ids)
+        finished.update(document['tournament_id'] for document in documents_by_table.get('tournament', []))
+        documents_by_table['interrupted_tournament'] = [
+            document for document in documents_by_table['interrupted_tournament']
+            if document['tournament_id'] not in finished]
+    compacted = {table_name: {str(doc_id): document for doc_id, document in enumerate(documents, 1)}
+                 for table_name, documents in documents_by_table.items()}
+    with atomic_file(destination) as output:
+        output.write(json.dumps(compacted))
+    figures['documents_dropped'] = nb_documents - sum(len(documents) for documents in compacted.values())
+    figures['size_after'] = os.path.getsize(destination)
+    figures['load_time_after'] = load_time(destination)
+    return figures
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module builds the crosstable of a tournament and computes the tie-breaks of the final ranking.
+
+The crosstable has a row per player and a column per round: the index of the opponent
+in the list of the players, NO_OPPONENT for a bye or a match not played yet, and the points
+scored in the round. The tie-breaks are:
+
+- buchholz: the sum of the scores of the opponents;
+- median_buchholz: the same, without the highest and the lowest, from three opponents on;
+- sonneborn_berger: the sum of the scores of the opponents, weighted by the points scored against them;
+- progressive: the sum of the scores after each round.
+
+The final places are given by the score, then by these tie-breaks in this order,
+then by the rank. There is no performance tie-break: the players have no rating, their rank is their place
+in the national ranking, where the lower is the better.
+
+When NumPy is installed, the tie-breaks are computed on arrays. Otherwise they are computed
+with loops, which give the same values: all the values are sums of halves and integers,
+so the order of the additions does not change them.
+
+"""
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from chess.models.match import POINTS
+
+
+NO_OPPONENT = -1
+TIE_BREAKS = ['score', 'buchholz', 'median_buchholz', 'sonneborn_berger', 'progressive']
+RESULTS = {0: (POINTS["draw"], POINTS["draw"]),
+           1: (POINTS["victory"], POINTS["defeat"]),
+           2: (POINTS["defeat"], POINTS["victory"])}
+
+
+class Crosstable:
+    """ The opponents and the results of the players of a tournament, round by round.
+
+    Only the matches whose result is declared are counted, and the byes of the finished rounds.
+
+    """
+    def __init__(self, tournament):
+        self.players = list(tournament.list_of_players)
+        self.nb_rounds = len(tournament.rounds)
+        index = {player.player_id: num for num, player in enumerate(self.players)}
+        self.opponents = [[NO_OPPONENT] * self.nb_rounds for _ in self.players]
+        self.results = [[0] * self.nb_rounds for _ in self.players]
+        for num_round, r0und in enumerate(tournament.rounds):
+            for match in r0und.matches.values():
+                if not match.finished:
+                    continue
+                first, second = index[match.player1.player_id], index[match.player2.player_id]
+                self.opponents[first][num_round] = second
+                self.opponents[second][num_round] = first
+                self.results[first][num_round], self.results[second][num_round] = RESULTS[match.winner]
+            if r0und.bye is not None and r0und.finished:
+                self.results[index[r0und.bye.player_id]][num_round] = POINTS["victory"]
+
+    def tie_breaks(self):
+        """ Computes the tie-breaks, with NumPy when it is installed.
+
+        :return: dictionary tie-break name -> list of the values, in the order of the players.
+        """
+        if numpy is not None:
+            return numpy_tie_breaks(self)
+        return python_tie_breaks(self)
+
+
+def assign_final_places(players, tie_breaks):
+    """ Writes the final place of the players, ordered by score, by the tie-breaks and by rank.
+
+    :param players: the players of the tournament, in the order of the crosstable.
+    :param tie_breaks: dictionary tie-break name -> list of the values, in the order of the players.
+    :return: None
+    """
+    def final_key(num):
+        return tuple(-tie_breaks[name][num] for name in TIE_BREAKS) + (players[num].rank, players[num].player_id)
+
+    for place, num in enumerate(sorted(range(len(players)), key=final_key), 1):
+        players[num].place = place
+
+
+def python_tie_breaks(crosstable):
+    """ Computes the tie-breaks of a crosstable with loops.
+
+    :param crosstable: instance of crosstable.
+    :return: dictionary tie-break name -> list of the values, in the order of the players.
+    """
+    scores = [float(sum(results)) for results in crosstable.results]
+    tie_breaks = {name: [] for name in TIE_BREAKS}
+    for num, (opponents, results) in enumerate(zip(crosstable.opponents, crosstable.results)):
+        games = [(opponent, result) for opponent, result in zip(opponents, results) if opponent != NO_OPPONENT]
+        opponent_scores = [scores[opponent] for opponent, _ in games]
+        buchholz = float(sum(opponent_scores))
+        median_buchholz = buchholz
+        if len(games) >= 3:
+            median_buchholz = buchholz - max(opponent_scores) - min(opponent_scores)
+        progressive = 0.0
+        cumulated = 0.0
+        for result in results:
+            cumulated += result
+            progressive += cumulated
+        tie_breaks['score'].append(scores[num])
+        tie_breaks['buchholz'].append(buchholz)
+        tie_breaks['median_buchholz'].append(median_buchholz)
+        tie_breaks['sonneborn_berger'].append(float(sum(result * scores[opponent] for opponent, result in games)))
+        tie_breaks['progressive'].append(progressive)
+    return tie_breaks
+
+
+def numpy_tie_breaks(crosstable):
+    """ Computes the tie-breaks of a crosstable with NumPy array operations.
+
+    :param crosstable: instance of crosstable.
+    :return: dictionary tie-break name -> list of the values, in the order of the players.
+    """
+    shape = (len(crosstable.players), crosstable.nb_rounds)
+    opponents = numpy.array(crosstable.opponents, dtype=numpy.int64).reshape(shape)
+    results = numpy.array(crosstable.results, dtype=numpy.float64).reshape(shape)
+    played = opponents != NO_OPPONENT
+    opponent_index = numpy.where(played, opponents, 0)
+    nb_games = played.sum(axis=1)
+
+    scores = results.sum(axis=1)
+    opponent_scores = numpy.where(played, scores[opponent_index], 0.0)
+    buchholz = opponent_scores.sum(axis=1)
+    highest = numpy.where(played, opponent_scores, -numpy.inf).max(axis=1, initial=-numpy.inf)
+    lowest = numpy.where(played, opponent_scores, numpy.inf).min(axis=1, initial=numpy.inf)
+    enough = nb_games >= 3
+    median_buchholz = buchholz - numpy.where(enough, highest, 0.0) - numpy.where(enough, lowest, 0.0)
+    sonneborn_berger = (results * opponent_scores).sum(axis=1)
+    progressive = results.cumsum(axis=1).sum(axis=1)
+    return {'score': scores.tolist(),
+            'buchholz': buchholz.tolist(),
+            'median_buchholz': median_buchholz.tolist(),
+            'sonneborn_berger': sonneborn_berger.tolist(),
+            'progressive': progressive.tolist()}
@@ -9,20 +9,32 @@ Then it is a class to handle exports and imports between the database and the pr
 """
 
 
-from tinydb import TinyDB, Query
+import os
+
+from tinydb import TinyDB
+from tinydb.table import Document
+
+from chess.settings import DB_BACKEND, DB_PATH, WRITE_BEHIND
 
 from chess.models.actors import Actor, Player
 from chess.models.match import Match
 from chess.models.round import Round
-from chess.models.tournament import Tournament
+from chess.models.tournament import Tournament, TournamentSummary
+from chess.models.storage import shared_storage, release_storage
+from chess.models.writer import flush_writer
+from chess.models.query import TournamentQueryIndex
+from chess.models.cache import TournamentCache
+from chess.models.history import ActorHistoryIndex, tournament_players, read_player_history, read_head_to_head
 
 from chess.utils.conversion import str_to_date, \
-    str_space_to_list, str_space_to_int_list
+    str_space_to_list, unpack_ids
 
-from chess.utils.utils import get_last_id
+from chess.utils.utils import get_last_id, format_id
 
 
 ID_WIDTH = 8
+ACTOR_SEQUENCE = 'actors'
+TOURNAMENT_SEQUENCE = 'tournaments'
 
 
 def deserialize_actor(serialized_actor):
@@ -37,61 +49,108 @@ def deserialize_actor(serialized_actor):
                   serialized_actor['first_name'],
                   str_to_date(serialized_actor['birthdate']),
                   serialized_actor['gender'],
-                  serialized_actor['rank'])
-    actor.actor_id = serialized_actor['actor_id']
+                  serialized_actor['rank'],
+                  serialized_actor['actor_id'])
     actor.list_of_tournaments_played = str_space_to_list(serialized_actor['tournaments'])
     return actor
 
 
-def deserialize_player(serialized_player):
+class IdentityMap:
+    """ The actors and players built during the load of a tournament.
+
+    Each actor is built once by actor_id, and each player once by (tournament_ID, player_id),
+    then the same instances are shared by the list of players, the rounds and the matches.
+    A tournament of the former schema, whose rounds and matches embed full copies
+    of the players, is deserialized without building the copies.
+
+    """
+    def __init__(self):
+        self.actors = {}
+        self.players = {}
+
+    def actor(self, serialized_actor):
+        """ Gives the actor instance of a serialized actor, built at its first occurrence.
+
+        :param serialized_actor: structured dictionary.
+        :return: instance of actor.
+        """
+        actor = self.actors.get(serialized_actor['actor_id'])
+        if actor is None:
+            actor = deserialize_actor(serialized_actor)
+            self.actors[actor.actor_id] = actor
+        return actor
+
+    def player(self, reference, tournament_id):
+        """ Gives the player instance of a reference, built at its first occurrence.
+
+        :param reference: the player_id, or the embedded player of the former schema.
+        :param tournament_id: the tournament_ID of the players referenced by their player_id.
+        :return: instance of player.
+        """
+        if isinstance(reference, dict):
+            key = reference['tournament_ID'], reference['player_id']
+        else:
+            key = tournament_id, reference
+        player = self.players.get(key)
+        if player is None:
+            player = deserialize_player(reference, self)
+            self.players[key] = player
+        return player
+
+
+def deserialize_player(serialized_player, identity_map):
     """
     Transforms a dictionary containing the values of a player instance
      into the corresponding player instance.
 
-    :param serialized_player: structured dictionary.
+    :param serialized_player: structured dictionary, referencing its actor by actor_id or embedding it.
+    :param identity_map: the identity map of the load.
     :return: instance of player.
     """
-    actor = deserialize_actor(serialized_player['actor'])
+    if 'actor_id' in serialized_player:
+        actor = identity_map.actors[serialized_player['actor_id']]
+    else:
+        actor = identity_map.actor(serialized_player['actor'])
     player = Player(actor,
                     serialized_player['tournament_ID'],
                     serialized_player['player_id'])
     string_attribute = ['name', 'rank', 'ranking', 'points', 'place']
     for key in string_attribute:
         setattr(player, key, serialized_player[key])
-    player.opponents = str_space_to_int_list(serialized_player['opponents'])
+    player.opponents = unpack_ids(serialized_player['opponents'])
     return player
 
 
-def deserialize_match(serialized_match):
+def deserialize_match(serialized_match, identity_map):
     """
     Transforms a dictionary containing the values of a match instance
      into the corresponding match instance.
     :param serialized_match: structured dictionary.
+    :param identity_map: the identity map of the load.
     :return: instance of match.
     """
     match = Match(serialized_match['match_nb'],
                   serialized_match['round_nb'],
                   serialized_match['tournament_ID'])
-    player1 = deserialize_player(serialized_match['player1'])
-    setattr(match, 'player1', player1)
-    player2 = deserialize_player(serialized_match['player2'])
-    setattr(match, 'player2', player2)
+    setattr(match, 'player1', identity_map.player(serialized_match['player1'], match.tournament_ID))
+    setattr(match, 'player2', identity_map.player(serialized_match['player2'], match.tournament_ID))
     string_attribute = ['winner', 'finished', 'points_assigned']
     for attribute in string_attribute:
         setattr(match, attribute, serialized_match[attribute])
     return match
 
 
-def deserialize_round(serialized_round):
+def deserialize_round(serialized_round, identity_map):
     """
     Transforms a dictionary containing the values of a round instance
      into the corresponding round instance.
     :param serialized_round: structured dictionary.
+    :param identity_map: the identity map of the load.
     :return: instance of round.
     """
     deserialized_players = []
-    for player in serialized_round['players']:
-        deserialized_players.append(deserialize_player(player))
+    for reference in serialized_round['players']:
+        deserialized_players.append(identity_map.player(reference, serialized_round['tournament_ID']))
     r0und = Round(serialized_round['round_nb'],
                   serialized_round['tournament_ID'],
                   deserialized_players)
@@ -100,9 +159,11 @@ def deserialize_round(serialized_round):
         setattr(r0und, attribute, serialized_round[attribute])
     r0und.start_date = str_to_date(serialized_round['start_date'])
     r0und.end_date = str_to_date(serialized_round['end_date'])
+    if serialized_round.get('bye') is not None:
+        r0und.bye = identity_map.player(serialized_round['bye'], serialized_round['tournament_ID'])
     matches = {}
     for match_nb, match in serialized_round['matches'].items():
-        matches[int(match_nb)] = deserialize_match(match)
+        matches[int(match_nb)] = deserialize_match(match, identity_map)
     setattr(r0und, 'matches', matches)
     return r0und
 
@@ -111,15 +172,19 @@ def deserialize_tournament(serialized_tournament):
     """
     Transforms a dictionary containing the values of a tournament instance
      into the corresponding tournament instance.
-    :param serialized_tournament: structured dictionary.
+
+    The actors and players are built through an identity map: each of them is built once
+    and shared by the rounds and matches, whatever the schema of the tournament.
+
+    :param serialized_tournament: structured dictionary, normalized or of the former schema.
     :return: instance of tournament.
     """
     tour = Tournament(serialized_tournament['name'],
                       serialized_tournament['location'],
                       serialized_tournament['timer_type'],
-                      serialized_tournament['description'])
-    string_attributes = ['tournament_id',
-                         'number_of_rounds',
+                      serialized_tournament['description'],
+                      serialized_tournament['tournament_id'])
+    string_attributes = ['number_of_rounds',
                          'players_assigned']
     for attribute in string_attributes:
         setattr(tour, attribute, serialized_tournament[attribute])
@@ -127,19 +192,271 @@ def deserialize_tournament(serialized_tournament):
     tour.start_date = str_to_date(serialized_tournament['start_date'])
     tour.end_date = str_to_date(serialized_tournament['end_date'])
 
+    identity_map = IdentityMap()
+    for actor in serialized_tournament.get('actors', []):
+        identity_map.actor(actor)
+    tour.list_of_players = []
+    for serialized_player in serialized_tournament['list_of_players']:
+        tour.list_of_players.append(identity_map.player(serialized_player, None))
     tour.rounds = []
     for r0und in serialized_tournament['rounds']:
-        tour.rounds.append(deserialize_round(r0und))
-    tour.list_of_players = []
-    for player in serialized_tournament['list_of_players']:
-        tour.list_of_players.append(deserialize_player(player))
+        tour.rounds.append(deserialize_round(r0und, identity_map))
     return tour
 
 
+def deserialize_tournament_summary(serialized_tournament):
+    """
+    Transforms a dictionary containing the values of a tournament instance
+     into the summary of the tournament, without its players, rounds and matches.
+
+    :param serialized_tournament: structured dictionary.
+    :return: instance of tournament summary.
+    """
+    summary = TournamentSummary(*[serialized_tournament[attribute]
+                                  for attribute in TournamentSummary.header_attributes])
+    summary.start_date = str_to_date(serialized_tournament['start_date'])
+    summary.end_date = str_to_date(serialized_tournament['end_date'])
+    return summary
+
+
 class DataBaseHandler:
-    """ Handles the exports and imports between the program and the database. """
-    def __init__(self):
-        self.database = TinyDB('db.json')
+    """ Handles the exports and imports between the program and the database.
+
+    The parsed database is kept in memory by a middleware shared by the whole process,
+    and read again only when the file is modified by someone else.
+    Without write_behind each change is written on disk immediately, with write_behind
+    the file is written at most once per flush interval, or when flush is called.
+
+    The documents of the actors, tournament and interrupted_tournament tables are indexed by their identifier
+    when the database is opened, so that a lookup by identifier does not scan the table.
+    Every insert, update or truncate made through the handler keeps the indexes up to date.
+
+    The headers of the finished tournaments are also indexed by location, timer type,
+    dates and name, for the queries of query_tournaments, and the tournaments played
+    by each actor are indexed for player_history and head_to_head.
+
+    The last tournaments found by their identifier are kept deserialized in an LRU cache,
+    invalidated when they are exported and cleared when the file is read again.
+
+    The identifiers of new actors and tournaments are handed out by sequences stored
+    in the table sequences, which memorize the last identifier given.
+
+    There is a single handler per file: two handlers of the same file would each keep
+    their indexes and their TinyDB tables, made stale by the writes of the other one.
+    The handlers are given by open, and the constructor refuses a file which already has one.
+    The controllers use the handler given by get_shared, which lives as long as the process.
+    The background writer uses the handler only between two calls of get_shared.
+
+    """
+    shared = None
+    handlers = {}
+
+    def __init__(self, path=DB_PATH, write_behind=WRITE_BEHIND):
+        if os.path.abspath(path) in DataBaseHandler.handlers:
+            raise ValueError(f"The database {path} already has a handler, given by DataBaseHandler.open")
+        self.path = path
+        self.write_behind = write_behind
+        if write_behind:
+            self.storage = shared_storage(path)
+        else:
+            self.storage = shared_storage(path, flush_interval=0)
+        self.database = TinyDB(path, storage=self.storage)
+        self._actors_index = {}
+        self._tournaments_index = {}
+        self._interrupted_index = {}
+        self._sequences_index = {}
+        self._query_index = TournamentQueryIndex()
+        self._history_index = ActorHistoryIndex()
+        self.cache = TournamentCache()
+        self._build_indexes()
+        DataBaseHandler.handlers[os.path.abspath(path)] = self
+
+    @classmethod
+    def open(cls, path=DB_PATH, **options):
+        """ Gives the handler of a database file, created at the first call for this file.
+
+        An existing handler is refreshed. It must be of the same class, with the same write_behind.
+
+        :param path: path of the database file.
+        :param options: the other arguments of the constructor, used only to create the handler.
+        :return: the handler of the file.
+        """
+        handler = DataBaseHandler.handlers.get(os.path.abspath(path))
+        if handler is None:
+            return cls(path, **options)
+        if type(handler) is not cls or options.get('write_behind', handler.write_behind) != handler.write_behind:
+            raise ValueError(f"The database {path} is already open by a {type(handler).__name__} "
+                             f"with write_behind={handler.write_behind}")
+        handler.refresh()
+        return handler
+
+    def close(self):
+        """ Writes the changes kept in memory on disk, then forgets the handler and its storage.
+
+        The handler must not be used anymore, open gives a new one.
+
+        :return: None
+        """
+        release_storage(self.path)
+        DataBaseHandler.handlers.pop(os.path.abspath(self.path), None)
+        if DataBaseHandler.shared is self:
+            DataBaseHandler.shared = None
+
+    @staticmethod
+    def get_shared():
+        """ Gives the handler shared by the controllers, created at the first call.
+
+        The backend of the shared handler is given by the setting DB_BACKEND,
+        and its handler is the one of the database file, given by open.
+        The saves submitted to the background writer are waited for,
+        then the shared handler is refreshed at each call.
+
+        :return: the shared handler of the database.
+        """
+        flush_writer()
+        if DataBaseHandler.shared is None:
+            DataBaseHandler.shared = create_handler()
+        else:
+            DataBaseHandler.shared.refresh()
+        return DataBaseHandler.shared
+
+    def refresh(self):
+        """ Reads the database again if the file has been modified on disk by someone else.
+
+        The TinyDB instance is opened again on the same storage to forget its tables,
+        then the indexes are rebuilt.
+
+        :return: None
+        """
+        if self.storage.reload_if_changed():
+            self.database = TinyDB(self.path, storage=self.storage)
+            self._build_indexes()
+            self.cache.clear()
+
+    def _build_indexes(self):
+        """ Builds the identifier -> document indexes of the tables of the handler.
+
+        :return: None
+        """
+        self._actors_index = {}
+        for document in self.database.table('actors').all():
+            self._actors_index[document['actor_id']] = document
+        self._tournaments_index = {}
+        for document in self.database.table('tournament').all():
+            self._tournaments_index[document['tournament_id']] = document
+        self._interrupted_index = {}
+        for document in self.database.table('interrupted_tournament').all():
+            self._interrupted_index[document['tournament_id']] = document
+        self._sequences_index = {}
+        for document in self.database.table('sequences').all():
+            self._sequences_index[document['name']] = document
+        self._build_query_index()
+        self._build_history_index()
+
+    def _build_query_index(self):
+        """ Builds the secondary indexes of the headers of the finished tournaments.
+
+        :return: None
+        """
+        self._query_index = TournamentQueryIndex(self._tournaments_index.values())
+
+    def _build_history_index(self):
+        """ Builds the index of the finished tournaments played by each actor.
+
+        :return: None
+        """
+        self._history_index = ActorHistoryIndex((identifier, tournament_players(serialized_tournament))
+                                                for identifier, serialized_tournament
+                                                in self._tournaments_index.items())
+
+    def _sequence_last(self, sequence):
+        """ Gives the last number handed out by a sequence.
+
+        A sequence which is not stored yet starts after the greatest identifier in the database.
+
+        :param sequence: ACTOR_SEQUENCE or TOURNAMENT_SEQUENCE.
+        :return: the last number of the sequence.
+        """
+        if sequence in self._sequences_index:
+            return self._sequences_index[sequence]['last']
+        if sequence == ACTOR_SEQUENCE:
+            identifiers = list(self._actors_index)
+        else:
+            identifiers = list(self._tournaments_index) + list(self._interrupted_index)
+        return int(get_last_id(identifiers, ID_WIDTH))
+
+    def reserve_ids(self, sequence, count=1):
+        """ Reserves a block of identifiers, which will never be handed out again.
+
+        :param sequence: ACTOR_SEQUENCE or TOURNAMENT_SEQUENCE.
+        :param count: the number of identifiers to reserve.
+        :return: the list of the reserved identifiers.
+        """
+        last = self._sequence_last(sequence)
+        dictio = {'name': sequence, 'last': last + count}
+        self._upsert_documents([('sequences', self._sequences_index, 'name', [dictio])])
+        return [format_id(number, ID_WIDTH) for number in range(last + 1, last + count + 1)]
+
+    def new_id(self, sequence):
+        """ Hands out a new identifier.
+
+        :param sequence: ACTOR_SEQUENCE or TOURNAMENT_SEQUENCE.
+        :return: the new identifier.
+        """
+        return self.reserve_ids(sequence)[0]
+
+    def flush(self):
+        """ Writes on disk the changes kept in memory by the write-behind storage.
+
+        :return: None
+        """
+        self.storage.flush()
+
+    def _upsert_documents(self, batches, removals=()):
+        """ Updates or inserts documents in several tables with a single write of the file.
+
+        All the changes are applied on the data read from the storage,
+        then the database is written once and the indexes are updated.
+
+        The public insert_multiple and upsert of TinyDB write the file once per table and per call.
+        To write it once, this method relies on Table._get_next_id, a private method of TinyDB,
+        so that the identifiers of the new documents stay those TinyDB would give:
+        TinyDB is pinned to 4.3.0 in requirements.txt, check this method before upgrading it.
+
+        :param batches: list of tuples (table name, index of the table,
+         identifier key, list of serialized instances).
+        :param removals: list of tuples (table name, index of the table, identifier)
+         of the documents to remove in the same write.
+        :return: None
+        """
+        with self.storage.lock:
+            self._apply_documents(batches, removals)
+
+    def _apply_documents(self, batches, removals):
+        """ Applies the changes of _upsert_documents, the lock of the storage being held.
+
+        :param batches: see _upsert_documents.
+        :param removals: see _upsert_documents.
+        :return: None
+        """
+        tables = self.database.storage.read() or {}
+        for table_name, index, identifier in removals:
+            if identifier in index:
+                del tables[table_name][str(index.pop(identifier).doc_id)]
+                self.database.table(table_name).clear_cache()
+        for table_name, index, key, documents in batches:
+            table = self.database.table(table_name)
+            raw_table = tables.setdefault(table_name, {})
+            for dictio in documents:
+                if dictio[key] in index:
+                    doc_id = index[dictio[key]].doc_id
+                else:
+                    # Private in TinyDB 4.3.0: keeps the next identifier of the table in step.
+                    doc_id = table._get_next_id()
+                raw_table[str(doc_id)] = dictio
+                index[dictio[key]] = Document(dictio, doc_id)
+            table.clear_cache()
+        self.database.storage.write(tables)
 
     def export_actor(self, actor):
         """ Transfers an instance of actor in a table of the database
@@ -149,13 +466,16 @@ class DataBaseHandler:
         :param actor: instance of actor
         :return: None
         """
-        actors_table = self.database.table('actors')
-        query = Query()
-        dictio = actor.actor_to_dict()
-        if actors_table.search(query.actor_id == actor.actor_id):
-            actors_table.update(dictio, query.actor_id == actor.actor_id)
-        else:
-            actors_table.insert(dictio)
+        self.export_actors([actor])
+
+    def export_actors(self, actors):
+        """ Transfers instances of actor in a table of the database, with a single write.
+
+        :param actors: iterable of actor instances
+        :return: None
+        """
+        dictios = [actor.actor_to_dict() for actor in actors]
+        self._upsert_documents([('actors', self._actors_index, 'actor_id', dictios)])
 
     def import_actor(self, identifier):
         """ Transfers the serialized actor with the given identifier from the database.
@@ -163,15 +483,25 @@ class DataBaseHandler:
         :param identifier: the identifier of the chosen actor.
         :return: the instance of the corresponding actor.
         """
-        actors = self.database.table('actors')
-        query = Query()
-        if actors.search(query.actor_id == identifier):
-            actor_dict = actors.search(query.actor_id == identifier)[0]
-            actor = deserialize_actor(actor_dict)
+        if identifier in self._actors_index:
+            actor = deserialize_actor(self._actors_index[identifier])
         else:
             actor = {}
         return actor
 
+    def truncate_actors(self):
+        """ Clears the actors table and its index.
+
+        The actors sequence is stored first, so that the identifiers of the cleared actors
+        are not handed out again.
+
+        :return: None
+        """
+        self.reserve_ids(ACTOR_SEQUENCE, 0)
+        with self.storage.lock:
+            self.database.table('actors').truncate()
+        self._actors_index = {}
+
     def import_actors(self):
         """ Imports a list of actors instances transformed in a dictionary.
 
@@ -179,43 +509,65 @@ class DataBaseHandler:
 
         :return: the number of actors imported and the list of actors instances.
         """
-        actors_table = self.database.table('actors')
-        serialized_actors = actors_table.all()
-        actors = []
-        for value in serialized_actors:
-            actor = deserialize_actor(value)
-            actors.append(actor)
-        return len(serialized_actors), actors
+        actors = list(self.iter_actors())
+        return len(actors), actors
+
+    def iter_actors(self):
+        """ Gives the actors instances one at a time, for the reports.
+
+        The actors are built one at a time from the index, which holds all the serialized actors:
+        it saves building the list of the instances, not the memory of the parsed file.
+
+        :return: generator of actors instances.
+        """
+        for serialized_actor in self._actors_index.values():
+            yield deserialize_actor(serialized_actor)
 
     def export_interrupted_tournament(self, tournament):
-        """ Transfers an instance of tournament in a table of the database.
+        """ Transfers an instance of tournament in the table of the interrupted tournaments.
 
         The instance of tournament is transformed in a dictionary.
-        Then it is transferred to the database.
+        Then it replaces the interrupted tournament with the same identifier,
+        the other interrupted tournaments are kept.
 
         :param tournament: instance of tournament
         :return: None
         """
-        tournament_table = self.database.table('interrupted_tournament')
-        tournament_table.truncate()
-        dictio = tournament.tournament_to_dict()
-        tournament_table.insert(dictio)
+        self.export_serialized_interrupted_tournament(tournament.tournament_to_dict())
 
-    def import_interrupted_tournament(self):
-        """ Imports a list of one tournament transformed in a dictionary.
+    def export_serialized_interrupted_tournament(self, serialized_tournament):
+        """ Transfers a tournament already transformed in a dictionary in the table of the interrupted tournaments.
 
-        It is converted in  the corresponding instance of tournament.
-        Then it is transferred to the database.
+        The background writer is given the dictionary, made by the controller,
+        rather than the instance of tournament which the controller may still modify.
+
+        :param serialized_tournament: structured dictionary given by tournament_to_dict.
+        :return: None
+        """
+        self._upsert_documents([('interrupted_tournament',
+                                 self._interrupted_index,
+                                 'tournament_id',
+                                 [serialized_tournament])])
+
+    def import_interrupted_tournament(self, identifier):
+        """ Imports the interrupted tournament with the given identifier.
 
-        :return: the instance of tournament.
+        :param identifier: the identifier of the interrupted tournament.
+        :return: the instance of tournament, [] if there is none.
         """
-        tournament_table = self.database.table('interrupted_tournament')
-        list_serialized_tournament = tournament_table.all()
-        if not list_serialized_tournament:
+        if identifier not in self._interrupted_index:
             return []
-        serialized_tournament = list_serialized_tournament[0]
-        tournament = deserialize_tournament(serialized_tournament)
-        return tournament
+        return deserialize_tournament(self._interrupted_index[identifier])
+
+    def list_interrupted_tournaments(self):
+        """ Lists the summaries of the interrupted tournaments, without building them.
+
+        :return: list of tournament summaries.
+        """
+        summaries = []
+        for serialized_tournament in self._interrupted_index.values():
+            summaries.append(deserialize_tournament_summary(serialized_tournament))
+        return summaries
 
     def export_tournament(self, tournament):
         """ Transfers an instance of tournament in a table of the database.
@@ -226,35 +578,57 @@ class DataBaseHandler:
         :param tournament: instance of tournament
         :return: None
         """
-        tournaments_table = self.database.table('tournament')
         dictio = tournament.tournament_to_dict()
-        query = Query()
-        if tournaments_table.search(query.tournament_id == tournament.tournament_id):
-            tournaments_table.update(dictio, query.tournament_id == tournament.tournament_id)
-        else:
-            tournaments_table.insert(dictio)
+        self._upsert_documents([('tournament', self._tournaments_index, 'tournament_id', [dictio])])
+        self._query_index.add(dictio)
+        self._history_index.add(dictio['tournament_id'], tournament_players(dictio))
+        self.cache.invalidate(dictio['tournament_id'])
 
     def export_finished_tournament(self, tournament):
         """ Exports actor instances of players and the tournament when finished
 
+        The tournament and the actors are written in a single write of the database,
+        which also removes the tournament from the interrupted tournaments.
+
         :param tournament: the finished tournament, ready to be exported
         :return: None
         """
-        self.export_tournament(tournament)
-        for player in tournament.list_of_players:
-            self.export_actor(player.actor)
+        self.export_serialized_finished_tournament(tournament.tournament_to_dict(),
+                                                   [player.actor.actor_to_dict()
+                                                    for player in tournament.list_of_players])
+
+    def export_serialized_finished_tournament(self, serialized_tournament, serialized_actors):
+        """ Exports a finished tournament and the actors of its players, already transformed in dictionaries.
+
+        The background writer is given the dictionaries, made by the controller,
+        rather than the tournament and its actors which the controllers may still modify.
+
+        :param serialized_tournament: structured dictionary given by tournament_to_dict.
+        :param serialized_actors: the actors of the players, given by actor_to_dict.
+        :return: None
+        """
+        dictio = serialized_tournament
+        self._upsert_documents([('tournament', self._tournaments_index, 'tournament_id', [dictio]),
+                                ('actors', self._actors_index, 'actor_id', serialized_actors)],
+                               [('interrupted_tournament', self._interrupted_index, dictio['tournament_id'])])
+        self._query_index.add(dictio)
+        self._history_index.add(dictio['tournament_id'], tournament_players(dictio))
+        self.cache.invalidate(dictio['tournament_id'])
 
     def find_tournament_by_id(self, identifier):
         """ Finds the tournament in the database by entering its identifier.
 
+        The tournament is deserialized only if it is not in the cache.
+
         :param identifier: the identifier of the searched tournament.
         :return: instance of the searched tournament.
         """
-        tournaments = self.database.table('tournament')
-        query = Query()
-        if tournaments.search(query.tournament_id == identifier):
-            tournament_dict = tournaments.search(query.tournament_id == identifier)[0]
-            tournament = deserialize_tournament(tournament_dict)
+        tournament = self.cache.get(identifier)
+        if tournament is not None:
+            return tournament
+        if identifier in self._tournaments_index:
+            tournament = deserialize_tournament(self._tournaments_index[identifier])
+            self.cache.put(identifier, tournament)
         else:
             tournament = {}
         return tournament
@@ -262,28 +636,88 @@ class DataBaseHandler:
     def import_last_tournament_id(self):
         """ Imports the last tournament identifier created
 
-        It imports the list of tournament identifier.
-        With the list, the last identifier is deduced.
+        It is the last identifier handed out by the tournaments sequence.
 
         :return: the last tournament identifier
         """
-        list_of_id = []
-        for tournament in self.database.table('tournament').all():
-            for key, value in tournament.items():
-                if key == "tournament_id":
-                    list_of_id.append(value)
-        last_id = get_last_id(list_of_id, ID_WIDTH)
-        return last_id
+        return format_id(self._sequence_last(TOURNAMENT_SEQUENCE), ID_WIDTH)
 
     def import_tournaments(self):
         """ Imports a list of tournaments instances from the database.
 
         :return: list of tournaments instances.
         """
-        tournaments_table = self.database.table('tournament')
-        serialized_tournaments = tournaments_table.all()
-        tournaments = []
-        for value in serialized_tournaments:
-            tournament = deserialize_tournament(value)
-            tournaments.append(tournament)
-        return tournaments
+        return list(self.iter_tournaments())
+
+    def iter_tournaments(self):
+        """ Gives the tournaments instances one at a time.
+
+        The tournaments are built one at a time from the index, which holds all the serialized
+        tournaments: it saves building the list of the instances, not the memory of the parsed file.
+
+        :return: generator of tournaments instances.
+        """
+        for serialized_tournament in self._tournaments_index.values():
+            yield deserialize_tournament(serialized_tournament)
+
+    def list_tournament_summaries(self):
+        """ Lists the summaries of the tournaments, without building the tournaments.
+
+        :return: list of tournament summaries.
+        """
+        summaries = []
+        for serialized_tournament in self._tournaments_index.values():
+            summaries.append(deserialize_tournament_summary(serialized_tournament))
+        return summaries
+
+    def query_tournaments(self, **criteria):
+        """ Lists the summaries of the finished tournaments matching the criteria.
+
+        The criteria are those of TournamentQueryIndex.query, for instance:
+        handler.query_tournaments(timer_type="Bz", location="Paris",
+                                  start_after=datetime.date(2021, 1, 1), start_before=datetime.date(2021, 12, 31))
+
+        :param criteria: start_after, start_before, end_after, end_before, location, timer_type, name_prefix.
+        :return: list of tournament summaries, sorted by identifier.
+        """
+        return [deserialize_tournament_summary(self._query_index.headers[identifier])
+                for identifier in self._query_index.query(**criteria)]
+
+    def player_history(self, actor_id):
+        """ Lists the players of an actor in the finished tournaments, reading only its tournaments.
+
+        :param actor_id: the identifier of the actor.
+        :return: list of tuples (tournament, player), sorted by tournament identifier.
+        """
+        return read_player_history(self.find_tournament_by_id, self._history_index.tournaments_of(actor_id))
+
+    def head_to_head(self, actor_id, other_actor_id):
+        """ Lists the matches played between two actors, reading only their common tournaments.
+
+        :param actor_id: the identifier of the first actor.
+        :param other_actor_id: the identifier of the second actor.
+        :return: list of matches, sorted by tournament identifier then by round.
+        """
+        return read_head_to_head(self.find_tournament_by_id,
+                                 self._history_index.common_tournaments(actor_id, other_actor_id))
+
+
+def create_handler(backend=DB_BACKEND):
+    """ Creates a handler of the database for the given backend.
+
+    :param backend: "tinydb", "sqlite", "sharded" or "packed".
+    :return: the handler of the database.
+    """
+    if backend == "tinydb":
+        return DataBaseHandler.open()
+    if backend == "sqlite":
+        # Imported here because the SQLite backend uses the functions of this module.
+        from chess.models.sqlite_database import SQLiteDataBaseHandler
+        return SQLiteDataBaseHandler()
+    if backend == "sharded":
+        from chess.models.sharded_database import ShardedDataBaseHandler
+        return ShardedDataBaseHandler.open()
+    if backend == "packed":
+        from chess.models.packed_archive import PackedDataBaseHandler
+        return PackedDataBaseHandler()
+    raise ValueError(f"Unknown database backend: {backend}")
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module indexes the finished tournaments played by each actor.
+
+The index maps each actor identifier to the identifiers of the tournaments it played,
+with its player identifier in each of them. The history of an actor, or the matches
+played between two actors, are then read from their tournaments only.
+
+"""
+
+
+def tournament_players(serialized_tournament):
+    """ Gives the actors of a serialized tournament with their player identifier.
+
+    :param serialized_tournament: structured dictionary, normalized or not.
+    :return: list of tuples (actor_id, player_id).
+    """
+    players = []
+    for serialized_player in serialized_tournament['list_of_players']:
+        if 'actor_id' in serialized_player:
+            actor_id = serialized_player['actor_id']
+        else:
+            actor_id = serialized_player['actor']['actor_id']
+        players.append((actor_id, serialized_player['player_id']))
+    return players
+
+
+class ActorHistoryIndex:
+    """ Reverse index actor_id -> [(tournament_id, player_id)], kept up to date by the handlers. """
+    def __init__(self, tournaments=()):
+        self.played = {}
+        self.actors = {}
+        for tournament_id, players in tournaments:
+            self.add(tournament_id, players)
+
+    def add(self, tournament_id, players):
+        """ Indexes the actors of a tournament, replacing its former actors.
+
+        :param tournament_id: the identifier of the tournament.
+        :param players: list of tuples (actor_id, player_id).
+        :return: None
+        """
+        self.remove(tournament_id)
+        self.actors[tournament_id] = [actor_id for actor_id, player_id in players]
+        for actor_id, player_id in players:
+            self.played.setdefault(actor_id, {})[tournament_id] = player_id
+
+    def remove(self, tournament_id):
+        """ Removes a tournament from the index.
+
+        :param tournament_id: the identifier of the tournament.
+        :return: None
+        """
+        for actor_id in self.actors.pop(tournament_id, []):
+            self.played[actor_id].pop(tournament_id, None)
+
+    def tournaments_of(self, actor_id):
+        """ Gives the tournaments played by an actor.
+
+        :param actor_id: the identifier of the actor.
+        :return: list of tuples (tournament_id, player_id), sorted by tournament identifier.
+        """
+        return sorted(self.played.get(actor_id, {}).items())
+
+    def common_tournaments(self, actor_id, other_actor_id):
+        """ Gives the tournaments played by both actors.
+
+        :param actor_id: the identifier of the first actor.
+        :param other_actor_id: the identifier of the second actor.
+        :return: list of tuples (tournament_id, player_id, other_player_id), sorted by tournament identifier.
+        """
+        played = self.played.get(actor_id, {})
+        other_played = self.played.get(other_actor_id, {})
+        if len(other_played) < len(played):
+            common = [identifier for identifier in other_played if identifier in played]
+        else:
+            common = [identifier for identifier in played if identifier in other_played]
+        return [(identifier, played[identifier], other_played[identifier]) for identifier in sorted(common)]
+
+
+def read_player_history(find_tournament, entries):
+    """ Reads the players of an actor in its tournaments.
+
+    :param find_tournament: the function finding a tournament by its identifier.
+    :param entries: list of tuples (tournament_id, player_id) of the actor.
+    :return: list of tuples (tournament, player).
+    """
+    history = []
+    for tournament_id, player_id in entries:
+        tournament = find_tournament(tournament_id)
+        if not tournament:
+            continue
+        for player in tournament.list_of_players:
+            if player.player_id == player_id:
+                history.append((tournament, player))
+    return history
+
+
+def read_head_to_head(find_tournament, entries):
+    """ Reads the matches played between two actors in their common tournaments.
+
+    :param find_tournament: the function finding a tournament by its identifier.
+    :param entries: list of tuples (tournament_id, player_id, other_player_id).
+    :return: list of the matches, in the order of the tournaments and of the rounds.
+    """
+    matches = []
+    for tournament_id, player_id, other_player_id in entries:
+        tournament = find_tournament(tournament_id)
+        if not tournament:
+            continue
+        for r0und in tournament.rounds:
+            for match in r0und.matches.values():
+                if {match.player1.player_id, match.player2.player_id} == {player_id, other_player_id}:
+                    matches.append(match)
+    return matches
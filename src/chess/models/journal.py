@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module journals the tournaments in progress.
+
+Each change of a tournament in progress is appended as a small record to the journal
+of the tournament: round started, match result declared, round finished, rank changed.
+From time to time, the whole tournament is written in a snapshot and the journal is emptied.
+After a crash, the tournament is rebuilt from its snapshot and the replay of its journal.
+
+Each record has a sequence number, and the snapshot stores the number of the last record
+it includes: the records already in the snapshot are skipped by the replay.
+
+The first line of a snapshot holds the summary of the tournament, its name, location and dates,
+and the second line the whole tournament: the paused tournaments are listed from the first
+lines only. A snapshot written before has only the second line.
+
+"""
+
+
+import json
+import os
+
+from chess.settings import JOURNAL_DIR, JOURNAL_SNAPSHOT_EVERY
+
+from chess.models.database import deserialize_tournament, deserialize_tournament_summary
+from chess.models.match import Match
+from chess.models.round import Round
+from chess.models.tournament import TournamentSummary
+from chess.models.storage import atomic_file
+from chess.utils.conversion import str_to_date
+
+
+JOURNAL_SUFFIX = ".journal"
+SNAPSHOT_SUFFIX = ".snapshot.json"
+SUMMARY_ATTRIBUTES = TournamentSummary.header_attributes + ['start_date', 'end_date']
+
+
+class TournamentJournal:
+    """ Journal of a tournament in progress.
+
+    The journals are stored in the class attribute journals by tournament identifier,
+    so that the controllers get the journal of a tournament with TournamentJournal.of.
+
+    """
+    journals = {}
+
+    def __init__(self, tournament, directory=JOURNAL_DIR, seq=0):
+        self.tournament = tournament
+        self.directory = directory
+        self.seq = seq
+        self.records_since_snapshot = 0
+        os.makedirs(directory, exist_ok=True)
+        self.journal_path = os.path.join(directory, tournament.tournament_id + JOURNAL_SUFFIX)
+        self.snapshot_path = os.path.join(directory, tournament.tournament_id + SNAPSHOT_SUFFIX)
+        self.handle = open(self.journal_path, "a", encoding="utf-8")
+        if not os.path.exists(self.snapshot_path):
+            self.snapshot()
+
+    @classmethod
+    def of(cls, tournament, directory=JOURNAL_DIR):
+        """ Gives the journal of a tournament, created at the first call.
+
+        :param tournament: the tournament in progress.
+        :param directory: the directory of the journals.
+        :return: the journal of the tournament.
+        """
+        if tournament.tournament_id not in cls.journals:
+            cls.journals[tournament.tournament_id] = cls(tournament, directory)
+        return cls.journals[tournament.tournament_id]
+
+    def append(self, event, **values):
+        """ Appends a record to the journal and synchronises it on disk.
+
+        Every JOURNAL_SNAPSHOT_EVERY records, a snapshot is written and the journal emptied.
+
+        :param event: the name of the event.
+        :param values: the values of the event.
+        :return: None
+        """
+        self.seq += 1
+        record = {"seq": self.seq, "event": event}
+        record.update(values)
+        self.handle.write(json.dumps(record) + "\n")
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+        self.records_since_snapshot += 1
+        if self.records_since_snapshot >= JOURNAL_SNAPSHOT_EVERY:
+            self.snapshot()
+
+    def snapshot(self, serialized_tournament=None):
+        """ Writes the whole tournament in the snapshot, then empties the journal.
+
+        :param serialized_tournament: the tournament already transformed in a dictionary,
+                                      by default the tournament is transformed here.
+        :return: None
+        """
+        if serialized_tournament is None:
+            serialized_tournament = self.tournament.tournament_to_dict()
+        summary = {attribute: serialized_tournament[attribute] for attribute in SUMMARY_ATTRIBUTES}
+        with atomic_file(self.snapshot_path) as handle:
+            handle.write(json.dumps({"summary": summary}) + "\n")
+            json.dump({"journal_seq": self.seq,
+                       "tournament": serialized_tournament}, handle)
+        self.handle.close()
+        self.handle = open(self.journal_path, "w", encoding="utf-8")
+        self.records_since_snapshot = 0
+
+    def round_started(self, r0und):
+        """ Records the start of a round, its matches and its exempted player.
+
+        :param r0und: the round started.
+        :return: None
+        """
+        pairs = [[r0und.matches[num].player1.player_id, r0und.matches[num].player2.player_id]
+                 for num in sorted(r0und.matches)]
+        bye = None if r0und.bye is None else r0und.bye.player_id
+        self.append("round_started", round_nb=r0und.round_nb, date=str(r0und.start_date), pairs=pairs, bye=bye)
+
+    def result_declared(self, round_nb, match_nb, winner):
+        """ Declares the result of a match in the tournament, then records it.
+
+        The result is declared before the record is appended, so that a snapshot
+        written by this record includes it.
+
+        :param round_nb: the number of the round.
+        :param match_nb: the number of the match in the round.
+        :param winner: 0 for a tie, 1 or 2 for the winner.
+        :return: None
+        """
+        self.tournament.rounds[round_nb].matches[match_nb].declare_result(winner)
+        self.append("result", round_nb=round_nb, match_nb=match_nb, winner=winner)
+
+    def round_finished(self, r0und):
+        """ Records the end of a round, once its points are assigned.
+
+        :param r0und: the round finished.
+        :return: None
+        """
+        self.append("round_finished", round_nb=r0und.round_nb, date=str(r0und.end_date))
+
+    def rank_changed(self, actor):
+        """ Records the new rank of an actor of the tournament.
+
+        :param actor: the actor whose rank changed.
+        :return: None
+        """
+        self.append("rank_changed", actor_id=actor.actor_id, rank=actor.rank)
+
+    def close(self):
+        """ Closes the journal of a finished tournament and removes its files.
+
+        :return: None
+        """
+        self.handle.close()
+        for path in [self.journal_path, self.snapshot_path]:
+            if os.path.exists(path):
+                os.remove(path)
+        TournamentJournal.journals.pop(self.tournament.tournament_id, None)
+
+
+def replay(tournament, record):
+    """ Applies a record of the journal to the tournament.
+
+    :param tournament: the tournament rebuilt.
+    :param record: the record of the journal.
+    :return: None
+    """
+    event = record["event"]
+    if event == "round_started":
+        r0und = Round(record["round_nb"], tournament.tournament_id, tournament.list_of_players)
+        r0und.start_date = str_to_date(record["date"])
+        r0und.rank_players(tournament.get_standings())
+        players = {player.player_id: player for player in tournament.list_of_players}
+        for match_nb, (player1, player2) in enumerate(record["pairs"]):
+            r0und.matches[match_nb] = Match(match_nb, r0und.round_nb, tournament.tournament_id)
+            r0und.matches[match_nb].player1 = players[player1]
+            r0und.matches[match_nb].player2 = players[player2]
+        if record.get("bye") is not None:
+            r0und.bye = players[record["bye"]]
+        tournament.rounds.append(r0und)
+    elif event == "result":
+        tournament.rounds[record["round_nb"]].matches[record["match_nb"]].declare_result(record["winner"])
+    elif event == "round_finished":
+        r0und = tournament.rounds[record["round_nb"]]
+        winners = [r0und.matches[num].winner for num in sorted(r0und.matches)]
+        tournament.register_round_results(record["round_nb"], winners)
+        r0und.end_date = str_to_date(record["date"])
+    elif event == "rank_changed":
+        for player in tournament.list_of_players:
+            if player.actor.actor_id == record["actor_id"]:
+                player.actor.rank = record["rank"]
+
+
+def read_records(journal_path):
+    """ Reads the records of a journal.
+
+    A record is complete with its end of line: a last line cut by a crash is ignored.
+
+    :param journal_path: path of the journal.
+    :return: the list of the records, and the size in bytes of the journal up to the end
+             of the last complete record.
+    """
+    records = []
+    size = 0
+    if not os.path.exists(journal_path):
+        return records, size
+    with open(journal_path, "rb") as handle:
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                break
+            size += len(line)
+    return records, size
+
+
+def truncate_journal(journal_path, size):
+    """ Cuts a journal after its last complete record, so that the next records start on a new line.
+
+    :param journal_path: path of the journal.
+    :param size: the size in bytes of the complete records.
+    :return: None
+    """
+    if os.path.exists(journal_path) and os.path.getsize(journal_path) > size:
+        with open(journal_path, "r+b") as handle:
+            handle.truncate(size)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+def load_tournament(tournament_id, directory=JOURNAL_DIR):
+    """ Rebuilds a tournament in progress from its snapshot and the replay of its journal.
+
+    The journal of the rebuilt tournament is cut after its last complete record,
+    then opened to continue recording.
+
+    :param tournament_id: the identifier of the tournament.
+    :param directory: the directory of the journals.
+    :return: the instance of tournament, None if there is no snapshot.
+    """
+    if tournament_id in TournamentJournal.journals:
+        return TournamentJournal.journals[tournament_id].tournament
+    snapshot_path = os.path.join(directory, tournament_id + SNAPSHOT_SUFFIX)
+    if not os.path.exists(snapshot_path):
+        return None
+    with open(snapshot_path, encoding="utf-8") as handle:
+        snapshot = json.loads(handle.read().splitlines()[-1])
+    tournament = deserialize_tournament(snapshot["tournament"])
+    seq = snapshot["journal_seq"]
+    journal_path = os.path.join(directory, tournament_id + JOURNAL_SUFFIX)
+    records, size = read_records(journal_path)
+    for record in records:
+        if record["seq"] > seq:
+            replay(tournament, record)
+            seq = record["seq"]
+    truncate_journal(journal_path, size)
+    TournamentJournal.journals[tournament_id] = TournamentJournal(tournament, directory, seq)
+    return tournament
+
+
+def journaled_tournaments(directory=JOURNAL_DIR):
+    """ Lists the identifiers of the tournaments in progress which have a journal.
+
+    :param directory: the directory of the journals.
+    :return: the identifiers, from the most recently modified.
+    """
+    if not os.path.isdir(directory):
+        return []
+    snapshots = [name for name in os.listdir(directory) if name.endswith(SNAPSHOT_SUFFIX)]
+    identifiers = [name[:-len(SNAPSHOT_SUFFIX)] for name in snapshots]
+
+    def last_modification(tournament_id):
+        paths = [os.path.join(directory, tournament_id + suffix) for suffix in [JOURNAL_SUFFIX, SNAPSHOT_SUFFIX]]
+        return max(os.path.getmtime(path) for path in paths if os.path.exists(path))
+
+    return sorted(identifiers, key=last_modification, reverse=True)
+
+
+def journaled_summaries(directory=JOURNAL_DIR):
+    """ Lists the summaries of the tournaments in progress which have a journal.
+
+    Only the first line of each snapshot is read and decoded, the tournaments are not rebuilt.
+    A snapshot written before the summary line is decoded whole.
+
+    :param directory: the directory of the journals.
+    :return: the summaries, from the most recently modified.
+    """
+    summaries = []
+    for tournament_id in journaled_tournaments(directory):
+        with open(os.path.join(directory, tournament_id + SNAPSHOT_SUFFIX), encoding="utf-8") as handle:
+            first_line = json.loads(handle.readline())
+        summaries.append(deserialize_tournament_summary(first_line.get("summary") or first_line["tournament"]))
+    return summaries
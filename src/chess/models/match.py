@@ -6,6 +6,9 @@ This module handle the match logic.
 """
 
 
+from chess.models.standings import add_points
+
+
 POINTS = {"victory": 1, "draw": 0.5, "defeat": 0}
 
 
@@ -46,29 +49,32 @@ class Match:
             self.winner = num_player
             self.finished = True
 
-    def assign_points(self):
+    def assign_points(self, standings=None):
         """ Assigns points to the players.
 
         The function test if points are already assign, and then assigns the points
 
+        :param standings: the standings of the tournament, updated with the points, or None.
         :return: None
         """
         if self.winner is None:
             print("Attention, aucun joueur n'a été déclaré vainqueur")
         if self.winner == 0:
-            self.player1.points += POINTS["draw"]
-            self.player2.points += POINTS["draw"]
+            add_points(self.player1, POINTS["draw"], standings)
+            add_points(self.player2, POINTS["draw"], standings)
         elif self.winner == 1:
-            self.player1.points += POINTS["victory"]
-            self.player2.points += POINTS["defeat"]
+            add_points(self.player1, POINTS["victory"], standings)
+            add_points(self.player2, POINTS["defeat"], standings)
         elif self.winner == 2:
-            self.player1.points += POINTS["defeat"]
-            self.player2.points += POINTS["victory"]
+            add_points(self.player1, POINTS["defeat"], standings)
+            add_points(self.player2, POINTS["victory"], standings)
         self.points_assigned = True
 
     def match_to_dict(self):
         """ Converts a match into a dictionary.
 
+        The players are referenced by their player_id.
+
         :return: the dictionary of the match instance.
 
         """
@@ -82,6 +88,6 @@ class Match:
         for attribute in string_attributes:
             serialized_match[attribute] = getattr(self, attribute)
         # no_string_attributes = ['player1', 'player2']
-        serialized_match['player1'] = self.player1.player_to_dict()
-        serialized_match['player2'] = self.player2.player_to_dict()
+        serialized_match['player1'] = self.player1.player_id
+        serialized_match['player2'] = self.player2.player_id
         return serialized_match
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module migrates the serialized tournaments to the normalized schema.
+
+In the former schema, every player embedded its actor, and every round and match
+embedded full copies of its players. In the normalized schema, a tournament stores
+each of its actors once in the list actors, the players reference their actor by
+actor_id, and the rounds and matches reference the players by player_id.
+
+"""
+
+
+import json
+
+from chess.models.storage import atomic_file
+from chess.models.streaming import iter_tables
+
+
+TOURNAMENT_TABLES = ['tournament', 'interrupted_tournament']
+
+
+def is_normalized(serialized_tournament):
+    """ Tells whether a serialized tournament follows the normalized schema.
+
+    :param serialized_tournament: structured dictionary.
+    :return: True if the tournament is normalized.
+    """
+    return 'actors' in serialized_tournament
+
+
+def normalize_tournament(serialized_tournament):
+    """ Converts a serialized tournament of the former schema into the normalized schema.
+
+    The dictionaries are converted without building any instance.
+    A tournament already normalized is returned as it is.
+
+    :param serialized_tournament: structured dictionary.
+    :return: the normalized dictionary.
+    """
+    if is_normalized(serialized_tournament):
+        return serialized_tournament
+    normalized = dict(serialized_tournament)
+    normalized['actors'] = []
+    normalized['list_of_players'] = []
+    for serialized_player in serialized_tournament['list_of_players']:
+        player = dict(serialized_player)
+        actor = player.pop('actor')
+        player['actor_id'] = actor['actor_id']
+        normalized['actors'].append(actor)
+        normalized['list_of_players'].append(player)
+    normalized['rounds'] = []
+    for serialized_round in serialized_tournament['rounds']:
+        r0und = dict(serialized_round)
+        r0und['players'] = [player['player_id'] for player in serialized_round['players']]
+        r0und['matches'] = {}
+        for match_nb, serialized_match in serialized_round['matches'].items():
+            match = dict(serialized_match)
+            match['player1'] = serialized_match['player1']['player_id']
+            match['player2'] = serialized_match['player2']['player_id']
+            r0und['matches'][match_nb] = match
+        normalized['rounds'].append(r0und)
+    return normalized
+
+
+def migrate_database(source, destination=None):
+    """ Migrates the tournaments of a TinyDB file to the normalized schema.
+
+    The source is read and the destination is written document by document:
+    each tournament is decoded, normalized and serialized before the next one,
+    then the file replaces the destination atomically.
+
+    :param source: path of the database to migrate.
+    :param destination: path of the migrated database, the source itself by default.
+    :return: the number of tournaments normalized.
+    """
+    if destination is None:
+        destination = source
+    migrated = 0
+    with atomic_file(destination) as output:
+        output.write("{")
+        table_separator = ""
+        for table_name, documents in iter_tables(source):
+            output.write(table_separator + json.dumps(table_name) + ": {")
+            table_separator = ", "
+            document_separator = ""
+            for doc_id, document in documents:
+                if table_name in TOURNAMENT_TABLES and not is_normalized(document):
+                    document = normalize_tournament(document)
+                    migrated += 1
+                output.write(document_separator + json.dumps(doc_id) + ": " + json.dumps(document))
+                document_separator = ", "
+            output.write("}")
+        output.write("}")
+    return migrated
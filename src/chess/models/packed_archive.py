@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module exports the finished tournaments in a read-only packed archive, read through mmap.
+
+The packed archive is a single binary file:
+- the magic bytes, then the serialized actors and tournaments, each of them
+  as a length-prefixed JSON record;
+- the index, a JSON record mapping each tournament identifier to the offset
+  and the length of its record, with the summary fields and the players of the tournament,
+  and each actor identifier to the offset and the length of the actor in the list of the actors;
+- a footer giving the offset and the length of the index, then the magic bytes again.
+
+Opening the archive only decodes the index, whose summary fields are indexed
+for the queries. A tournament or an actor is decoded from its own bytes,
+and the pages of the file are shared by all the processes reading it through
+the page cache of the system.
+
+"""
+
+
+import json
+import mmap
+import os
+import struct
+
+from chess.settings import PACKED_PATH
+
+from chess.models.database import deserialize_actor, deserialize_tournament, \
+    deserialize_tournament_summary, ID_WIDTH
+from chess.models.query import TournamentQueryIndex
+from chess.models.cache import TournamentCache
+from chess.models.history import ActorHistoryIndex, tournament_players, read_player_history, read_head_to_head
+from chess.models.storage import atomic_file
+from chess.models.tournament import TournamentSummary
+
+from chess.utils.utils import get_last_id
+
+
+MAGIC = b"CHESSPK1"
+LENGTH = struct.Struct("<I")
+FOOTER = struct.Struct("<QQ")
+READ_ONLY = "The packed archive is read-only, export it again with manage.py pack"
+
+
+class ReadOnlyArchiveError(PermissionError):
+    """ Raised by the handler of the packed archive on any write. """
+
+
+def write_record(output, data):
+    """ Writes a length-prefixed JSON record.
+
+    :param output: the binary handle of the archive.
+    :param data: the data of the record.
+    :return: the offset and the length of the JSON of the record.
+    """
+    encoded = json.dumps(data).encode("utf-8")
+    output.write(LENGTH.pack(len(encoded)))
+    offset = output.tell()
+    output.write(encoded)
+    return offset, len(encoded)
+
+
+def write_actors_record(output, actors):
+    """ Writes the record of the list of the actors, noting where each actor lies in it.
+
+    :param output: the binary handle of the archive.
+    :param actors: the actors instances.
+    :return: the offset and the length of the JSON of the record,
+     and dictionary actor_id -> offset and length of the JSON of the actor.
+    """
+    encoded = [(actor.actor_id, json.dumps(actor.actor_to_dict()).encode("utf-8")) for actor in actors]
+    length = 2 + sum(len(data) for _, data in encoded) + max(len(encoded) - 1, 0)
+    output.write(LENGTH.pack(length))
+    offset = output.tell()
+    output.write(b"[")
+    positions = {}
+    for num, (actor_id, data) in enumerate(encoded):
+        if num:
+            output.write(b",")
+        positions[actor_id] = (output.tell(), len(data))
+        output.write(data)
+    output.write(b"]")
+    return (offset, length), positions
+
+
+def write_packed_archive(handler, path=PACKED_PATH):
+    """ Exports the actors and the finished tournaments of a handler in a packed archive.
+
+    The tournaments are serialized one at a time, then the archive replaces path atomically.
+
+    :param handler: the handler of the database to export, whatever its backend.
+    :param path: path of the packed archive.
+    :return: the number of tournaments exported.
+    """
+    index = {'tournaments': {}}
+    with atomic_file(path, binary=True) as output:
+        output.write(MAGIC)
+        index['actors'], index['actor_positions'] = write_actors_record(output, handler.iter_actors())
+        for tournament in handler.iter_tournaments():
+            serialized_tournament = tournament.tournament_to_dict()
+            entry = {attribute: serialized_tournament[attribute]
+                     for attribute in TournamentSummary.header_attributes}
+            entry['start_date'] = serialized_tournament['start_date']
+            entry['end_date'] = serialized_tournament['end_date']
+            entry['players'] = tournament_players(serialized_tournament)
+            entry['offset'], entry['length'] = write_record(output, serialized_tournament)
+            index['tournaments'][tournament.tournament_id] = entry
+        index_offset, index_length = write_record(output, index)
+        output.write(FOOTER.pack(index_offset, index_length) + MAGIC)
+    return len(index['tournaments'])
+
+
+class PackedDataBaseHandler:
+    """ Handles the reports on a packed archive, read-only.
+
+    The file is mapped in memory once, only its index is decoded when it is opened.
+    The archive is opened again when the file is replaced by a new export.
+    The last tournaments found by their identifier are kept deserialized in an LRU cache,
+    cleared when the archive is opened again.
+
+    """
+    def __init__(self, path=PACKED_PATH):
+        self.path = path
+        self.handle = None
+        self.map = None
+        self.signature = None
+        self.index = {}
+        self.query_index = TournamentQueryIndex()
+        self.history_index = ActorHistoryIndex()
+        self.cache = TournamentCache()
+        self._open()
+
+    def _open(self):
+        """ Maps the file in memory and decodes its index.
+
+        :return: None
+        """
+        self.close()
+        stat = os.stat(self.path)
+        self.signature = stat.st_mtime_ns, stat.st_size
+        self.handle = open(self.path, "rb")
+        self.map = mmap.mmap(self.handle.fileno(), 0, access=mmap.ACCESS_READ)
+        footer_offset = len(self.map) - FOOTER.size - len(MAGIC)
+        if self.map[:len(MAGIC)] != MAGIC or self.map[footer_offset + FOOTER.size:] != MAGIC:
+            raise ValueError(f"{self.path} is not a packed archive")
+        index_offset, index_length = FOOTER.unpack_from(self.map, footer_offset)
+        self.index = self._read_record(index_offset, index_length)
+        self.query_index = TournamentQueryIndex(self.index['tournaments'].values())
+        self.history_index = ActorHistoryIndex(self._tournament_players())
+        self.cache.clear()
+
+    def _tournament_players(self):
+        """ Gives the players of each tournament of the index.
+
+        The record of a tournament is read only if the index of a former archive has no players.
+
+        :return: generator of tuples (tournament_id, list of tuples (actor_id, player_id)).
+        """
+        for identifier, entry in self.index['tournaments'].items():
+            if 'players' in entry:
+                yield identifier, entry['players']
+            else:
+                yield identifier, tournament_players(self._read_record(entry['offset'], entry['length']))
+
+    def _read_record(self, offset, length):
+        """ Decodes a record, reading only its bytes.
+
+        :param offset: the offset of the JSON of the record.
+        :param length: the length of the JSON of the record.
+        :return: the data of the record.
+        """
+        return json.loads(self.map[offset:offset + length])
+
+    def refresh(self):
+        """ Opens the archive again if the file has been replaced.
+
+        :return: None
+        """
+        stat = os.stat(self.path)
+        if (stat.st_mtime_ns, stat.st_size) != self.signature:
+            self._open()
+
+    def flush(self):
+        """ Nothing to flush, the archive is read-only. """
+
+    def close(self):
+        """ Unmaps and closes the file.
+
+        :return: None
+        """
+        if self.map is not None:
+            self.map.close()
+            self.handle.close()
+            self.map = None
+            self.handle = None
+
+    def import_actor(self, identifier):
+        """ Finds an actor of the archive by its identifier, reading only its bytes.
+
+        An archive packed by a former version has no positions of the actors: its actors are scanned.
+
+        :param identifier: the identifier of the searched actor.
+        :return: instance of the searched actor, {} if there is none.
+        """
+        if 'actor_positions' not in self.index:
+            for actor in self.iter_actors():
+                if actor.actor_id == identifier:
+                    return actor
+            return {}
+        if identifier not in self.index['actor_positions']:
+            return {}
+        return deserialize_actor(self._read_record(*self.index['actor_positions'][identifier]))
+
+    def import_actors(self):
+        """ Imports the actors of the archive.
+
+        :return: the number of actors imported and the list of actors instances.
+        """
+        actors = list(self.iter_actors())
+        return len(actors), actors
+
+    def iter_actors(self):
+        """ Gives the actors instances of the archive one at a time.
+
+        :return: generator of actors instances.
+        """
+        for serialized_actor in self._read_record(*self.index['actors']):
+            yield deserialize_actor(serialized_actor)
+
+    def import_interrupted_tournament(self, identifier):
+        """ There is no interrupted tournament in the archive.
+
+        :param identifier: the identifier of the interrupted tournament.
+        :return: []
+        """
+        return []
+
+    def list_interrupted_tournaments(self):
+        """ There is no interrupted tournament in the archive.
+
+        :return: []
+        """
+        return []
+
+    def _read_tournament(self, identifier):
+        """ Decodes a tournament from the bytes of its record.
+
+        :param identifier: the identifier of the tournament, in the index.
+        :return: instance of the tournament.
+        """
+        entry = self.index['tournaments'][identifier]
+        return deserialize_tournament(self._read_record(entry['offset'], entry['length']))
+
+    def find_tournament_by_id(self, identifier):
+        """ Finds a tournament, reading only the bytes of its record if it is not in the cache.
+
+        :param identifier: the identifier of the searched tournament.
+        :return: instance of the searched tournament, {} if there is none.
+        """
+        if identifier not in self.index['tournaments']:
+            return {}
+        tournament = self.cache.get(identifier)
+        if tournament is None:
+            tournament = self._read_tournament(identifier)
+            self.cache.put(identifier, tournament)
+        return tournament
+
+    def import_last_tournament_id(self):
+        """ Gives the greatest tournament identifier of the archive.
+
+        :return: the last tournament identifier
+        """
+        return get_last_id(list(self.index['tournaments']), ID_WIDTH)
+
+    def import_tournaments(self):
+        """ Imports the tournaments of the archive.
+
+        :return: list of tournaments instances.
+        """
+        return list(self.iter_tournaments())
+
+    def iter_tournaments(self):
+        """ Gives the tournaments of the archive one at a time.
+
+        :return: generator of tournaments instances.
+        """
+        for identifier in self.index['tournaments']:
+            yield self._read_tournament(identifier)
+
+    def list_tournament_summaries(self):
+        """ Lists the summaries of the tournaments, reading only the index.
+
+        :return: list of tournament summaries.
+        """
+        return [deserialize_tournament_summary(entry) for entry in self.index['tournaments'].values()]
+
+    def query_tournaments(self, **criteria):
+        """ Lists the summaries of the tournaments matching the criteria, reading only the index.
+
+        :param criteria: start_after, start_before, end_after, end_before, location, timer_type, name_prefix.
+        :return: list of tournament summaries, sorted by identifier.
+        """
+        return [deserialize_tournament_summary(self.index['tournaments'][identifier])
+                for identifier in self.query_index.query(**criteria)]
+
+    def player_history(self, actor_id):
+        """ Lists the players of an actor in the tournaments, reading only the records of its tournaments.
+
+        :param actor_id: the identifier of the actor.
+        :return: list of tuples (tournament, player), sorted by tournament identifier.
+        """
+        return read_player_history(self.find_tournament_by_id, self.history_index.tournaments_of(actor_id))
+
+    def head_to_head(self, actor_id, other_actor_id):
+        """ Lists the matches played between two actors, reading only the records of their common tournaments.
+
+        :param actor_id: the identifier of the first actor.
+        :param other_actor_id: the identifier of the second actor.
+        :return: list of matches, sorted by tournament identifier then by round.
+        """
+        return read_head_to_head(self.find_tournament_by_id,
+                                 self.history_index.common_tournaments(actor_id, other_actor_id))
+
+    def reserve_ids(self, sequence, count=1):
+        """ The archive is read-only. """
+        raise ReadOnlyArchiveError(READ_ONLY)
+
+    def new_id(self, sequence):
+        """ The archive is read-only. """
+        raise ReadOnlyArchiveError(READ_ONLY)
+
+    def export_actor(self, actor):
+        """ The archive is read-only. """
+        raise ReadOnlyArchiveError(READ_ONLY)
+
+    def export_actors(self, actors):
+        """ The archive is read-only. """
+        raise ReadOnlyArchiveError(READ_ONLY)
+
+    def truncate_actors(self):
+        """ The archive is read-only. """
+        raise ReadOnlyArchiveError(READ_ONLY)
+
+    def export_interrupted_tournament(self, tournament):
+        """ The archive is read-only. """
+        raise ReadOnlyArchiveError(READ_ONLY)
+
+    def export_serialized_interrupted_tournament(self, serialized_tournament):
+        """ The archive is read-only. """
+        raise ReadOnlyArchiveError(READ_ONLY)
+
+    def export_tournament(self, tournament):
+        """ The archive is read-only. """
+        raise ReadOnlyArchiveError(READ_ONLY)
+
+    def export_finished_tournament(self, tournament):
+        """ The archive is read-only. """
+        raise ReadOnlyArchiveError(READ_ONLY)
+
+    def export_serialized_finished_tournament(self, serialized_tournament, serialized_actors):
+        """ The archive is read-only. """
+        raise ReadOnlyArchiveError(READ_ONLY)
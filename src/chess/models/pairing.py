@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module pairs the players of a round with the Swiss system, for any number of players.
+
+With an odd number of players, the lowest placed player who has not had a bye yet is exempted.
+In the first round, the top half of the standings plays the bottom half: the first against
+the first of the bottom half, and so on. In the other rounds, the players are paired
+in score groups, from the highest score to the lowest: in each group, the top half plays
+the bottom half, and the players who cannot be paired in their group float down to the next one.
+
+The pairing of a score group is a min-cost assignment between its top half and its bottom half,
+solved by the Hungarian algorithm: the cost of a pair is its distance to the ideal pairing,
+and a rematch is not a candidate. When the players left at the bottom cannot be paired,
+the lowest score groups are paired again with Edmonds' blossom algorithm, without rematch,
+widening the groups upwards until everybody is paired.
+
+"""
+
+
+import heapq
+from collections import deque
+from operator import attrgetter
+
+
+WINDOW = 8
+
+
+def pair_players(players, round_nb, byes=()):
+    """ Pairs the players of a round.
+
+    :param players: the players of the tournament, with their place in the standings.
+    :param round_nb: the number of the round, 0 for the first one.
+    :param byes: the player_id of the players who already had a bye.
+    :return: the list of the pairs (player1, player2) in the order of the boards, and the exempted player or None.
+    """
+    standings = sorted(players, key=attrgetter("place"))
+    bye = None
+    if len(standings) % 2:
+        bye = choose_bye(standings, byes)
+        standings.remove(bye)
+    if round_nb == 0:
+        half = len(standings) // 2
+        pairs = list(zip(standings[:half], standings[half:]))
+    else:
+        pairs = pair_score_groups(standings)
+    pairs = [(player1, player2) if player1.place < player2.place else (player2, player1)
+             for player1, player2 in pairs]
+    pairs.sort(key=lambda pair: pair[0].place)
+    return pairs, bye
+
+
+def choose_bye(standings, byes):
+    """ Chooses the exempted player: the lowest placed one who has not had a bye yet.
+
+    :param standings: the players, sorted by place.
+    :param byes: the player_id of the players who already had a bye.
+    :return: the exempted player.
+    """
+    byes = set(byes)
+    for player in reversed(standings):
+        if player.player_id not in byes:
+            return player
+    return standings[-1]
+
+
+def score_groups(standings):
+    """ Splits the standings in groups of players with the same number of points.
+
+    :param standings: the players, sorted by place.
+    :return: the list of the groups, from the highest score to the lowest.
+    """
+    groups = []
+    for player in standings:
+        if groups and groups[-1][-1].points == player.points:
+            groups[-1].append(player)
+        else:
+            groups.append([player])
+    return groups
+
+
+def pair_score_groups(standings):
+    """ Pairs the players score group by score group, without rematch.
+
+    :param standings: the players, sorted by place, in an even number.
+    :return: the list of the pairs.
+    """
+    pairs = []
+    floaters = []
+    for group in score_groups(standings):
+        group_pairs, floaters = pair_bracket(floaters + group)
+        pairs += group_pairs
+    if floaters:
+        pairs = repair(standings, pairs)
+    return pairs
+
+
+def pair_bracket(bracket):
+    """ Pairs the top half of a bracket with its bottom half, as close to the ideal pairing as possible.
+
+    Each player of the top half is only offered the players of the bottom half around its ideal opponent:
+    WINDOW players on each side, widened by the number of its previous opponents.
+
+    :param bracket: the players of the bracket, the floaters first, then sorted by place.
+    :return: the list of the pairs, and the list of the players left unpaired.
+    """
+    half = len(bracket) // 2
+    top, bottom = bracket[:half], bracket[half:]
+    candidates = []
+    for row, player in enumerate(top):
+        width = WINDOW + len(player.opponents)
+        candidates.append([(column, abs(row - column))
+                           for column in range(max(0, row - width), min(len(bottom), row + width + 1))
+                           if not player.has_played(bottom[column])])
+    assignment = min_cost_assignment(len(bottom), candidates)
+    pairs = []
+    paired = set()
+    for row, column in enumerate(assignment):
+        if column is not None:
+            pairs.append((top[row], bottom[column]))
+            paired.update([top[row].player_id, bottom[column].player_id])
+    unpaired = [player for player in bracket if player.player_id not in paired]
+    return pairs, unpaired
+
+
+def min_cost_assignment(nb_columns, candidates):
+    """ Solves the assignment problem with the Hungarian algorithm, with potentials.
+
+    Each row is assigned to a distinct column among its candidates, minimizing the total cost.
+    The rows are added one by one, each by a shortest augmenting path found with Dijkstra's
+    algorithm on the reduced costs; between columns at the same distance, a free column is
+    preferred, which ends the path. A row without augmenting path is left unassigned.
+
+    :param nb_columns: the number of columns.
+    :param candidates: for each row, the list of the pairs (column, cost) it may be assigned to.
+    :return: the list of the column assigned to each row, None for the rows left unassigned.
+    """
+    row_potential = [0] * len(candidates)
+    column_potential = [0] * nb_columns
+    row_of = [None] * nb_columns
+    column_of = [None] * len(candidates)
+    for root in range(len(candidates)):
+        distance = {}
+        previous_row = {}
+        reached = []
+        heap = []
+
+        def relax(row, start):
+            for column, cost in candidates[row]:
+                reduced = start + cost - row_potential[row] - column_potential[column]
+                if reduced < distance.get(column, reduced + 1):
+                    distance[column] = reduced
+                    previous_row[column] = row
+                    heapq.heappush(heap, (reduced, row_of[column] is not None, column))
+
+        relax(root, 0)
+        end = None
+        done = set()
+        while heap:
+            length, _, column = heapq.heappop(heap)
+            if column in done or length > distance[column]:
+                continue
+            done.add(column)
+            if row_of[column] is None:
+                end = column
+                break
+            reached.append(column)
+            relax(row_of[column], length)
+        if end is None:
+            continue
+        length = distance[end]
+        row_potential[root] += length
+        for column in reached:
+            row_potential[row_of[column]] += length - distance[column]
+            column_potential[column] -= length - distance[column]
+        column = end
+        while True:
+            row = previous_row[column]
+            following = column_of[row]
+            row_of[column] = row
+            column_of[row] = column
+            if row == root:
+                break
+            column = following
+    return column_of
+
+
+def repair(standings, pairs):
+    """ Pairs again the lowest players of the standings when some of them are left unpaired.
+
+    The lowest part of the standings starts at a score group boundary, above the highest
+    unpaired player. Its pairs are given to the blossom algorithm, which augments them
+    to a perfect matching without rematch. The part is widened upwards until such a matching
+    exists. Without any, the players left are paired in the order of the standings, rematches included.
+
+    :param standings: the players, sorted by place.
+    :param pairs: the pairs of the score groups.
+    :return: the list of the pairs.
+    """
+    partner = {}
+    for player1, player2 in pairs:
+        partner[player1.player_id] = player2
+        partner[player2.player_id] = player1
+    first_unpaired = min(num for num, player in enumerate(standings) if player.player_id not in partner)
+    cuts = [num for num in range(first_unpaired + 1)
+            if num == 0 or standings[num].points != standings[num - 1].points]
+    for cut in reversed(cuts):
+        lower_ids = {player.player_id for player in standings[cut:]}
+        fixed = [pair for pair in pairs
+                 if pair[0].player_id not in lower_ids or pair[1].player_id not in lower_ids]
+        fixed_ids = {player.player_id for pair in fixed for player in pair}
+        lower = [player for player in standings[cut:] if player.player_id not in fixed_ids]
+        position = {player.player_id: num for num, player in enumerate(lower)}
+        neighbours = [[other for other in range(len(lower))
+                       if other != num and not player.has_played(lower[other])]
+                      for num, player in enumerate(lower)]
+        match = [position.get(partner[player.player_id].player_id, -1) if player.player_id in partner else -1
+                 for player in lower]
+        maximum_matching(neighbours, match)
+        if -1 not in match or cut == 0:
+            break
+    pairs = fixed + [(lower[num], lower[other]) for num, other in enumerate(match) if other > num]
+    unpaired = [player for num, player in enumerate(lower) if match[num] == -1]
+    pairs += list(zip(unpaired[::2], unpaired[1::2]))
+    return pairs
+
+
+def maximum_matching(neighbours, match):
+    """ Augments a matching to a maximum matching with Edmonds' blossom algorithm.
+
+    :param neighbours: the list of the neighbours of each vertex.
+    :param match: the vertex matched with each vertex, -1 if it is not matched; modified in place.
+    :return: None
+    """
+    nb_vertices = len(neighbours)
+    for root in range(nb_vertices):
+        if match[root] != -1:
+            continue
+        parent = [-1] * nb_vertices
+        base = list(range(nb_vertices))
+        used = [False] * nb_vertices
+        used[root] = True
+        queue = deque([root])
+
+        def lowest_common_ancestor(first, second):
+            visited = [False] * nb_vertices
+            while True:
+                first = base[first]
+                visited[first] = True
+                if match[first] == -1:
+                    break
+                first = parent[match[first]]
+            while True:
+                second = base[second]
+                if visited[second]:
+                    return second
+                second = parent[match[second]]
+
+        def mark_path(vertex, blossom_base, child, blossom):
+            while base[vertex] != blossom_base:
+                blossom[base[vertex]] = blossom[base[match[vertex]]] = True
+                parent[vertex] = child
+                child = match[vertex]
+                vertex = parent[match[vertex]]
+
+        end = -1
+        while queue and end == -1:
+            vertex = queue.popleft()
+            for neighbour in neighbours[vertex]:
+                if base[vertex] == base[neighbour] or match[vertex] == neighbour:
+                    continue
+                if neighbour == root or (match[neighbour] != -1 and parent[match[neighbour]] != -1):
+                    blossom_base = lowest_common_ancestor(vertex, neighbour)
+                    blossom = [False] * nb_vertices
+                    mark_path(vertex, blossom_base, neighbour, blossom)
+                    mark_path(neighbour, blossom_base, vertex, blossom)
+                    for other in range(nb_vertices):
+                        if blossom[base[other]]:
+                            base[other] = blossom_base
+                            if not used[other]:
+                                used[other] = True
+                                queue.append(other)
+                elif parent[neighbour] == -1:
+                    parent[neighbour] = vertex
+                    if match[neighbour] == -1:
+                        end = neighbour
+                        break
+                    used[match[neighbour]] = True
+                    queue.append(match[neighbour])
+        while end != -1:
+            previous = parent[end]
+            following = match[previous]
+            match[end] = previous
+            match[previous] = end
+            end = following
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module indexes the headers of the tournaments to query them.
+
+The index keeps a hash index of the locations and of the timer types,
+and sorted indexes of the start dates, of the end dates and of the names.
+A query starts from the criterion which selects the fewest tournaments,
+found in O(log n) in the sorted indexes or in O(1) in the hash indexes,
+then checks the other criteria on the headers of these tournaments only.
+
+"""
+
+
+import bisect
+
+
+HEADER_KEYS = ['tournament_id', 'name', 'location', 'timer_type', 'description', 'start_date', 'end_date']
+
+
+class TournamentQueryIndex:
+    """ Secondary indexes of the headers of the tournaments, kept up to date by the handlers.
+
+    The headers are dictionaries with at least the keys of HEADER_KEYS,
+    the dates being stored as "yyyy-mm-dd" or "None".
+
+    """
+    def __init__(self, headers=()):
+        self.headers = {}
+        self.by_location = {}
+        self.by_timer_type = {}
+        self.start_dates = []
+        self.end_dates = []
+        self.names = []
+        for header in headers:
+            self.add(header)
+
+    def add(self, header):
+        """ Indexes the header of a tournament, replacing its former header.
+
+        :param header: the header of the tournament.
+        :return: None
+        """
+        identifier = header['tournament_id']
+        if identifier in self.headers:
+            self.remove(identifier)
+        self.headers[identifier] = {key: header[key] for key in HEADER_KEYS}
+        self.by_location.setdefault(header['location'], set()).add(identifier)
+        self.by_timer_type.setdefault(header['timer_type'], set()).add(identifier)
+        if header['start_date'] != 'None':
+            bisect.insort(self.start_dates, (header['start_date'], identifier))
+        if header['end_date'] != 'None':
+            bisect.insort(self.end_dates, (header['end_date'], identifier))
+        bisect.insort(self.names, (header['name'].casefold(), identifier))
+
+    def remove(self, identifier):
+        """ Removes a tournament from the indexes.
+
+        :param identifier: the identifier of the tournament.
+        :return: None
+        """
+        header = self.headers.pop(identifier, None)
+        if header is None:
+            return
+        self.by_location[header['location']].discard(identifier)
+        self.by_timer_type[header['timer_type']].discard(identifier)
+        for sorted_index, key in [(self.start_dates, header['start_date']),
+                                  (self.end_dates, header['end_date']),
+                                  (self.names, header['name'].casefold())]:
+            position = bisect.bisect_left(sorted_index, (key, identifier))
+            if position < len(sorted_index) and sorted_index[position] == (key, identifier):
+                del sorted_index[position]
+
+    @staticmethod
+    def _range(sorted_index, low, high):
+        """ Gives the bounds of the keys between low and high, included, in a sorted index.
+
+        :param sorted_index: list of tuples (key, identifier), sorted.
+        :param low: the lowest key, None for no bound.
+        :param high: the highest key, None for no bound.
+        :return: the first and the last positions of the range, the last one excluded.
+        """
+        first = 0 if low is None else bisect.bisect_left(sorted_index, (low,))
+        last = len(sorted_index) if high is None else bisect.bisect_right(sorted_index, (high, chr(0x10ffff)))
+        return first, max(first, last)
+
+    def query(self, start_after=None, start_before=None, end_after=None, end_before=None,
+              location=None, timer_type=None, name_prefix=None):
+        """ Finds the tournaments matching all the given criteria.
+
+        :param start_after: the earliest start date, included.
+        :param start_before: the latest start date, included.
+        :param end_after: the earliest end date, included.
+        :param end_before: the latest end date, included.
+        :param location: the location of the tournaments.
+        :param timer_type: the timer type of the tournaments.
+        :param name_prefix: the beginning of the name of the tournaments, whatever the case.
+        :return: the identifiers of the matching tournaments, sorted.
+        """
+        start_after, start_before, end_after, end_before = [
+            None if date is None else str(date) for date in [start_after, start_before, end_after, end_before]]
+        candidates = []
+        if location is not None:
+            identifiers = self.by_location.get(location, set())
+            candidates.append((len(identifiers), identifiers))
+        if timer_type is not None:
+            identifiers = self.by_timer_type.get(timer_type, set())
+            candidates.append((len(identifiers), identifiers))
+        if start_after is not None or start_before is not None:
+            first, last = self._range(self.start_dates, start_after, start_before)
+            candidates.append((last - first, (self.start_dates, first, last)))
+        if end_after is not None or end_before is not None:
+            first, last = self._range(self.end_dates, end_after, end_before)
+            candidates.append((last - first, (self.end_dates, first, last)))
+        if name_prefix:
+            prefix = name_prefix.casefold()
+            first, last = self._range(self.names, prefix, prefix + chr(0x10ffff))
+            candidates.append((last - first, (self.names, first, last)))
+        if not candidates:
+            selected = self.headers.keys()
+        else:
+            size, selected = min(candidates, key=lambda candidate: candidate[0])
+            if isinstance(selected, tuple):
+                sorted_index, first, last = selected
+                selected = [identifier for key, identifier in sorted_index[first:last]]
+
+        def matches(header):
+            return ((location is None or header['location'] == location)
+                    and (timer_type is None or header['timer_type'] == timer_type)
+                    and in_range(header['start_date'], start_after, start_before)
+                    and in_range(header['end_date'], end_after, end_before)
+                    and (not name_prefix or header['name'].casefold().startswith(name_prefix.casefold())))
+
+        return sorted(identifier for identifier in selected if matches(self.headers[identifier]))
+
+
+def in_range(date, low, high):
+    """ Tells whether a date stored as a string is between two bounds.
+
+    :param date: the date, "yyyy-mm-dd" or "None".
+    :param low: the lowest date, None for no bound.
+    :param high: the highest date, None for no bound.
+    :return: True if the date is in the range, or if there is no bound.
+    """
+    if low is None and high is None:
+        return True
+    if date == 'None':
+        return False
+    return (low is None or date >= low) and (high is None or date <= high)
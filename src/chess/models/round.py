@@ -6,14 +6,9 @@ This module handle the round logic.
 """
 
 
-from operator import attrgetter
-from chess.models.match import Match
-
-
-NB_PLAYERS = 8
-NB_MATCH = 4
-MATCH_1ST_ROUND = [[1, 5], [2, 6], [3, 7], [4, 8]]
-MATCH_OTHER_ROUND = [[1, 2], [3, 4], [5, 6], [7, 8]]
+from chess.models.match import Match, POINTS
+from chess.models.pairing import pair_players
+from chess.models.standings import Standings, add_points
 
 
 class Round:
@@ -27,6 +22,7 @@ class Round:
         self.end_date = None
         self.players_ranked = False
         self.matches = {}
+        self.bye = None
         self.finished = False
         self.players_sorted = False
 
@@ -37,7 +33,7 @@ class Round:
                 message += "Les matchs ont vu s'affronter : \n"
             else:
                 message += "Les matchs verront s'affronter : \n"
-            for num_match in range(NB_MATCH):
+            for num_match in range(len(self.matches)):
                 message += f"{num_match+1}. " \
                            f"{self.matches[num_match].player1.name}" \
                            f" et {self.matches[num_match].player2.name} \n"
@@ -48,11 +44,15 @@ class Round:
                         message += f"Victoire de {self.matches[num_match].player1.name}. \n"
                     if self.matches[num_match].winner == 2:
                         message += f"Victoire de {self.matches[num_match].player2.name}. \n"
+            if self.bye is not None:
+                message += f"{self.bye.name} est exempté de ce tour. \n"
         return message
 
     def round_to_dict(self):
         """ Converts a round into a dictionary
 
+        The players and the exempted player are referenced by their player_id.
+
         :return: the round instance converted in a dictionary.
 
         """
@@ -67,92 +67,89 @@ class Round:
             serialized_round[attribute] = getattr(self, attribute)
         serialized_round['players'] = []
         for player in self.players:
-            serialized_round['players'].append(player.player_to_dict())
+            serialized_round['players'].append(player.player_id)
         serialized_round['matches'] = {}
         for key, value in self.matches.items():
             serialized_round['matches'][key] = value.match_to_dict()
+        serialized_round['bye'] = None if self.bye is None else self.bye.player_id
         serialized_round['start_date'] = str(self.start_date)
         serialized_round['end_date'] = str(self.end_date)
         return serialized_round
 
-    def rank_players(self):
+    def rank_players(self, standings=None):
         """ Ranks players by points in the tournament (decreasingly) and then by rank.
 
         The method checks if the players have been ranked before.
+        Without the standings of the tournament, the players are sorted again.
 
+        :param standings: the standings of the tournament, or None.
         :return: None
 
         """
         if not self.players_ranked:
-            sorted_players = sorted(self.players, key=attrgetter("rank"))
-            sorted_players = sorted(sorted_players, key=attrgetter("points"), reverse=True)
-            for rank in range(NB_PLAYERS):
-                sorted_players[rank].place = rank + 1
+            if standings is None:
+                standings = Standings(self.players)
+            standings.assign_places()
             self.players_ranked = True
 
-    def define_matches(self):
+    def define_matches(self, byes=()):
         """ Defines the matches of a round according to the rules of Swiss tournament
+
+        The pairing engine works for any number of players: with an odd number,
+        the lowest placed player who has not had a bye yet is exempted.
+
+        :param byes: the player_id of the players who already had a bye in the tournament.
         :return: None
         """
-        if self.round_nb == 0:
-            for match in range(NB_MATCH):
-                self.matches[match] = Match(match, self.round_nb, self.tournament_ID)
-                for player in range(NB_PLAYERS):
-                    if self.players[player].place == MATCH_1ST_ROUND[match][0]:
-                        self.matches[match].player1 = self.players[player]
-                    if self.players[player].place == MATCH_1ST_ROUND[match][1]:
-                        self.matches[match].player2 = self.players[player]
-        else:
-            first_non_assigned = 0
-            sorted_players = sorted(self.players, key=attrgetter("place"))
-            player_assigned = []
-            for match in range(NB_MATCH):
-                while sorted_players[first_non_assigned] in player_assigned:
-                    first_non_assigned += 1
-                self.matches[match] = Match(match, self.round_nb, self.tournament_ID)
-                self.matches[match].player1 = sorted_players[first_non_assigned]
-                player_assigned.append(sorted_players[first_non_assigned])
-                first_non_assigned += 1
-                id_player = min(first_non_assigned, len(sorted_players)-1)
-                while sorted_players[id_player].player_id\
-                        in self.matches[match].player1.opponents\
-                        or sorted_players[id_player]\
-                        in player_assigned:
-                    id_player += 1
-                    if id_player >= len(sorted_players):
-                        break
-                id_player = min(id_player, len(sorted_players)-1)
-                self.matches[match].player2 = sorted_players[id_player]
-                player_assigned.append(sorted_players[id_player])
-                if id_player == first_non_assigned:
-                    first_non_assigned += 1
+        self.set_matches(*pair_players(self.players, self.round_nb, byes))
+
+    def set_matches(self, pairs, bye):
+        """ Creates the matches of the round from the pairs of players.
+
+        :param pairs: the list of the pairs (player1, player2) in the order of the boards.
+        :param bye: the exempted player or None.
+        :return: None
+        """
+        self.bye = bye
+        self.matches = {}
+        for match, (player1, player2) in enumerate(pairs):
+            self.matches[match] = Match(match, self.round_nb, self.tournament_ID)
+            self.matches[match].player1 = player1
+            self.matches[match].player2 = player2
 
     def register_results(self, winners):
         """ Registers the results of a round.
 
+        The matches whose result is already declared keep it.
+
         :param winners: 0 for a tie, 1 when the first player quoted wins and 2 when it's the second quoted.
         :return: None
 
         """
-        for num_match in range(NB_MATCH):
-            self.matches[num_match].declare_result(winners[num_match])
+        for num_match in range(len(self.matches)):
+            if not self.matches[num_match].finished:
+                self.matches[num_match].declare_result(winners[num_match])
         self.finished = True
 
-    def assign_points(self):
+    def assign_points(self, standings=None):
         """ Assigns the points this round, for each matches
 
+        The exempted player gets the points of a victory.
         Players_ranked is switched to False
+        :param standings: the standings of the tournament, updated with the points, or None.
         :return: None
 
         """
-        for num_match in range(NB_MATCH):
-            self.matches[num_match].assign_points()
+        for num_match in range(len(self.matches)):
+            self.matches[num_match].assign_points(standings)
+        if self.bye is not None:
+            add_points(self.bye, POINTS["victory"], standings)
         self.players_ranked = False
 
     def memorize_opponents(self):
-        """ For each player, appends the current opponent in the list of previous opponents.
+        """ For each player, adds the current opponent to the set of previous opponents.
         :return: None
         """
-        for match in range(NB_MATCH):
-            self.matches[match].player1.opponents.append(self.matches[match].player2.player_id)
-            self.matches[match].player2.opponents.append(self.matches[match].player1.player_id)
+        for match in range(len(self.matches)):
+            self.matches[match].player1.opponents.add(self.matches[match].player2.player_id)
+            self.matches[match].player2.opponents.add(self.matches[match].player1.player_id)
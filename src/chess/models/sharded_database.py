@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module stores each finished tournament in its own file.
+
+The actors, the sequences and the interrupted tournaments stay in the TinyDB file.
+Each finished tournament is written in a shard of the shards directory, named by its identifier,
+and a small catalog maps each tournament identifier to its shard, its summary and its players.
+Opening one tournament reads only its shard, and the list of the tournaments reads only the catalog.
+
+The old finished tournaments can be archived: their shards are compressed by lzma, gzip or zlib
+and they are decompressed on the fly when they are read.
+
+"""
+
+
+import datetime
+import os
+
+from chess.settings import DB_PATH, SHARDS_DIR, WRITE_BEHIND, ARCHIVE_AFTER_DAYS, ARCHIVE_COMPRESSION
+
+from chess.models.database import DataBaseHandler, deserialize_tournament, \
+    deserialize_tournament_summary, ID_WIDTH, TOURNAMENT_SEQUENCE
+from chess.models.migration import normalize_tournament
+from chess.models.query import TournamentQueryIndex
+from chess.models.history import ActorHistoryIndex, tournament_players
+from chess.models.storage import AtomicJSONStorage, COMPRESSIONS, json_storage
+from chess.models.tournament import TournamentSummary
+
+from chess.utils.conversion import str_to_date
+from chess.utils.utils import get_last_id
+
+
+CATALOG_NAME = "catalog.json"
+SHARD_SUFFIX = ".json"
+
+
+def catalog_entry(serialized_tournament, shard):
+    """ Builds the entry of the catalog of a tournament.
+
+    :param serialized_tournament: structured dictionary.
+    :param shard: the name of the file of the tournament.
+    :return: dictionary with the summary fields of the tournament, its players and its shard.
+    """
+    entry = {attribute: serialized_tournament[attribute]
+             for attribute in TournamentSummary.header_attributes}
+    entry['start_date'] = serialized_tournament['start_date']
+    entry['end_date'] = serialized_tournament['end_date']
+    entry['players'] = tournament_players(serialized_tournament)
+    entry['shard'] = shard
+    return entry
+
+
+class ShardedDataBaseHandler(DataBaseHandler):
+    """ Handles the database with a shard per finished tournament and a catalog.
+
+    The catalog is kept in memory and read again only when its file is modified by someone else.
+    A shard is always written before the catalog which refers to it,
+    and the catalog before the TinyDB file when a tournament is finished:
+    a crash never leaves an entry of the catalog without its shard.
+
+    """
+    def __init__(self, path=DB_PATH, directory=SHARDS_DIR, write_behind=WRITE_BEHIND):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.catalog_storage = AtomicJSONStorage(os.path.join(directory, CATALOG_NAME))
+        self.catalog = {}
+        self.catalog_signature = None
+        super().__init__(path, write_behind)
+        self._load_catalog()
+
+    def _load_catalog(self):
+        """ Reads the catalog and memorizes the signature of its file.
+
+        :return: None
+        """
+        self.catalog_signature = self.catalog_storage.signature()
+        self.catalog = self.catalog_storage.read() or {}
+        self.cache.clear()
+        self._build_query_index()
+        self._build_history_index()
+
+    def _build_query_index(self):
+        """ Builds the secondary indexes of the headers of the catalog and of the TinyDB file.
+
+        :return: None
+        """
+        headers = list(self.catalog.values())
+        headers += [serialized_tournament for identifier, serialized_tournament in self._tournaments_index.items()
+                    if identifier not in self.catalog]
+        self._query_index = TournamentQueryIndex(headers)
+
+    def _build_history_index(self):
+        """ Builds the index of the tournaments played by each actor, from the catalog and the TinyDB file.
+
+        The shard of a tournament is read only if its entry of a former catalog has no players.
+
+        :return: None
+        """
+        tournaments = []
+        for identifier, entry in self.catalog.items():
+            if 'players' in entry:
+                tournaments.append((identifier, entry['players']))
+            else:
+                tournaments.append((identifier, tournament_players(self._read_tournament(identifier))))
+        tournaments += [(identifier, tournament_players(serialized_tournament))
+                        for identifier, serialized_tournament in self._tournaments_index.items()
+                        if identifier not in self.catalog]
+        self._history_index = ActorHistoryIndex(tournaments)
+
+    def refresh(self):
+        """ Reads again the TinyDB file and the catalog if they have been modified by someone else.
+
+        :return: None
+        """
+        super().refresh()
+        if self.catalog_storage.signature() != self.catalog_signature:
+            self._load_catalog()
+
+    def _shard_storage(self, shard):
+        """ Gives the storage of a shard, compressed or not according to its suffix.
+
+        :param shard: the name of the file of the tournament.
+        :return: the storage of the shard.
+        """
+        return json_storage(os.path.join(self.directory, shard))
+
+    def _write_shard(self, serialized_tournament):
+        """ Writes a tournament in its shard and adds it to the catalog in memory.
+
+        An archived tournament stays in its compressed shard.
+
+        :param serialized_tournament: structured dictionary, normalized or not.
+        :return: None
+        """
+        serialized_tournament = normalize_tournament(serialized_tournament)
+        identifier = serialized_tournament['tournament_id']
+        if identifier in self.catalog:
+            shard = self.catalog[identifier]['shard']
+        else:
+            shard = identifier + SHARD_SUFFIX
+        self._shard_storage(shard).write(serialized_tournament)
+        self.catalog[identifier] = catalog_entry(serialized_tournament, shard)
+        self._query_index.add(self.catalog[identifier])
+        self._history_index.add(identifier, self.catalog[identifier]['players'])
+        self.cache.invalidate(identifier)
+
+    def _write_catalog(self):
+        """ Writes the catalog and memorizes the signature of its file.
+
+        :return: None
+        """
+        self.catalog_storage.write(self.catalog)
+        self.catalog_signature = self.catalog_storage.signature()
+
+    def _sequence_last(self, sequence):
+        """ Gives the last number handed out by a sequence.
+
+        A tournaments sequence which is not stored yet starts after the greatest identifier
+        of the catalog and of the TinyDB file.
+
+        :param sequence: ACTOR_SEQUENCE or TOURNAMENT_SEQUENCE.
+        :return: the last number of the sequence.
+        """
+        if sequence == TOURNAMENT_SEQUENCE and sequence not in self._sequences_index:
+            identifiers = list(self.catalog) + list(self._tournaments_index) + list(self._interrupted_index)
+            return int(get_last_id(identifiers, ID_WIDTH))
+        return super()._sequence_last(sequence)
+
+    def export_tournament(self, tournament):
+        """ Writes a tournament in its shard.
+
+        :param tournament: instance of tournament
+        :return: None
+        """
+        self._write_shard(tournament.tournament_to_dict())
+        self._write_catalog()
+
+    def export_finished_tournament(self, tournament):
+        """ Writes a finished tournament in its shard, then the actors of its players.
+
+        The actors are written in the TinyDB file in a single write,
+        which also removes the tournament from the interrupted tournaments.
+
+        :param tournament: the finished tournament, ready to be exported
+        :return: None
+        """
+        self.export_serialized_finished_tournament(tournament.tournament_to_dict(),
+                                                   [player.actor.actor_to_dict()
+                                                    for player in tournament.list_of_players])
+
+    def export_serialized_finished_tournament(self, serialized_tournament, serialized_actors):
+        """ Writes a finished tournament in its shard, then the actors of its players, already serialized.
+
+        :param serialized_tournament: structured dictionary given by tournament_to_dict.
+        :param serialized_actors: the actors of the players, given by actor_to_dict.
+        :return: None
+        """
+        self._write_shard(serialized_tournament)
+        self._write_catalog()
+        self._upsert_documents([('actors', self._actors_index, 'actor_id', serialized_actors)],
+                               [('interrupted_tournament', self._interrupted_index,
+                                 serialized_tournament['tournament_id'])])
+
+    def _read_tournament(self, identifier):
+        """ Reads the serialized tournament of the catalog or of the TinyDB file.
+
+        :param identifier: the identifier of the tournament.
+        :return: structured dictionary, None if there is none.
+        """
+        if identifier in self.catalog:
+            return self._shard_storage(self.catalog[identifier]['shard']).read()
+        return self._tournaments_index.get(identifier)
+
+    def find_tournament_by_id(self, identifier):
+        """ Finds a tournament by reading only its shard, if it is not in the cache.
+
+        :param identifier: the identifier of the searched tournament.
+        :return: instance of the searched tournament, {} if there is none.
+        """
+        tournament = self.cache.get(identifier)
+        if tournament is not None:
+            return tournament
+        serialized_tournament = self._read_tournament(identifier)
+        if serialized_tournament is None:
+            return {}
+        tournament = deserialize_tournament(serialized_tournament)
+        self.cache.put(identifier, tournament)
+        return tournament
+
+    def iter_tournaments(self):
+        """ Gives the tournaments of the catalog, then those left in the TinyDB file, one at a time.
+
+        Each shard is read when its tournament is reached.
+
+        :return: generator of tournaments instances.
+        """
+        identifiers = list(self.catalog)
+        identifiers += [identifier for identifier in self._tournaments_index if identifier not in self.catalog]
+        for identifier in identifiers:
+            yield deserialize_tournament(self._read_tournament(identifier))
+
+    def list_tournament_summaries(self):
+        """ Lists the summaries of the tournaments, reading only the catalog.
+
+        :return: list of tournament summaries.
+        """
+        summaries = [deserialize_tournament_summary(entry) for entry in self.catalog.values()]
+        for identifier, serialized_tournament in self._tournaments_index.items():
+            if identifier not in self.catalog:
+                summaries.append(deserialize_tournament_summary(serialized_tournament))
+        return summaries
+
+    def _shard_size(self, shard):
+        """ Gives the size of the file of a shard.
+
+        :param shard: the name of the file of the tournament.
+        :return: the size in bytes.
+        """
+        return os.path.getsize(os.path.join(self.directory, shard))
+
+    def _move_shards(self, identifiers, suffix):
+        """ Rewrites shards in files with another suffix, so with another compression.
+
+        The new shards are written, then the catalog once, then the former shards are removed.
+
+        :param identifiers: the identifiers of the tournaments to move.
+        :param suffix: the suffix of the new shards.
+        :return: list of tuples (identifier, former size, new size) of the moved tournaments.
+        """
+        moved = []
+        former_shards = []
+        for identifier in identifiers:
+            entry = self.catalog[identifier]
+            shard = identifier + suffix
+            if entry['shard'] == shard:
+                continue
+            self._shard_storage(shard).write(self._shard_storage(entry['shard']).read())
+            moved.append((identifier, self._shard_size(entry['shard']), self._shard_size(shard)))
+            former_shards.append(entry['shard'])
+            entry['shard'] = shard
+        if moved:
+            self._write_catalog()
+        for shard in former_shards:
+            os.remove(os.path.join(self.directory, shard))
+        return moved
+
+    def archive_tournaments(self, days=ARCHIVE_AFTER_DAYS, compression=ARCHIVE_COMPRESSION):
+        """ Compresses the shards of the tournaments finished for more than some days.
+
+        :param days: the age in days from which a tournament is archived.
+        :param compression: "xz" for lzma, "gz" for gzip or "zz" for zlib.
+        :return: list of tuples (identifier, former size, new size) of the archived tournaments.
+        """
+        if "." + compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        limit = datetime.date.today() - datetime.timedelta(days=days)
+        identifiers = []
+        for identifier, entry in self.catalog.items():
+            end_date = str_to_date(entry['end_date'])
+            if end_date is not None and end_date <= limit:
+                identifiers.append(identifier)
+        return self._move_shards(identifiers, SHARD_SUFFIX + "." + compression)
+
+    def restore_tournaments(self, identifiers=None):
+        """ Decompresses the shards of archived tournaments.
+
+        :param identifiers: the identifiers of the tournaments to restore, all of them if None.
+        :return: list of tuples (identifier, former size, new size) of the restored tournaments.
+        """
+        if identifiers is None:
+            identifiers = list(self.catalog)
+        return self._move_shards([identifier for identifier in identifiers if identifier in self.catalog],
+                                 SHARD_SUFFIX)
+
+    def storage_report(self):
+        """ Gives the number of tournaments and the size of their shards, for each compression.
+
+        The archived shards are decompressed to give the size they would have without compression.
+
+        :return: dictionary suffix of the shards -> [number of tournaments, size in bytes,
+         size in bytes without compression].
+        """
+        report = {}
+        for entry in self.catalog.values():
+            suffix = os.path.splitext(entry['shard'])[1]
+            size = self._shard_size(entry['shard'])
+            storage = self._shard_storage(entry['shard'])
+            if suffix in COMPRESSIONS:
+                json_size = storage.decompressed_size()
+            else:
+                json_size = size
+            report.setdefault(suffix, [0, 0, 0])
+            report[suffix][0] += 1
+            report[suffix][1] += size
+            report[suffix][2] += json_size
+        return report
+
+
+def shard_database(json_path=DB_PATH, directory=SHARDS_DIR):
+    """ Moves the finished tournaments of a TinyDB file into shards.
+
+    Each tournament is written in its shard, then the catalog is written once and
+    the table of the finished tournaments is dropped from the TinyDB file.
+    The actors, the sequences and the interrupted tournaments stay in the TinyDB file.
+
+    :param json_path: path of the TinyDB file.
+    :param directory: the directory of the shards.
+    :return: the number of tournaments moved.
+    """
+    handler = ShardedDataBaseHandler.open(json_path, directory=directory, write_behind=False)
+    serialized_tournaments = list(handler._tournaments_index.values())
+    for serialized_tournament in serialized_tournaments:
+        handler._write_shard(serialized_tournament)
+    handler._write_catalog()
+    handler.database.drop_table('tournament')
+    handler._tournaments_index = {}
+    return len(serialized_tournaments)
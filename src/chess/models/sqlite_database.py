@@ -0,0 +1,610 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module handles the database with SQLite.
+
+SQLiteDataBaseHandler provides the same exports and imports as DataBaseHandler,
+on top of tables for actors, tournaments, players, rounds and matches.
+The tournaments are converted between their normalized dictionary and the rows,
+so that the instances are built by the same functions as with TinyDB.
+
+"""
+
+
+import json
+import sqlite3
+
+from chess.settings import SQLITE_PATH
+
+from chess.models.database import deserialize_actor, deserialize_tournament, \
+    deserialize_tournament_summary, ID_WIDTH, ACTOR_SEQUENCE, TOURNAMENT_SEQUENCE
+
+from chess.utils.utils import format_id
+from chess.models.migration import normalize_tournament, TOURNAMENT_TABLES
+from chess.models.cache import TournamentCache
+from chess.models.history import read_player_history, read_head_to_head
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS actors (
+    actor_id TEXT PRIMARY KEY,
+    last_name TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    birthdate TEXT,
+    gender TEXT,
+    rank INTEGER,
+    tournaments TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS tournaments (
+    id INTEGER PRIMARY KEY,
+    tournament_id TEXT NOT NULL,
+    interrupted INTEGER NOT NULL DEFAULT 0,
+    name TEXT NOT NULL,
+    location TEXT,
+    timer_type TEXT,
+    description TEXT,
+    number_of_rounds INTEGER,
+    players_assigned INTEGER,
+    start_date TEXT,
+    end_date TEXT,
+    UNIQUE (interrupted, tournament_id)
+);
+CREATE TABLE IF NOT EXISTS tournament_actors (
+    tournament INTEGER NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    actor_id TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    birthdate TEXT,
+    gender TEXT,
+    rank INTEGER,
+    tournaments TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (tournament, actor_id)
+);
+CREATE TABLE IF NOT EXISTS players (
+    tournament INTEGER NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    player_id INTEGER NOT NULL,
+    actor_id TEXT NOT NULL,
+    name TEXT,
+    rank INTEGER,
+    ranking INTEGER,
+    points REAL,
+    place INTEGER,
+    opponents TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (tournament, player_id)
+);
+CREATE INDEX IF NOT EXISTS players_actor ON players (actor_id);
+CREATE INDEX IF NOT EXISTS tournaments_location ON tournaments (location, start_date);
+CREATE INDEX IF NOT EXISTS tournaments_timer_type ON tournaments (timer_type, start_date);
+CREATE INDEX IF NOT EXISTS tournaments_start_date ON tournaments (start_date);
+CREATE INDEX IF NOT EXISTS tournaments_end_date ON tournaments (end_date);
+CREATE INDEX IF NOT EXISTS tournaments_name ON tournaments (name);
+CREATE TABLE IF NOT EXISTS rounds (
+    tournament INTEGER NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    round_nb INTEGER NOT NULL,
+    players TEXT NOT NULL,
+    players_ranked INTEGER,
+    finished INTEGER,
+    players_sorted INTEGER,
+    start_date TEXT,
+    end_date TEXT,
+    bye INTEGER,
+    PRIMARY KEY (tournament, round_nb)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    tournament INTEGER NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    round_nb INTEGER NOT NULL,
+    match_nb INTEGER NOT NULL,
+    player1 INTEGER NOT NULL,
+    player2 INTEGER NOT NULL,
+    winner INTEGER,
+    finished INTEGER,
+    points_assigned INTEGER,
+    PRIMARY KEY (tournament, round_nb, match_nb)
+);
+CREATE TABLE IF NOT EXISTS sequences (
+    name TEXT PRIMARY KEY,
+    last INTEGER NOT NULL
+);
+"""
+
+ACTOR_COLUMNS = ['actor_id', 'last_name', 'first_name', 'birthdate', 'gender', 'rank', 'tournaments']
+TOURNAMENT_COLUMNS = ['tournament_id', 'name', 'location', 'timer_type', 'description',
+                      'number_of_rounds', 'players_assigned', 'start_date', 'end_date']
+PLAYER_COLUMNS = ['player_id', 'actor_id', 'name', 'rank', 'ranking', 'points', 'place', 'opponents']
+ROUND_COLUMNS = ['round_nb', 'players', 'players_ranked', 'finished', 'players_sorted',
+                 'start_date', 'end_date', 'bye']
+MATCH_COLUMNS = ['round_nb', 'match_nb', 'player1', 'player2', 'winner', 'finished', 'points_assigned']
+BOOLEAN_COLUMNS = ['players_assigned', 'players_ranked', 'finished', 'players_sorted', 'points_assigned']
+DATE_COLUMNS = ['birthdate', 'start_date', 'end_date']
+
+
+def to_column(column, value):
+    """ Converts a value of a serialized instance into the value of its column.
+
+    The dates 'None' become NULL.
+
+    :param column: the name of the column.
+    :param value: the serialized value.
+    :return: the value stored in the column.
+    """
+    if column in DATE_COLUMNS and value == 'None':
+        return None
+    return value
+
+
+def from_row(row, columns):
+    """ Converts a row into the dictionary of the serialized instance.
+
+    :param row: the sqlite3.Row.
+    :param columns: the columns to convert.
+    :return: structured dictionary.
+    """
+    dictio = {}
+    for column in columns:
+        value = row[column]
+        if column in DATE_COLUMNS and value is None:
+            value = 'None'
+        elif column in BOOLEAN_COLUMNS and value is not None:
+            value = bool(value)
+        dictio[column] = value
+    return dictio
+
+
+def insert_query(table, columns):
+    """ Writes the query inserting or replacing a row.
+
+    :param table: the name of the table.
+    :param columns: the names of the columns.
+    :return: the SQL query.
+    """
+    return f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) " \
+           f"VALUES ({', '.join('?' * len(columns))})"
+
+
+class SQLiteDataBaseHandler:
+    """ Handles the exports and imports between the program and a SQLite database.
+
+    The database is opened in WAL mode: the reports can read while a tournament is saved.
+    Each export is a single transaction.
+
+    The last tournaments found by their identifier are kept deserialized in an LRU cache,
+    invalidated when they are exported and cleared when another connection has committed.
+
+    """
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+        self._upgrade_schema()
+        self.cache = TournamentCache()
+        self.data_version = self._data_version()
+
+    def _upgrade_schema(self):
+        """ Adds to a database created by a former version the columns added since.
+
+        :return: None
+        """
+        columns = [row['name'] for row in self.connection.execute("PRAGMA table_info(rounds)")]
+        if 'bye' not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE rounds ADD COLUMN bye INTEGER")
+
+    def _data_version(self):
+        """ Gives the version of the database, which changes when another connection commits.
+
+        :return: the data version of the database.
+        """
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self):
+        """ Clears the cache if the database has been modified by another connection.
+
+        SQLite always reads the last committed state, only the cached tournaments may be outdated.
+
+        :return: None
+        """
+        data_version = self._data_version()
+        if data_version != self.data_version:
+            self.data_version = data_version
+            self.cache.clear()
+
+    def flush(self):
+        """ Nothing to flush, each export is committed immediately. """
+
+    def close(self):
+        """ Closes the connection to the database.
+
+        :return: None
+        """
+        self.connection.close()
+
+    def _sequence_last(self, sequence):
+        """ Gives the last number handed out by a sequence.
+
+        A sequence which is not stored yet starts after the greatest identifier in the database.
+
+        :param sequence: ACTOR_SEQUENCE or TOURNAMENT_SEQUENCE.
+        :return: the last number of the sequence.
+        """
+        row = self.connection.execute("SELECT last FROM sequences WHERE name = ?", (sequence,)).fetchone()
+        if row is not None:
+            return row['last']
+        if sequence == ACTOR_SEQUENCE:
+            query = "SELECT MAX(actor_id) FROM (SELECT actor_id FROM actors " \
+                    "UNION ALL SELECT actor_id FROM tournament_actors)"
+        else:
+            query = "SELECT MAX(tournament_id) FROM tournaments"
+        return int(self.connection.execute(query).fetchone()[0] or 0)
+
+    def reserve_ids(self, sequence, count=1):
+        """ Reserves a block of identifiers, which will never be handed out again.
+
+        :param sequence: ACTOR_SEQUENCE or TOURNAMENT_SEQUENCE.
+        :param count: the number of identifiers to reserve.
+        :return: the list of the reserved identifiers.
+        """
+        with self.connection:
+            last = self._sequence_last(sequence)
+            self.connection.execute(insert_query('sequences', ['name', 'last']), (sequence, last + count))
+        return [format_id(number, ID_WIDTH) for number in range(last + 1, last + count + 1)]
+
+    def new_id(self, sequence):
+        """ Hands out a new identifier.
+
+        :param sequence: ACTOR_SEQUENCE or TOURNAMENT_SEQUENCE.
+        :return: the new identifier.
+        """
+        return self.reserve_ids(sequence)[0]
+
+    def export_actor(self, actor):
+        """ Transfers an instance of actor in the actors table.
+
+        :param actor: instance of actor
+        :return: None
+        """
+        self.export_actors([actor])
+
+    def export_actors(self, actors):
+        """ Transfers instances of actor in the actors table, in a single transaction.
+
+        :param actors: iterable of actor instances
+        :return: None
+        """
+        with self.connection:
+            self._insert_actors([actor.actor_to_dict() for actor in actors])
+
+    def _insert_actors(self, serialized_actors):
+        """ Inserts or replaces serialized actors in the actors table.
+
+        :param serialized_actors: list of structured dictionaries.
+        :return: None
+        """
+        self.connection.executemany(insert_query('actors', ACTOR_COLUMNS),
+                                    [[to_column(column, actor[column]) for column in ACTOR_COLUMNS]
+                                     for actor in serialized_actors])
+
+    def import_actor(self, identifier):
+        """ Transfers the actor with the given identifier from the database.
+
+        :param identifier: the identifier of the chosen actor.
+        :return: the instance of the corresponding actor, {} if there is none.
+        """
+        row = self.connection.execute("SELECT * FROM actors WHERE actor_id = ?", (identifier,)).fetchone()
+        if row is None:
+            return {}
+        return deserialize_actor(from_row(row, ACTOR_COLUMNS))
+
+    def import_actors(self):
+        """ Imports the list of actors instances.
+
+        :return: the number of actors imported and the list of actors instances.
+        """
+        actors = list(self.iter_actors())
+        return len(actors), actors
+
+    def iter_actors(self):
+        """ Gives the actors instances one at a time, the rows are fetched as they are reached.
+
+        :return: generator of actors instances.
+        """
+        for row in self.connection.execute("SELECT * FROM actors ORDER BY rowid"):
+            yield deserialize_actor(from_row(row, ACTOR_COLUMNS))
+
+    def truncate_actors(self):
+        """ Clears the actors table.
+
+        The actors sequence is stored first, so that the identifiers of the cleared actors
+        are not handed out again.
+
+        :return: None
+        """
+        self.reserve_ids(ACTOR_SEQUENCE, 0)
+        with self.connection:
+            self.connection.execute("DELETE FROM actors")
+
+    def _insert_tournament(self, serialized_tournament, interrupted):
+        """ Inserts a serialized tournament, replacing the one with the same identifier.
+
+        :param serialized_tournament: structured dictionary, normalized or not.
+        :param interrupted: True for an interrupted tournament.
+        :return: None
+        """
+        serialized_tournament = normalize_tournament(serialized_tournament)
+        self.connection.execute("DELETE FROM tournaments WHERE interrupted = ? AND tournament_id = ?",
+                                (int(interrupted), serialized_tournament['tournament_id']))
+        cursor = self.connection.execute(
+            insert_query('tournaments', ['interrupted'] + TOURNAMENT_COLUMNS),
+            [int(interrupted)] + [to_column(column, serialized_tournament[column])
+                                  for column in TOURNAMENT_COLUMNS])
+        row_id = cursor.lastrowid
+        self.connection.executemany(
+            insert_query('tournament_actors', ['tournament'] + ACTOR_COLUMNS),
+            [[row_id] + [to_column(column, actor[column]) for column in ACTOR_COLUMNS]
+             for actor in serialized_tournament['actors']])
+        self.connection.executemany(
+            insert_query('players', ['tournament'] + PLAYER_COLUMNS),
+            [[row_id] + [player[column] for column in PLAYER_COLUMNS]
+             for player in serialized_tournament['list_of_players']])
+        rounds = []
+        matches = []
+        for serialized_round in serialized_tournament['rounds']:
+            r0und = dict(serialized_round)
+            r0und['players'] = json.dumps(serialized_round['players'])
+            r0und.setdefault('bye', None)
+            rounds.append([row_id] + [to_column(column, r0und[column]) for column in ROUND_COLUMNS])
+            for match in serialized_round['matches'].values():
+                matches.append([row_id] + [match[column] for column in MATCH_COLUMNS])
+        self.connection.executemany(insert_query('rounds', ['tournament'] + ROUND_COLUMNS), rounds)
+        self.connection.executemany(insert_query('matches', ['tournament'] + MATCH_COLUMNS), matches)
+
+    def _select_tournament(self, row):
+        """ Rebuilds the normalized dictionary of a tournament from its rows.
+
+        :param row: the row of the tournaments table.
+        :return: structured dictionary.
+        """
+        row_id = row['id']
+        tournament_id = row['tournament_id']
+        serialized_tournament = from_row(row, TOURNAMENT_COLUMNS)
+        serialized_tournament['actors'] = [
+            from_row(actor, ACTOR_COLUMNS) for actor in self.connection.execute(
+                "SELECT * FROM tournament_actors WHERE tournament = ? ORDER BY rowid", (row_id,))]
+        serialized_tournament['list_of_players'] = []
+        for player_row in self.connection.execute(
+                "SELECT * FROM players WHERE tournament = ? ORDER BY player_id", (row_id,)):
+            player = from_row(player_row, PLAYER_COLUMNS)
+            player['tournament_ID'] = tournament_id
+            serialized_tournament['list_of_players'].append(player)
+        rounds = {}
+        for round_row in self.connection.execute(
+                "SELECT * FROM rounds WHERE tournament = ? ORDER BY round_nb", (row_id,)):
+            r0und = from_row(round_row, ROUND_COLUMNS)
+            r0und['players'] = json.loads(r0und['players'])
+            r0und['tournament_ID'] = tournament_id
+            r0und['matches'] = {}
+            rounds[r0und['round_nb']] = r0und
+        for match_row in self.connection.execute(
+                "SELECT * FROM matches WHERE tournament = ? ORDER BY round_nb, match_nb", (row_id,)):
+            match = from_row(match_row, MATCH_COLUMNS)
+            match['tournament_ID'] = tournament_id
+            rounds[match['round_nb']]['matches'][str(match['match_nb'])] = match
+        serialized_tournament['rounds'] = list(rounds.values())
+        return serialized_tournament
+
+    def export_interrupted_tournament(self, tournament):
+        """ Transfers an instance of tournament in the interrupted tournaments.
+
+        The interrupted tournament with the same identifier is replaced, the others are kept.
+
+        :param tournament: instance of tournament
+        :return: None
+        """
+        self.export_serialized_interrupted_tournament(tournament.tournament_to_dict())
+
+    def export_serialized_interrupted_tournament(self, serialized_tournament):
+        """ Transfers a tournament already transformed in a dictionary in the interrupted tournaments.
+
+        :param serialized_tournament: structured dictionary given by tournament_to_dict.
+        :return: None
+        """
+        with self.connection:
+            self._insert_tournament(serialized_tournament, interrupted=True)
+
+    def import_interrupted_tournament(self, identifier):
+        """ Imports the interrupted tournament with the given identifier.
+
+        :param identifier: the identifier of the interrupted tournament.
+        :return: the instance of tournament, [] if there is none.
+        """
+        row = self.connection.execute("SELECT * FROM tournaments WHERE interrupted = 1 AND tournament_id = ?",
+                                      (identifier,)).fetchone()
+        if row is None:
+            return []
+        return deserialize_tournament(self._select_tournament(row))
+
+    def list_interrupted_tournaments(self):
+        """ Lists the summaries of the interrupted tournaments, reading only the tournaments table.
+
+        :return: list of tournament summaries.
+        """
+        rows = self.connection.execute("SELECT * FROM tournaments WHERE interrupted = 1 ORDER BY id").fetchall()
+        return [deserialize_tournament_summary(from_row(row, TOURNAMENT_COLUMNS)) for row in rows]
+
+    def export_tournament(self, tournament):
+        """ Transfers an instance of tournament in the database.
+
+        :param tournament: instance of tournament
+        :return: None
+        """
+        with self.connection:
+            self._insert_tournament(tournament.tournament_to_dict(), interrupted=False)
+        self.cache.invalidate(tournament.tournament_id)
+
+    def export_finished_tournament(self, tournament):
+        """ Exports the tournament and the actors of its players, in a single transaction.
+
+        The tournament is removed from the interrupted tournaments.
+
+        :param tournament: the finished tournament, ready to be exported
+        :return: None
+        """
+        self.export_serialized_finished_tournament(tournament.tournament_to_dict(),
+                                                   [player.actor.actor_to_dict()
+                                                    for player in tournament.list_of_players])
+
+    def export_serialized_finished_tournament(self, serialized_tournament, serialized_actors):
+        """ Exports a finished tournament and the actors of its players, already transformed in dictionaries.
+
+        :param serialized_tournament: structured dictionary given by tournament_to_dict.
+        :param serialized_actors: the actors of the players, given by actor_to_dict.
+        :return: None
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM tournaments WHERE interrupted = 1 AND tournament_id = ?",
+                                    (serialized_tournament['tournament_id'],))
+            self._insert_tournament(serialized_tournament, interrupted=False)
+            self._insert_actors(serialized_actors)
+        self.cache.invalidate(serialized_tournament['tournament_id'])
+
+    def find_tournament_by_id(self, identifier):
+        """ Finds the tournament in the database by entering its identifier.
+
+        The tournament is selected and deserialized only if it is not in the cache.
+
+        :param identifier: the identifier of the searched tournament.
+        :return: instance of the searched tournament, {} if there is none.
+        """
+        tournament = self.cache.get(identifier)
+        if tournament is not None:
+            return tournament
+        row = self.connection.execute("SELECT * FROM tournaments WHERE interrupted = 0 AND tournament_id = ?",
+                                      (identifier,)).fetchone()
+        if row is None:
+            return {}
+        tournament = deserialize_tournament(self._select_tournament(row))
+        self.cache.put(identifier, tournament)
+        return tournament
+
+    def import_last_tournament_id(self):
+        """ Imports the last tournament identifier created.
+
+        It is the last identifier handed out by the tournaments sequence.
+
+        :return: the last tournament identifier
+        """
+        return format_id(self._sequence_last(TOURNAMENT_SEQUENCE), ID_WIDTH)
+
+    def import_tournaments(self):
+        """ Imports the list of tournaments instances from the database.
+
+        :return: list of tournaments instances.
+        """
+        return list(self.iter_tournaments())
+
+    def iter_tournaments(self):
+        """ Gives the tournaments instances one at a time, the rows are fetched as they are reached.
+
+        :return: generator of tournaments instances.
+        """
+        for row in self.connection.execute("SELECT * FROM tournaments WHERE interrupted = 0 ORDER BY id"):
+            yield deserialize_tournament(self._select_tournament(row))
+
+    def list_tournament_summaries(self):
+        """ Lists the summaries of the tournaments, reading only the tournaments table.
+
+        :return: list of tournament summaries.
+        """
+        rows = self.connection.execute("SELECT * FROM tournaments WHERE interrupted = 0 ORDER BY id").fetchall()
+        return [deserialize_tournament_summary(from_row(row, TOURNAMENT_COLUMNS)) for row in rows]
+
+    def query_tournaments(self, start_after=None, start_before=None, end_after=None, end_before=None,
+                          location=None, timer_type=None, name_prefix=None):
+        """ Lists the summaries of the finished tournaments matching all the given criteria.
+
+        The query uses the indexes of the tournaments table on the location, the timer type,
+        the dates and the name.
+
+        :param start_after: the earliest start date, included.
+        :param start_before: the latest start date, included.
+        :param end_after: the earliest end date, included.
+        :param end_before: the latest end date, included.
+        :param location: the location of the tournaments.
+        :param timer_type: the timer type of the tournaments.
+        :param name_prefix: the beginning of the name of the tournaments, whatever the case.
+        :return: list of tournament summaries, sorted by identifier.
+        """
+        conditions = ["interrupted = 0"]
+        parameters = []
+        for condition, value in [("start_date >= ?", start_after), ("start_date <= ?", start_before),
+                                 ("end_date >= ?", end_after), ("end_date <= ?", end_before),
+                                 ("location = ?", location), ("timer_type = ?", timer_type)]:
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(str(value))
+        if name_prefix:
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            parameters.append(name_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        rows = self.connection.execute("SELECT * FROM tournaments WHERE " + " AND ".join(conditions)
+                                       + " ORDER BY tournament_id", parameters).fetchall()
+        return [deserialize_tournament_summary(from_row(row, TOURNAMENT_COLUMNS)) for row in rows]
+
+    def player_history(self, actor_id):
+        """ Lists the players of an actor in the finished tournaments, reading only its tournaments.
+
+        The tournaments of the actor are found by the index of the players on actor_id.
+
+        :param actor_id: the identifier of the actor.
+        :return: list of tuples (tournament, player), sorted by tournament identifier.
+        """
+        rows = self.connection.execute(
+            "SELECT tournaments.tournament_id, players.player_id FROM players "
+            "JOIN tournaments ON tournaments.id = players.tournament "
+            "WHERE players.actor_id = ? AND tournaments.interrupted = 0 "
+            "ORDER BY tournaments.tournament_id", (actor_id,)).fetchall()
+        return read_player_history(self.find_tournament_by_id, [tuple(row) for row in rows])
+
+    def head_to_head(self, actor_id, other_actor_id):
+        """ Lists the matches played between two actors, reading only their common tournaments.
+
+        :param actor_id: the identifier of the first actor.
+        :param other_actor_id: the identifier of the second actor.
+        :return: list of matches, sorted by tournament identifier then by round.
+        """
+        rows = self.connection.execute(
+            "SELECT tournaments.tournament_id, players.player_id, others.player_id FROM players "
+            "JOIN players AS others ON others.tournament = players.tournament "
+            "JOIN tournaments ON tournaments.id = players.tournament "
+            "WHERE players.actor_id = ? AND others.actor_id = ? AND tournaments.interrupted = 0 "
+            "ORDER BY tournaments.tournament_id", (actor_id, other_actor_id)).fetchall()
+        return read_head_to_head(self.find_tournament_by_id, [tuple(row) for row in rows])
+
+
+def convert_tinydb_to_sqlite(json_path, sqlite_path=SQLITE_PATH):
+    """ Copies the actors and tournaments of a TinyDB file into a SQLite database.
+
+    The tournaments of the former schema are normalized on the fly.
+    The whole conversion is a single transaction.
+
+    :param json_path: path of the TinyDB file.
+    :param sqlite_path: path of the SQLite database.
+    :return: the number of actors and the number of tournaments converted.
+    """
+    with open(json_path, encoding="utf-8") as handle:
+        tables = json.load(handle)
+    handler = SQLiteDataBaseHandler(sqlite_path)
+    nb_tournaments = 0
+    with handler.connection:
+        actors = list(tables.get('actors', {}).values())
+        handler._insert_actors(actors)
+        for table_name in TOURNAMENT_TABLES:
+            for serialized_tournament in tables.get(table_name, {}).values():
+                handler._insert_tournament(serialized_tournament,
+                                           interrupted=(table_name == 'interrupted_tournament'))
+                nb_tournaments += 1
+    handler.close()
+    return len(actors), nb_tournaments
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module keeps the standings of a tournament up to date as the points are assigned.
+
+The players are ordered by points (decreasingly), then by rank, then by player_id,
+which is the order given by sorting by rank and then by points. When the points of a few players
+change, only these players are moved.
+
+The standings are a sorted list cut into blocks of BLOCK_SIZE to 2 BLOCK_SIZE players,
+with the last key of each block, and a Fenwick tree over the sizes of the blocks:
+a player is found by two bisections, the first one over the last keys of the blocks,
+and its place is the number of players of the blocks before its own, read from the tree.
+Removing or inserting a player shifts only the end of its block: moving a player costs
+O(log n + BLOCK_SIZE), and applying a whole round of n changes O(n (log n + BLOCK_SIZE)).
+
+The place attribute of the players is written by assign_places, only for the
+positions which have changed since the last call.
+
+"""
+
+
+from bisect import bisect_left
+from itertools import chain
+
+
+BLOCK_SIZE = 64
+
+
+def standing_key(player):
+    """ Gives the key ordering the players in the standings.
+
+    :param player: instance of player.
+    :return: the tuple (-points, rank, player_id).
+    """
+    return -player.points, player.rank, player.player_id
+
+
+def fenwick_tree(sizes):
+    """ Builds the Fenwick tree giving the sums of the first sizes.
+
+    :param sizes: list of integers.
+    :return: the tree, a list with one more element than sizes.
+    """
+    tree = [0] + list(sizes)
+    for index in range(1, len(tree)):
+        parent = index + (index & -index)
+        if parent < len(tree):
+            tree[parent] += tree[index]
+    return tree
+
+
+def fenwick_add(tree, index, delta):
+    """ Adds delta to the size at the given index.
+
+    :param tree: the Fenwick tree.
+    :param index: the index of the size, from 0.
+    :param delta: the integer to add.
+    :return: None
+    """
+    index += 1
+    while index < len(tree):
+        tree[index] += delta
+        index += index & -index
+
+
+def fenwick_sum(tree, count):
+    """ Gives the sum of the first sizes.
+
+    :param tree: the Fenwick tree.
+    :param count: the number of sizes to add up.
+    :return: the sum of the sizes of indexes 0 to count - 1.
+    """
+    total = 0
+    while count > 0:
+        total += tree[count]
+        count -= count & -count
+    return total
+
+
+class Standings:
+    """ The players of a tournament, ordered by their place.
+
+    The changes of points are applied when the standings are read: each player whose points
+    have changed is removed at its former key, and inserted at its new one.
+
+    """
+    def __init__(self, players):
+        ordered = sorted(players, key=standing_key)
+        self.size = len(ordered)
+        self.blocks = [ordered[start:start + BLOCK_SIZE] for start in range(0, self.size, BLOCK_SIZE)]
+        self.block_keys = [[standing_key(player) for player in block] for block in self.blocks]
+        self.last_keys = [keys[-1] for keys in self.block_keys]
+        self.tree = fenwick_tree(len(block) for block in self.blocks)
+        # Former key of the players whose points have changed since the standings were last read.
+        self.pending = {}
+        # Range of the positions whose place attribute is out of date.
+        self.first_changed = 0
+        self.last_changed = self.size - 1
+
+    def __iter__(self):
+        self._apply_changes()
+        return chain.from_iterable(self.blocks)
+
+    def __len__(self):
+        return self.size
+
+    def _locate(self, key):
+        """ Finds the block and the index in the block of a key.
+
+        :param key: a key of standing_key.
+        :return: the tuple (index of the block, index in the block).
+        """
+        block = min(bisect_left(self.last_keys, key), len(self.last_keys) - 1)
+        return block, bisect_left(self.block_keys[block], key)
+
+    def place_of(self, player):
+        """ Gives the place of a player, from 1 for the first one.
+
+        :param player: instance of player of the standings.
+        :return: the place of the player.
+        """
+        self._apply_changes()
+        block, index = self._locate(standing_key(player))
+        return fenwick_sum(self.tree, block) + index + 1
+
+    def add_points(self, player, points):
+        """ Adds points to a player, who is moved to its new position when the standings are read.
+
+        :param player: instance of player of the standings.
+        :param points: the points won.
+        :return: None
+        """
+        if not points:
+            return
+        self.pending.setdefault(player.player_id, (standing_key(player), player))
+        player.points += points
+
+    def _remove(self, key):
+        """ Removes the player of the given key.
+
+        :param key: the key of a player of the standings.
+        :return: the former position of the player, from 0.
+        """
+        block, index = self._locate(key)
+        position = fenwick_sum(self.tree, block) + index
+        del self.block_keys[block][index]
+        del self.blocks[block][index]
+        if self.blocks[block]:
+            self.last_keys[block] = self.block_keys[block][-1]
+            fenwick_add(self.tree, block, -1)
+        else:
+            del self.blocks[block], self.block_keys[block], self.last_keys[block]
+            self.tree = fenwick_tree(len(players) for players in self.blocks)
+        return position
+
+    def _insert(self, key, player):
+        """ Inserts a player at its key, and splits its block when it gets too large.
+
+        :param key: the key of the player.
+        :param player: instance of player.
+        :return: the new position of the player, from 0.
+        """
+        if not self.blocks:
+            self.blocks, self.block_keys, self.last_keys = [[player]], [[key]], [key]
+            self.tree = fenwick_tree([1])
+            return 0
+        block, index = self._locate(key)
+        position = fenwick_sum(self.tree, block) + index
+        self.block_keys[block].insert(index, key)
+        self.blocks[block].insert(index, player)
+        self.last_keys[block] = self.block_keys[block][-1]
+        if len(self.blocks[block]) > 2 * BLOCK_SIZE:
+            self.blocks[block + 1:block + 1] = [self.blocks[block][BLOCK_SIZE:]]
+            self.block_keys[block + 1:block + 1] = [self.block_keys[block][BLOCK_SIZE:]]
+            del self.blocks[block][BLOCK_SIZE:], self.block_keys[block][BLOCK_SIZE:]
+            self.last_keys[block:block + 1] = [self.block_keys[block][-1], self.block_keys[block + 1][-1]]
+            self.tree = fenwick_tree(len(players) for players in self.blocks)
+        else:
+            fenwick_add(self.tree, block, 1)
+        return position
+
+    def _apply_changes(self):
+        """ Moves the players whose points have changed.
+
+        :return: None
+        """
+        for former_key, player in self.pending.values():
+            former = self._remove(former_key)
+            position = self._insert(standing_key(player), player)
+            self.first_changed = min(self.first_changed, former, position)
+            self.last_changed = max(self.last_changed, former, position)
+        self.pending = {}
+
+    def assign_places(self):
+        """ Writes the place of the players whose position has changed since the last call.
+
+        :return: None
+        """
+        self._apply_changes()
+        start = 0
+        for players in self.blocks:
+            if start > self.last_changed:
+                break
+            for index in range(max(self.first_changed - start, 0),
+                               min(self.last_changed - start + 1, len(players))):
+                players[index].place = start + index + 1
+            start += len(players)
+        self.first_changed = self.size
+        self.last_changed = -1
+
+
+def add_points(player, points, standings=None):
+    """ Adds points to a player, through the standings when there are some.
+
+    :param player: instance of player.
+    :param points: the points won.
+    :param standings: the standings of the tournament, or None.
+    :return: None
+    """
+    if standings is None:
+        player.points += points
+    else:
+        standings.add_points(player, points)
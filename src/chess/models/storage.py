@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module provides the storages of the database.
+
+AtomicJSONStorage writes the whole database in a temporary file which replaces db.json,
+so that a crash during a write never leaves a truncated file.
+CompressedJSONStorage does the same with a file compressed by lzma, gzip or zlib.
+WriteBehindMiddleware keeps the parsed database in memory, coalesces the writes
+and reloads the file when it is modified by another process.
+
+"""
+
+
+import atexit
+import gzip
+import json
+import lzma
+import os
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+
+from tinydb.middlewares import Middleware
+from tinydb.storages import Storage
+
+from chess.settings import FLUSH_INTERVAL
+
+
+# Suffix of the compressed files and module of their compression.
+COMPRESSIONS = {".xz": lzma, ".gz": gzip, ".zz": zlib}
+
+
+class AtomicJSONStorage(Storage):
+    """ Stores the database in a JSON file, replaced atomically at each write. """
+    def __init__(self, path, encoding="utf-8", **kwargs):
+        super().__init__()
+        self.path = path
+        self.encoding = encoding
+        self.kwargs = kwargs
+
+    def read(self):
+        """ Reads and parses the JSON file.
+
+        :return: the data of the database, None if the file is missing or empty.
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return None
+        with open(self.path, encoding=self.encoding) as handle:
+            return json.load(handle)
+
+    def write(self, data):
+        """ Writes the data in a temporary file, synchronises it and renames it as the database file.
+
+        :param data: the data of the database.
+        :return: None
+        """
+        with atomic_file(self.path, self.encoding) as handle:
+            json.dump(data, handle, **self.kwargs)
+
+    def signature(self):
+        """ Gives the modification time and the size of the file, to detect its modifications.
+
+        :return: tuple (modification time in nanoseconds, size), None if the file is missing.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def close(self):
+        """ Nothing to close, the file is opened at each read and write. """
+
+
+class CompressedJSONStorage(AtomicJSONStorage):
+    """ Stores the data in a compressed JSON file, replaced atomically at each write.
+
+    The compression is given by the suffix of the file: .xz for lzma, .gz for gzip, .zz for zlib.
+
+    """
+    def __init__(self, path, encoding="utf-8", **kwargs):
+        super().__init__(path, encoding, **kwargs)
+        self.compression = COMPRESSIONS[os.path.splitext(path)[1]]
+
+    def read(self):
+        """ Reads, decompresses and parses the file.
+
+        :return: the data, None if the file is missing or empty.
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return None
+        with open(self.path, "rb") as handle:
+            return json.loads(self.compression.decompress(handle.read()).decode(self.encoding))
+
+    def write(self, data):
+        """ Compresses the data in a temporary file, synchronises it and renames it as the file.
+
+        :param data: the data to store.
+        :return: None
+        """
+        with atomic_file(self.path, binary=True) as handle:
+            handle.write(self.compression.compress(json.dumps(data, **self.kwargs).encode(self.encoding)))
+
+    def decompressed_size(self):
+        """ Gives the size of the JSON file once decompressed.
+
+        :return: the size in bytes.
+        """
+        with open(self.path, "rb") as handle:
+            return len(self.compression.decompress(handle.read()))
+
+
+def json_storage(path):
+    """ Gives the storage of a JSON file, compressed or not according to its suffix.
+
+    :param path: path of the file.
+    :return: the storage of the file.
+    """
+    if os.path.splitext(path)[1] in COMPRESSIONS:
+        return CompressedJSONStorage(path)
+    return AtomicJSONStorage(path)
+
+
+@contextmanager
+def atomic_file(path, encoding="utf-8", binary=False):
+    """ Opens a temporary file which replaces the file path when it is closed without error.
+
+    The temporary file is synchronised on disk before the renaming, then the directory is too.
+    If an error occurs, the temporary file is removed and path is left untouched.
+
+    :param path: path of the file to replace.
+    :param encoding: encoding of the file, in text mode.
+    :param binary: True to open the temporary file in binary mode.
+    :return: the handle of the temporary file, opened for writing.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".db-", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb" if binary else "w", encoding=None if binary else encoding) as handle:
+            yield handle
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+    sync_directory(directory)
+
+
+def sync_directory(directory):
+    """ Synchronises a directory so that a renaming in it survives a crash.
+
+    :param directory: path of the directory.
+    :return: None
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class WriteBehindMiddleware(Middleware):
+    """ Keeps the parsed database in memory and writes it at most once per flush interval.
+
+    A write only replaces the data in memory. The data is written on disk flush_interval seconds
+    after the first unsaved change, by a daemon timer or by a write happening later,
+    or by an explicit flush. With a flush interval of 0, each write is written on disk immediately.
+    All the middlewares are flushed at the interpreter exit.
+
+    The lock of the middleware is held by the writes, the flushes and the timer:
+    a handler which modifies the data read from the middleware holds it until its write,
+    so that the timer never writes a change half made.
+
+    The modification time and the size of the file are memorized at each read and write:
+    if they change while there is no unsaved change, the data is read again from the file.
+
+    The middleware opens its storage once, so the same instance can be shared by several TinyDB.
+
+    """
+    def __init__(self, storage_cls, flush_interval=FLUSH_INTERVAL):
+        super().__init__(storage_cls)
+        self.flush_interval = flush_interval
+        self.cache = None
+        self.modified_since = None
+        self.signature = None
+        self.lock = threading.RLock()
+        self.timer = None
+
+    def __call__(self, *args, **kwargs):
+        if self.storage is None:
+            self.storage = self._storage_cls(*args, **kwargs)
+        return self
+
+    def read(self):
+        with self.lock:
+            if self.cache is None:
+                self.signature = self.storage.signature()
+                self.cache = self.storage.read()
+            return self.cache
+
+    def reload_if_changed(self):
+        """ Drops the data in memory if the file has been modified by someone else.
+
+        Unsaved changes are never dropped.
+
+        :return: True if the data will be read again from the file.
+        """
+        with self.lock:
+            if self.cache is None or self.modified_since is not None:
+                return False
+            if self.storage.signature() == self.signature:
+                return False
+            self.cache = None
+            return True
+
+    def write(self, data):
+        with self.lock:
+            self.cache = data
+            if self.modified_since is None:
+                self.modified_since = time.monotonic()
+            if time.monotonic() - self.modified_since >= self.flush_interval:
+                self.flush()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.flush_interval - (time.monotonic() - self.modified_since),
+                                             self._flush_on_time)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def _flush_on_time(self):
+        """ Flushes the data when the flush interval has passed, in the thread of the timer.
+
+        :return: None
+        """
+        with self.lock:
+            self.timer = None
+            self.flush()
+
+    def flush(self):
+        """ Writes the data in memory on disk if it has been modified.
+
+        :return: None
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if self.modified_since is not None:
+                self.storage.write(self.cache)
+                self.signature = self.storage.signature()
+                self.modified_since = None
+
+    def close(self):
+        """ Flushes the data, the storage stays open for the other users of the middleware. """
+        self.flush()
+
+
+_write_behind_middlewares = {}
+
+
+def shared_storage(path, flush_interval=FLUSH_INTERVAL):
+    """ Gives the write-behind middleware of a database file, shared by the whole process.
+
+    The flush interval is set when the middleware is created: asking for the middleware
+    of the same file with another flush interval raises ValueError.
+
+    :param path: path of the database file.
+    :param flush_interval: the flush interval in seconds, 0 to write each change immediately.
+    :return: the middleware, to give as storage to TinyDB.
+    """
+    key = os.path.abspath(path)
+    if key not in _write_behind_middlewares:
+        _write_behind_middlewares[key] = WriteBehindMiddleware(AtomicJSONStorage, flush_interval)
+    middleware = _write_behind_middlewares[key]
+    if middleware.flush_interval != flush_interval:
+        raise ValueError(f"The storage of {path} is already shared with a flush interval "
+                         f"of {middleware.flush_interval} s, not {flush_interval} s")
+    return middleware
+
+
+def release_storage(path):
+    """ Flushes the write-behind middleware of a database file and forgets it.
+
+    :param path: path of the database file.
+    :return: None
+    """
+    middleware = _write_behind_middlewares.pop(os.path.abspath(path), None)
+    if middleware is not None:
+        middleware.flush()
+
+
+def flush_storages():
+    """ Flushes all the write-behind middlewares.
+
+    :return: None
+    """
+    for middleware in _write_behind_middlewares.values():
+        middleware.flush()
+
+
+atexit.register(flush_storages)
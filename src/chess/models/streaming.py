@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module reads a TinyDB file incrementally.
+
+json.load decodes the whole file before the first document can be used.
+The reader of this module walks the file by chunks and decodes one document at a time,
+so that the memory used stays bounded by the size of the largest document,
+whatever the size of the file.
+
+"""
+
+
+import inspect
+import json
+import re
+
+
+CHUNK_SIZE = 1 << 16
+
+WHITESPACE = re.compile(r"\s*")
+# The characters which may continue a number cut by the end of the buffer, as "12." or "1e-".
+NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+# A string, closed or cut by the end of the buffer, or a character opening or closing an object or an array.
+STRUCTURE = re.compile(r'"(?:[^"\\]|\\.)*(?P<closed>")?|[{}\[\]]')
+
+
+class JSONStreamReader:
+    """ Walks a JSON file with a buffer of a few chunks.
+
+    The consumed part of the buffer is dropped each time a chunk is read.
+
+    """
+    def __init__(self, handle, chunk_size=CHUNK_SIZE):
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """ Reads a chunk at the end of the buffer, after dropping its consumed part.
+
+        :return: False if the end of the file is reached.
+        """
+        chunk = self.handle.read(self.chunk_size)
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        if not chunk:
+            self.eof = True
+        return bool(chunk)
+
+    def peek(self):
+        """ Skips the whitespaces and gives the next character, without consuming it.
+
+        :return: the next character, "" at the end of the file.
+        """
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or not self._fill():
+                return self.buffer[self.position:self.position + 1]
+
+    def expect(self, character):
+        """ Consumes the next character, which must be the given one.
+
+        :param character: the expected character.
+        :return: None
+        """
+        if self.peek() != character:
+            raise ValueError(f"Expected {character!r} at character {self.position} of the buffer")
+        self.position += 1
+
+    def read_value(self):
+        """ Decodes the next value.
+
+        Chunks are read until the buffer holds the whole value.
+
+        :return: the decoded value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if not self.eof and NUMBER_TAIL.fullmatch(self.buffer, end) and self._fill():
+                # A number could continue in the next chunk.
+                continue
+            self.position = end
+            return value
+
+    def skip_value(self):
+        """ Consumes the next value without decoding it.
+
+        :return: None
+        """
+        if self.peek() not in "{[":
+            self.read_value()
+            return
+        depth = 0
+        while True:
+            match = STRUCTURE.search(self.buffer, self.position)
+            if match is None or (match.group().startswith('"') and match.group("closed") is None):
+                # The string continues in the next chunk.
+                self.position = len(self.buffer) if match is None else match.start()
+                if not self._fill():
+                    raise ValueError("Unexpected end of the file")
+                continue
+            self.position = match.end()
+            if match.group() in "{[":
+                depth += 1
+            elif match.group() in "}]":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def iter_members(self):
+        """ Walks the members of the next object.
+
+        Each value must be consumed by read_value or skip_value before the next member.
+
+        :return: generator of the keys of the object.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.position += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.position += 1
+            else:
+                self.expect("}")
+                return
+
+
+def iter_tables(path, chunk_size=CHUNK_SIZE):
+    """ Walks the tables of a TinyDB file.
+
+    The documents of a table must be walked before the next table.
+    A table whose documents are not walked at all is skipped without being decoded,
+    the rest of a table partly walked is decoded and dropped.
+
+    :param path: path of the TinyDB file.
+    :param chunk_size: the number of characters read at once.
+    :return: generator of tuples (table name, generator of tuples (doc_id, document)).
+    """
+    with open(path, encoding="utf-8") as handle:
+        reader = JSONStreamReader(handle, chunk_size)
+        if reader.peek() == "":
+            return
+        for table_name in reader.iter_members():
+            documents = iter_table_documents(reader)
+            yield table_name, documents
+            if inspect.getgeneratorstate(documents) == inspect.GEN_CREATED:
+                reader.skip_value()
+            else:
+                for doc_id, document in documents:
+                    pass
+
+
+def iter_table_documents(reader):
+    """ Decodes the documents of the table at the position of the reader, one at a time.
+
+    :param reader: the reader, before the object of a table.
+    :return: generator of tuples (doc_id, document).
+    """
+    for doc_id in reader.iter_members():
+        yield doc_id, reader.read_value()
+
+
+def iter_documents(path, table_name, chunk_size=CHUNK_SIZE):
+    """ Decodes the documents of a table of a TinyDB file, one at a time.
+
+    The other tables are skipped without being decoded.
+
+    :param path: path of the TinyDB file.
+    :param table_name: the name of the table.
+    :param chunk_size: the number of characters read at once.
+    :return: generator of the documents of the table.
+    """
+    for name, documents in iter_tables(path, chunk_size):
+        if name == table_name:
+            for doc_id, document in documents:
+                yield document
+            return
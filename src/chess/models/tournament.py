@@ -12,6 +12,7 @@ from chess.utils.utils import get_new_id
 
 from chess.models.actors import Player
 from chess.models.round import Round
+from chess.models.standings import Standings
 
 
 TOURNAMENT_ID_WIDTH = 8
@@ -21,12 +22,18 @@ NB_MATCH = 4
 
 
 class Tournament:
-    """ The class Tournament is the central piece of the models. """
+    """ The class Tournament is the central piece of the models.
+
+    Without tournament_id, the identifier is the next one of the class counter.
+
+    """
     last_tournament_id = "0" * TOURNAMENT_ID_WIDTH
 
-    def __init__(self, name, location, timer_type, description):
-        Tournament.last_tournament_id = get_new_id(Tournament.last_tournament_id, TOURNAMENT_ID_WIDTH)
-        self.tournament_id = Tournament.last_tournament_id
+    def __init__(self, name, location, timer_type, description, tournament_id=None):
+        if tournament_id is None:
+            Tournament.last_tournament_id = get_new_id(Tournament.last_tournament_id, TOURNAMENT_ID_WIDTH)
+            tournament_id = Tournament.last_tournament_id
+        self.tournament_id = tournament_id
         self.name = name
         self.location = location
         self.start_date = None
@@ -38,17 +45,28 @@ class Tournament:
         self.list_of_players = []
         self.players_assigned = False
         self.finished = False
+        self.standings = None
 
     def define_players(self, actors):
         """ Defines the list of identifier of the players who join the tournament.
 
-        :param actors:
+        :param actors: the actors of the players, in any number.
         :return: None
         """
-        for num_player in range(NB_PLAYERS):
-            self.list_of_players.append(Player(actors[num_player],
+        for num_player, actor in enumerate(actors):
+            self.list_of_players.append(Player(actor,
                                                self.tournament_id,
                                                num_player))
+        self.standings = None
+
+    def get_standings(self):
+        """ Gives the standings of the tournament, built from the points of the players the first time.
+
+        :return: instance of standings.
+        """
+        if self.standings is None:
+            self.standings = Standings(self.list_of_players)
+        return self.standings
 
     def init_round(self, num_round):
         """ Launches the round number "num_round".
@@ -56,11 +74,27 @@ class Tournament:
         :param num_round: number of the round played
         :return: None
         """
+        tour = self.new_round(num_round)
+        tour.define_matches(self.byes())
+        self.rounds.append(tour)
+
+    def new_round(self, num_round):
+        """ Creates the round number "num_round", with the players ranked but not paired yet.
+
+        :param num_round: number of the round played
+        :return: instance of round.
+        """
         tour = Round(num_round, self.tournament_id, self.list_of_players)
         tour.start_date = datetime.date.today()
-        tour.rank_players()
-        tour.define_matches()
-        self.rounds.append(tour)
+        tour.rank_players(self.get_standings())
+        return tour
+
+    def byes(self):
+        """ Gives the players who already had a bye in the tournament.
+
+        :return: the list of their player_id.
+        """
+        return [r0und.bye.player_id for r0und in self.rounds if r0und.bye is not None]
 
     def register_round_results(self, num_round, winner):
         """ Registers the results of the round.
@@ -71,15 +105,19 @@ class Tournament:
 
         """
         self.rounds[num_round].register_results(winner)
-        self.rounds[num_round].assign_points()
+        self.rounds[num_round].assign_points(self.get_standings())
         self.rounds[num_round].finished = True
         self.rounds[num_round].memorize_opponents()
-        self.rounds[num_round].rank_players()
+        self.rounds[num_round].rank_players(self.get_standings())
         self.rounds[num_round].end_date = datetime.date.today()
 
     def tournament_to_dict(self):
         """ Converts the tournament into a dictionary
 
+        Each actor is serialized once in the list actors,
+        the players reference it by its actor_id and the rounds
+        and matches reference the players by their player_id.
+
         :return: dictionary of the tournament instance.
 
         """
@@ -97,8 +135,10 @@ class Tournament:
         for r0und in self.rounds:
             serialized_tournament['rounds'].append(r0und.round_to_dict())
         serialized_tournament['list_of_players'] = []
+        serialized_tournament['actors'] = []
         for player in self.list_of_players:
             serialized_tournament['list_of_players'].append(player.player_to_dict())
+            serialized_tournament['actors'].append(player.actor.actor_to_dict())
         serialized_tournament['start_date'] = str(self.start_date)
         serialized_tournament['end_date'] = str(self.end_date)
         return serialized_tournament
@@ -114,3 +154,22 @@ class Tournament:
             player.actor.list_of_tournaments_played.append(self.tournament_id)
         self.finished = True
         self.end_date = datetime.date.today()
+
+
+class TournamentSummary:
+    """ The header of a tournament, enough to list the tournaments.
+
+    It is built without the players, rounds and matches of the tournament.
+    The whole tournament is loaded only when it is opened, by its identifier.
+
+    """
+    header_attributes = ['tournament_id', 'name', 'location', 'timer_type', 'description']
+
+    def __init__(self, tournament_id, name, location, timer_type, description):
+        self.tournament_id = tournament_id
+        self.name = name
+        self.location = location
+        self.timer_type = timer_type
+        self.description = description
+        self.start_date = None
+        self.end_date = None
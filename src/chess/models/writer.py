@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module saves the tournaments in a background thread.
+
+The controllers hand the saves over to the writer and continue immediately,
+the writer thread runs them one after the other, in the order they were submitted.
+The queue of the writer is bounded: when it is full, a submission waits for a free place.
+
+flush is the barrier which waits until every submitted save is done. It is called by
+DataBaseHandler.get_shared before any use of the database, before leaving, and at the interpreter exit.
+
+"""
+
+
+import atexit
+import queue
+import threading
+
+from chess.settings import BACKGROUND_WRITES, WRITER_QUEUE_SIZE
+
+
+class BackgroundWriter:
+    """ Runs the submitted saves in a dedicated thread.
+
+    An error raised by a save is kept and raised again by the next flush.
+
+    """
+    def __init__(self, maxsize=WRITER_QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize)
+        self.errors = []
+        self.thread = threading.Thread(target=self._run, name="chess-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        """ Runs the saves of the queue, forever.
+
+        :return: None
+        """
+        while True:
+            function, args = self.queue.get()
+            try:
+                function(*args)
+            except Exception as error:
+                self.errors.append(error)
+            finally:
+                self.queue.task_done()
+
+    def submit(self, function, *args):
+        """ Hands a save over to the writer thread.
+
+        :param function: the function of the save.
+        :param args: the arguments of the function.
+        :return: None
+        """
+        self.queue.put((function, args))
+
+    def flush(self):
+        """ Waits until every submitted save is done.
+
+        :return: None
+        """
+        self.queue.join()
+        if self.errors:
+            error = self.errors[0]
+            self.errors = []
+            raise error
+
+
+_writer = None
+
+
+def submit(function, *args):
+    """ Hands a save over to the writer of the process, created at the first call.
+
+    Without BACKGROUND_WRITES, the save is run immediately.
+
+    :param function: the function of the save.
+    :param args: the arguments of the function.
+    :return: None
+    """
+    global _writer
+    if not BACKGROUND_WRITES:
+        function(*args)
+        return
+    if _writer is None:
+        _writer = BackgroundWriter()
+    _writer.submit(function, *args)
+
+
+def flush_writer():
+    """ Waits until every save submitted to the writer of the process is done.
+
+    :return: None
+    """
+    if _writer is not None:
+        _writer.flush()
+
+
+atexit.register(flush_writer)
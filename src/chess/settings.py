@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+This module gathers the settings of the application.
+
+Each setting can be overridden by the environment variable of the same name prefixed by CHESS_,
+for instance: CHESS_DB_PATH=club.json python main.py
+"""
+
+
+import os
+
+
+def env_setting(name, default, conversion=str):
+    """ Reads a setting in the environment variables.
+
+    :param name: the name of the setting, without the CHESS_ prefix.
+    :param default: the value used when the environment variable is not defined.
+    :param conversion: the function converting the string of the environment variable.
+    :return: the value of the setting.
+    """
+    value = os.environ.get("CHESS_" + name)
+    if value is None:
+        return default
+    return conversion(value)
+
+
+def str_to_bool(string):
+    """ Converts a string of an environment variable into a boolean.
+
+    :param string: "1", "true", "yes" or "on" for True, whatever the case.
+    :return: the boolean.
+    """
+    return string.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Backend of the database: "tinydb", "sqlite", "sharded" or "packed", the read-only packed archive.
+DB_BACKEND = env_setting("DB_BACKEND", "tinydb")
+
+# Path of the TinyDB database file.
+DB_PATH = env_setting("DB_PATH", "db.json")
+
+# Path of the SQLite database file.
+SQLITE_PATH = env_setting("SQLITE_PATH", "db.sqlite3")
+
+# Keeps the database in memory and writes it on disk FLUSH_INTERVAL seconds after a change.
+WRITE_BEHIND = env_setting("WRITE_BEHIND", False, str_to_bool)
+FLUSH_INTERVAL = env_setting("FLUSH_INTERVAL", 5.0, float)
+
+# Directory of the journals of the tournaments in progress,
+# and number of records after which the journal is compacted in a snapshot.
+JOURNAL_DIR = env_setting("JOURNAL_DIR", "journal")
+JOURNAL_SNAPSHOT_EVERY = env_setting("JOURNAL_SNAPSHOT_EVERY", 20, int)
+
+# Directory of the shards of the finished tournaments and of their catalog, for the "sharded" backend.
+SHARDS_DIR = env_setting("SHARDS_DIR", "tournaments")
+
+# Finished tournaments older than ARCHIVE_AFTER_DAYS days are moved in the cold storage
+# of the "sharded" backend, compressed by ARCHIVE_COMPRESSION: "xz", "gz" or "zz".
+ARCHIVE_AFTER_DAYS = env_setting("ARCHIVE_AFTER_DAYS", 365, int)
+ARCHIVE_COMPRESSION = env_setting("ARCHIVE_COMPRESSION", "xz")
+
+# Saves the tournaments in a background thread, whose queue holds at most WRITER_QUEUE_SIZE saves.
+BACKGROUND_WRITES = env_setting("BACKGROUND_WRITES", True, str_to_bool)
+WRITER_QUEUE_SIZE = env_setting("WRITER_QUEUE_SIZE", 8, int)
+
+# Path of the read-only packed archive of the finished tournaments, for the report kiosks.
+PACKED_PATH = env_setting("PACKED_PATH", "archive.pack")
+
+# Number of deserialized tournaments kept in memory by the handlers, 0 for no cache,
+# and their maximal approximate size in bytes, 0 for no limit.
+TOURNAMENT_CACHE_SIZE = env_setting("TOURNAMENT_CACHE_SIZE", 32, int)
+TOURNAMENT_CACHE_BYTES = env_setting("TOURNAMENT_CACHE_BYTES", 16_000_000, int)
+
+# Number of processes pairing the sections of a batch, 0 for one per processor.
+PAIRING_WORKERS = env_setting("PAIRING_WORKERS", 0, int)
+
+# Number of identifiers of new actors reserved at once in the database.
+ACTOR_ID_BLOCK = env_setting("ACTOR_ID_BLOCK", 32, int)
@@ -86,3 +86,38 @@ def str_to_date(string):
         month = int(date_list[1])
         day = int(date_list[2])
         return datetime.date(year, month, day)
+
+
+def pack_ids(ids):
+    """ Packs a collection of non-negative integer identifiers into a string.
+
+    The identifiers are packed into a hexadecimal bitmask, prefixed by 0x, whose bit number n
+    is set when the identifier n belongs to the collection. When the identifiers are sparse,
+    the sorted spaced string is shorter and is given instead.
+
+    :param ids: the identifiers to pack.
+    :return: the packed string.
+    """
+    mask = 0
+    for identifier in ids:
+        mask |= 1 << identifier
+    bitmask = hex(mask)
+    spaced = list_to_str_space(sorted(ids))
+    return bitmask if len(bitmask) <= len(spaced) else spaced
+
+
+def unpack_ids(string):
+    """ Unpacks a string packed by pack_ids into the set of its identifiers.
+
+    :param string: a hexadecimal bitmask prefixed by 0x, or a spaced string of integers.
+    :return: the set of the identifiers.
+    """
+    if not string.startswith("0x"):
+        return set(str_space_to_int_list(string))
+    mask = int(string, 16)
+    ids = set()
+    while mask:
+        lowest = mask & -mask
+        ids.add(lowest.bit_length() - 1)
+        mask ^= lowest
+    return ids
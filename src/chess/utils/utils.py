@@ -1,8 +1,19 @@
 """
-This module provides two function to get id.
+This module provides the functions to get id.
 """
 
 
+def format_id(number, width):
+    """ Formats the number of an identifier with leading zeros.
+
+    :param number: the number of the identifier.
+    :param width: the width of the identifier.
+    :return: the identifier.
+
+    """
+    return str(number).zfill(width)
+
+
 def get_new_id(identifier, width):
     """ Given an identifier, gets the next identifier.
 
@@ -11,12 +22,7 @@ def get_new_id(identifier, width):
     :return: the next identifier.
 
     """
-    if identifier.lstrip('0') == "":
-        identifier = str(1)
-    else:
-        identifier = str(int(identifier.lstrip('0')) + 1)
-    identifier = (width - len(identifier.lstrip('0'))) * "0" + identifier
-    return identifier
+    return format_id(int(identifier or 0) + 1, width)
 
 
 def get_last_id(list_of_id, width):
@@ -27,11 +33,5 @@ def get_last_id(list_of_id, width):
     :return: the last identifier.
 
     """
-    last_number = 0
-    for identifier in list_of_id:
-        if identifier == "":
-            last_number = 0
-        else:
-            last_number = max(last_number, int(identifier.lstrip('0')))
-    last = (width - len(str(last_number))) * "0" + str(last_number)
-    return last
+    last_number = max((int(identifier) for identifier in list_of_id if identifier), default=0)
+    return format_id(last_number, width)
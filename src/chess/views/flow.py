@@ -6,9 +6,6 @@ This module provides the different messages to display.
 """
 
 
-NB_MATCH = 4
-
-
 def view_intro_home_menu():
     """ Displays an introduction to the home menu. """
     print("\n ### Menu Principal ### \n"
@@ -88,7 +85,7 @@ def view_round_matches(r0und):
             view += "Les matchs ont vu s'affronter : \n"
         else:
             view += "Les matchs verront s'affronter : \n"
-        for num_match in range(NB_MATCH):
+        for num_match in range(len(r0und.matches)):
             view += f"{num_match + 1}. " \
                        f"{r0und.matches[num_match].player1.name}" \
                        f" et {r0und.matches[num_match].player2.name} \n"
@@ -101,24 +98,26 @@ def view_round_matches(r0und):
                 if r0und.matches[num_match].winner == 2:
                     view += f"Victoire de " \
                                f"{r0und.matches[num_match].player2.name}. \n"
+        if r0und.bye is not None:
+            view += f"{r0und.bye.name} est exempté de ce tour. \n"
     print(view)
 
 
 def view_players_rank(list_of_players):
     """ Displays the updated tournament ranking. """
+    players_by_place = {player.place: player for player in list_of_players}
     for rank in range(1, len(list_of_players) + 1):
         view = ""
-        for player in list_of_players:
+        player = players_by_place.get(rank)
+        if player is not None:
             if rank == 1:
-                if player.place == rank:
-                    view += f"1er : {player.name}" \
-                            + " " * (20 - len(player.name)) \
-                            + f"{player.points}"
+                view += f"1er : {player.name}" \
+                        + " " * (20 - len(player.name)) \
+                        + f"{player.points}"
             else:
-                if player.place == rank:
-                    view += f"{rank}eme: {player.name}" \
-                            + " " * (20 - len(player.name)) \
-                            + f"{player.points}"
+                view += f"{rank}eme: {player.name}" \
+                        + " " * (20 - len(player.name)) \
+                        + f"{player.points}"
         print(view)
 
 
@@ -131,16 +130,35 @@ def view_wait_match_results():
           "pour entrez les résultats")
 
 
-def view_tournament_final(tournament):
+def view_tournament_final(tournament, tie_breaks=None):
     """ Displays a message to indicate the end of the tournament and its ranking.
 
     :param tournament: the tournament that ends
+    :param tie_breaks: dictionary tie-break name -> list of the values, in the order of the players, or None.
     :return: None
     """
     print("\n ### Fin des matchs ### \n"
           "\n"
           "-- Classement final -- \n")
     view_players_rank(tournament.list_of_players)
+    if tie_breaks is not None:
+        view_tie_breaks(tournament.list_of_players, tie_breaks)
+
+
+def view_tie_breaks(list_of_players, tie_breaks):
+    """ Displays the tie-breaks of the players, in the order of the ranking.
+
+    :param list_of_players: the players of the tournament.
+    :param tie_breaks: dictionary tie-break name -> list of the values, in the order of the players.
+    :return: None
+    """
+    print("\n-- Départages -- \n")
+    for num, player in sorted(enumerate(list_of_players), key=lambda item: item[1].place):
+        print(f"{player.place}. {player.name}: "
+              f"Buchholz {tie_breaks['buchholz'][num]}, "
+              f"Buchholz médian {tie_breaks['median_buchholz'][num]}, "
+              f"Sonneborn-Berger {tie_breaks['sonneborn_berger'][num]}, "
+              f"Cumulatif {tie_breaks['progressive'][num]}")
 
 
 def view_validation_actors_imported(actors):
@@ -184,8 +202,40 @@ def view_no_actor_id():
     print("Il n'y a pas de joueurs avec cet identitifant")
 
 
+def view_read_only_database():
+    """ Displays a message alerting that the database is a read-only archive. """
+    print("\n ------------------------------------------------------- "
+          "\n --- Base en lecture seule : seuls les rapports sont disponibles ! --- "
+          "\n ------------------------------------------------------- ")
+
+
 def view_import_no_tournament():
     """ Displays a message alerting that no tournament has been imported. """
     print("\n ---------------------------------- "
           "\n --- Aucun tournoi sauvegardé ! --- "
           "\n ---------------------------------- ")
+
+
+def view_league_day(tournaments):
+    """ Displays an introduction to the rounds started at once for a league day.
+
+    :param tournaments: the tournaments whose next round is started.
+    :return: None
+    """
+    print("\n ### Journée de championnat ### \n"
+          f"\n-- Ronde suivante appariée pour {len(tournaments)} tournois --\n"
+          "-- Les résultats se saisissent en reprenant chaque tournoi --")
+
+
+def view_no_league_day():
+    """ Displays a message alerting that no paused tournament waits for its next round. """
+    print("\n ------------------------------------------------------------ "
+          "\n --- Aucun tournoi en pause n'attend sa ronde suivante ! --- "
+          "\n ------------------------------------------------------------ ")
+
+
+def view_paused_tournaments():
+    """ Displays an introduction to the list of the paused tournaments. """
+    print("\n ### Tournois en pause ### \n"
+          "\n"
+          "-- Quel tournoi souhaitez vous reprendre ? --\n")
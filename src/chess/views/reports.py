@@ -13,8 +13,9 @@ def actors_table(actors_list):
     """ Displays a table of the given actors.
 
     The display follow the the order of the list.
+    Each actor is displayed as soon as it is reached, a generator is consumed lazily.
 
-    :param actors_list: the list of actors.
+    :param actors_list: the list or the generator of actors.
     :return: None
     """
     for actor in actors_list:
@@ -30,13 +31,12 @@ def actors_table(actors_list):
 def report_actors_by_alpha(actors_list):
     """ Displays the given actors in a table sorted alphabetically.
 
-    The actors are sorted alphabetically and then displays in a table.
+    The actors are sorted alphabetically, in a single sort, and then displays in a table.
 
-    :param actors_list: the list of actors.
+    :param actors_list: the list or the generator of actors.
     :return: None
     """
-    sorted_actors = sorted(actors_list, key=attrgetter("first_name"))
-    sorted_actors = sorted(sorted_actors, key=attrgetter("last_name"))
+    sorted_actors = sorted(actors_list, key=attrgetter("last_name", "first_name"))
     actors_table(sorted_actors)
 
 
@@ -45,7 +45,7 @@ def report_actors_by_rank(actors_list):
 
     The actors are sorted by rank and then displays in a table.
 
-    :param actors_list: the list of actors.
+    :param actors_list: the list or the generator of actors.
     :return: None
     """
     sorted_actors = sorted(actors_list, key=attrgetter("rank"))
@@ -57,7 +57,8 @@ def report_tournaments_list(tournaments_list):
 
     The identifier, the name and the dates are displayed in that order.
 
-    :param tournaments_list: the list of tournaments.
+    :param tournaments_list: the list or the generator of tournaments or of tournament summaries,
+     each of them is displayed as soon as it is reached.
     :return: None
     """
     for tournament in tournaments_list:
@@ -77,9 +78,7 @@ def report_tournament_players(tournament, sort):
     :param sort: sorting type
     :return: None
     """
-    actors_list = []
-    for player in tournament.list_of_players:
-        actors_list.append(player.actor)
+    actors_list = (player.actor for player in tournament.list_of_players)
     if sort == "Alphabetical":
         report_actors_by_alpha(actors_list)
     elif sort == "By rank":
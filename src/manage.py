@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Maintenance commands of the database.
+
+From the src directory, type for instance:
+python manage.py migrate db.json
+"""
+
+
+import argparse
+import os
+
+from chess.settings import DB_PATH, SQLITE_PATH, SHARDS_DIR, ARCHIVE_AFTER_DAYS, ARCHIVE_COMPRESSION, \
+    PACKED_PATH
+from chess.models.compaction import compact_database
+from chess.models.database import create_handler
+from chess.models.migration import migrate_database
+from chess.models.sqlite_database import convert_tinydb_to_sqlite
+from chess.models.packed_archive import write_packed_archive
+from chess.models.sharded_database import ShardedDataBaseHandler, shard_database, CATALOG_NAME
+from chess.models.storage import AtomicJSONStorage
+
+
+def migrate(arguments):
+    """ Migrates the tournaments of the database to the normalized schema.
+
+    :param arguments: the parsed arguments of the command.
+    :return: None
+    """
+    migrated = migrate_database(arguments.path, arguments.output)
+    print(f"{migrated} tournois migrés")
+
+
+def to_sqlite(arguments):
+    """ Copies the TinyDB database into a SQLite database.
+
+    :param arguments: the parsed arguments of the command.
+    :return: None
+    """
+    nb_actors, nb_tournaments = convert_tinydb_to_sqlite(arguments.path, arguments.output)
+    print(f"{nb_actors} acteurs et {nb_tournaments} tournois convertis dans {arguments.output}")
+
+
+def to_shards(arguments):
+    """ Moves the finished tournaments of the TinyDB database into shards.
+
+    :param arguments: the parsed arguments of the command.
+    :return: None
+    """
+    nb_tournaments = shard_database(arguments.path, arguments.output)
+    print(f"{nb_tournaments} tournois déplacés dans {arguments.output}")
+
+
+def print_moved(moved, action):
+    """ Prints the tournaments moved by an archive or a restore, and their sizes before and after.
+
+    :param moved: list of tuples (identifier, former size, new size).
+    :param action: the past participle of the action, in French.
+    :return: None
+    """
+    for identifier, former_size, size in moved:
+        print(f"{identifier}: {former_size} -> {size} octets")
+    former_total = sum(former_size for identifier, former_size, size in moved)
+    total = sum(size for identifier, former_size, size in moved)
+    print(f"{len(moved)} tournois {action}: {former_total} -> {total} octets")
+
+
+def archive(arguments):
+    """ Compresses the shards of the old finished tournaments.
+
+    :param arguments: the parsed arguments of the command.
+    :return: None
+    """
+    handler = ShardedDataBaseHandler.open(arguments.path, directory=arguments.directory, write_behind=False)
+    print_moved(handler.archive_tournaments(arguments.days, arguments.compression), "archivés")
+
+
+def restore(arguments):
+    """ Decompresses the shards of archived tournaments.
+
+    :param arguments: the parsed arguments of the command.
+    :return: None
+    """
+    handler = ShardedDataBaseHandler.open(arguments.path, directory=arguments.directory, write_behind=False)
+    print_moved(handler.restore_tournaments(arguments.identifiers or None), "restaurés")
+
+
+def storage_report(arguments):
+    """ Prints the number and the size of the shards, for each compression, and the space saved.
+
+    :param arguments: the parsed arguments of the command.
+    :return: None
+    """
+    handler = ShardedDataBaseHandler.open(arguments.path, directory=arguments.directory, write_behind=False)
+    saved = 0
+    for suffix, (number, size, json_size) in sorted(handler.storage_report().items()):
+        print(f"{suffix}: {number} tournois, {size} octets ({json_size} octets sans compression)")
+        saved += json_size - size
+    print(f"{saved} octets gagnés par la compression")
+
+
+def compact(arguments):
+    """ Rewrites the TinyDB database compactly, then prints its size and load time before and after.
+
+    The tournaments of the catalog of the shards directory, if any, count as finished tournaments.
+
+    :param arguments: the parsed arguments of the command.
+    :return: None
+    """
+    catalog = AtomicJSONStorage(os.path.join(arguments.directory, CATALOG_NAME)).read() or {}
+    figures = compact_database(arguments.path, arguments.output, catalog.keys())
+    print(f"{figures['documents_dropped']} documents supprimés")
+    print(f"Taille : {figures['size_before']} -> {figures['size_after']} octets")
+    print(f"Chargement : {figures['load_time_before'] * 1e3:.2f} -> {figures['load_time_after'] * 1e3:.2f} ms")
+
+
+def pack(arguments):
+    """ Exports the actors and the finished tournaments of the database in a packed archive.
+
+    :param arguments: the parsed arguments of the command.
+    :return: None
+    """
+    nb_tournaments = write_packed_archive(create_handler(), arguments.output)
+    print(f"{nb_tournaments} tournois exportés dans {arguments.output}")
+
+
+def parse_arguments():
+    """ Defines the commands and their arguments.
+
+    :return: the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Maintenance de la base de données")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser("migrate",
+                                         help="Migrer les tournois vers le schéma normalisé")
+    migrate_parser.add_argument("path", nargs="?", default=DB_PATH)
+    migrate_parser.add_argument("--output", default=None,
+                                help="Fichier de destination, le fichier migré par défaut")
+    migrate_parser.set_defaults(function=migrate)
+
+    sqlite_parser = commands.add_parser("to-sqlite",
+                                        help="Convertir la base TinyDB en base SQLite")
+    sqlite_parser.add_argument("path", nargs="?", default=DB_PATH)
+    sqlite_parser.add_argument("--output", default=SQLITE_PATH,
+                               help="Fichier SQLite de destination")
+    sqlite_parser.set_defaults(function=to_sqlite)
+
+    shards_parser = commands.add_parser("to-shards",
+                                        help="Déplacer les tournois terminés dans un fichier par tournoi")
+    shards_parser.add_argument("path", nargs="?", default=DB_PATH)
+    shards_parser.add_argument("--output", default=SHARDS_DIR,
+                               help="Dossier des fichiers des tournois et du catalogue")
+    shards_parser.set_defaults(function=to_shards)
+
+    compact_parser = commands.add_parser("compact",
+                                         help="Réécrire la base de façon compacte")
+    compact_parser.add_argument("path", nargs="?", default=DB_PATH)
+    compact_parser.add_argument("--output", default=None,
+                                help="Fichier de destination, le fichier compacté par défaut")
+    compact_parser.add_argument("--directory", default=SHARDS_DIR,
+                                help="Dossier des fichiers des tournois et du catalogue")
+    compact_parser.set_defaults(function=compact)
+
+    archive_parser = commands.add_parser("archive",
+                                         help="Compresser les fichiers des anciens tournois terminés")
+    archive_parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS,
+                                help="Âge en jours à partir duquel un tournoi est archivé")
+    archive_parser.add_argument("--compression", choices=["xz", "gz", "zz"], default=ARCHIVE_COMPRESSION)
+    archive_parser.set_defaults(function=archive)
+
+    restore_parser = commands.add_parser("restore",
+                                         help="Décompresser les fichiers de tournois archivés")
+    restore_parser.add_argument("identifiers", nargs="*",
+                                help="Identifiants des tournois, tous par défaut")
+    restore_parser.set_defaults(function=restore)
+
+    report_parser = commands.add_parser("storage-report",
+                                        help="Afficher la place occupée par les tournois et gagnée par l'archivage")
+    report_parser.set_defaults(function=storage_report)
+
+    pack_parser = commands.add_parser("pack",
+                                      help="Exporter les tournois terminés dans une archive en lecture seule")
+    pack_parser.add_argument("--output", default=PACKED_PATH,
+                             help="Fichier de l'archive")
+    pack_parser.set_defaults(function=pack)
+
+    for command_parser in [archive_parser, restore_parser, report_parser]:
+        command_parser.add_argument("--path", default=DB_PATH, help="Fichier TinyDB")
+        command_parser.add_argument("--directory", default=SHARDS_DIR,
+                                    help="Dossier des fichiers des tournois et du catalogue")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    args.function(args)
@@ -0,0 +1,6 @@
+"""
+Tests of the tournament logic and of the data layer.
+
+They are launched from the src directory with:
+python -m unittest discover tests
+"""
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests that the compaction of a TinyDB file keeps its data and makes the file smaller.
+"""
+
+
+import copy
+import datetime
+import os
+import random
+import tempfile
+import unittest
+
+from chess.models.compaction import compact_database
+from chess.models.database import DataBaseHandler
+from chess.models.storage import AtomicJSONStorage
+from chess.models.tournament import Tournament
+
+from tests.fixtures import make_actors, play_tournament
+
+
+class TestCompaction(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "db.json")
+        self.compacted = os.path.join(self.directory.name, "compacted.json")
+        handler = DataBaseHandler(self.path, write_behind=False)
+        self.actors = make_actors(12)
+        handler.export_actors(self.actors)
+        self.tournaments = [play_tournament(self.actors[start:], seed=start, name=f"Open {start}")
+                            for start in (0, 4)]
+        for tournament in self.tournaments:
+            handler.export_finished_tournament(tournament)
+        self.interrupted = Tournament("Interrompu", "Lyon", "Bullet", "")
+        self.interrupted.start_date = datetime.date.today()
+        self.interrupted.define_players(self.actors[2:10])
+        self.interrupted.init_round(0)
+        handler.export_interrupted_tournament(self.interrupted)
+        handler.close()
+        self.bloat()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def bloat(self):
+        """ Leaves holes in the numbering, copies of the actors and of a tournament,
+        and a finished tournament still stored as interrupted, as sessions do over time. """
+        storage = AtomicJSONStorage(self.path)
+        tables = storage.read()
+        generator = random.Random(12)
+        self.nb_copies = 0
+        for table_name in ['actors', 'tournament']:
+            documents = list(tables[table_name].values())
+            copies = [copy.deepcopy(document) for document in generator.sample(documents, 2)]
+            self.nb_copies += len(copies)
+            tables[table_name] = {str(1000 + 7 * num): document for num, document in enumerate(documents + copies)}
+        tables['interrupted_tournament'][str(500)] = copy.deepcopy(next(iter(tables['tournament'].values())))
+        self.nb_copies += 1
+        storage.write(tables)
+
+    def open(self, path):
+        handler = DataBaseHandler(path, write_behind=False)
+        self.addCleanup(handler.close)
+        return handler
+
+    def assert_data_kept(self, handler):
+        for actor in self.actors:
+            self.assertEqual(handler.import_actor(actor.actor_id).actor_to_dict(), actor.actor_to_dict())
+        for tournament in self.tournaments:
+            self.assertEqual(handler.find_tournament_by_id(tournament.tournament_id).tournament_to_dict(),
+                             tournament.tournament_to_dict())
+        self.assertEqual([summary.tournament_id for summary in handler.list_interrupted_tournaments()],
+                         [self.interrupted.tournament_id])
+        self.assertEqual(handler.import_interrupted_tournament(self.interrupted.tournament_id).tournament_to_dict(),
+                         self.interrupted.tournament_to_dict())
+
+    def test_data_is_kept_in_a_smaller_file(self):
+        figures = compact_database(self.path, self.compacted)
+        self.assertEqual(figures['size_before'], os.path.getsize(self.path))
+        self.assertEqual(figures['size_after'], os.path.getsize(self.compacted))
+        self.assertLess(figures['size_after'], figures['size_before'])
+        self.assertEqual(figures['documents_dropped'], self.nb_copies)
+        self.assertGreaterEqual(figures['load_time_before'], 0)
+        self.assertGreaterEqual(figures['load_time_after'], 0)
+        for documents in AtomicJSONStorage(self.compacted).read().values():
+            self.assertEqual(list(documents), [str(doc_id) for doc_id in range(1, len(documents) + 1)])
+        self.assert_data_kept(self.open(self.compacted))
+
+    def test_compaction_in_place(self):
+        size_before = os.path.getsize(self.path)
+        figures = compact_database(self.path)
+        self.assertEqual(figures['size_before'], size_before)
+        self.assertEqual(figures['size_after'], os.path.getsize(self.path))
+        self.assertLess(figures['size_after'], size_before)
+        self.assert_data_kept(self.open(self.path))
+
+    def test_interrupted_tournament_finished_in_a_shard_is_dropped(self):
+        compact_database(self.path, self.compacted, [self.interrupted.tournament_id])
+        self.assertEqual(self.open(self.compacted).list_interrupted_tournaments(), [])
+
+    def test_compacted_file_is_stable(self):
+        compact_database(self.path, self.compacted)
+        figures = compact_database(self.compacted)
+        self.assertEqual(figures['documents_dropped'], 0)
+        self.assertEqual(figures['size_after'], figures['size_before'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests the packing of the previous opponents of the players.
+"""
+
+
+import random
+import unittest
+
+from chess.models.actors import Player
+from chess.models.database import IdentityMap, deserialize_player
+from chess.utils.conversion import pack_ids, unpack_ids, list_to_str_space
+
+from tests.fixtures import make_actors
+
+
+class TestPackIds(unittest.TestCase):
+
+    def test_round_trip(self):
+        generator = random.Random(0)
+        for size in (0, 1, 2, 10, 100, 1000):
+            for upper in (1, 16, 1000, 100000):
+                ids = {generator.randrange(upper) for _ in range(size)}
+                self.assertEqual(unpack_ids(pack_ids(ids)), ids)
+
+    def test_empty(self):
+        self.assertEqual(pack_ids(set()), "")
+        self.assertEqual(unpack_ids(""), set())
+
+    def test_shorter_form_is_chosen(self):
+        self.assertEqual(pack_ids(range(64)), hex((1 << 64) - 1))
+        self.assertEqual(pack_ids({3, 99999}), "3 99999")
+
+    def test_former_spaced_string(self):
+        self.assertEqual(unpack_ids(list_to_str_space([5, 0, 12, 5])), {0, 5, 12})
+
+    def test_player_round_trip(self):
+        actor = make_actors(1)[0]
+        actor.actor_id = "00000001"
+        identity_map = IdentityMap()
+        identity_map.actors[actor.actor_id] = actor
+        for opponents in (set(), {1}, {1, 2, 3, 4, 5, 6, 7}, {2, 4000}):
+            player = Player(actor, "00000001", 0)
+            player.opponents = set(opponents)
+            self.assertEqual(deserialize_player(player.player_to_dict(), identity_map).opponents, opponents)
+
+
+if __name__ == "__main__":
+    unittest.main()
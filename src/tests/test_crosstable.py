@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests that the tie-breaks computed with NumPy and with loops are equal,
+and that they order the final ranking.
+"""
+
+
+import random
+import unittest
+from unittest import mock
+
+from chess.models import crosstable
+from chess.models.crosstable import Crosstable, TIE_BREAKS, assign_final_places
+from chess.models.tournament import Tournament
+
+from tests.fixtures import make_actors
+
+
+def play(nb_players, nb_rounds, seed):
+    generator = random.Random(seed)
+    tournament = Tournament("Open", "Paris", "Bz", "")
+    tournament.define_players(make_actors(nb_players, seed))
+    for num_round in range(nb_rounds):
+        tournament.init_round(num_round)
+        winners = [generator.randint(0, 2) for _ in tournament.rounds[num_round].matches]
+        tournament.register_round_results(num_round, winners)
+    return tournament
+
+
+class TestTieBreaks(unittest.TestCase):
+
+    CASES = [(2, 1), (8, 4), (9, 4), (33, 7), (200, 11)]
+
+    def test_numpy_and_loops_give_the_same_values(self):
+        if crosstable.numpy is None:
+            self.skipTest("NumPy is not installed")
+        for seed, (nb_players, nb_rounds) in enumerate(self.CASES):
+            with self.subTest(nb_players=nb_players, nb_rounds=nb_rounds):
+                table = Crosstable(play(nb_players, nb_rounds, seed))
+                numpy_values = table.tie_breaks()
+                with mock.patch.object(crosstable, "numpy", None):
+                    python_values = table.tie_breaks()
+                self.assertEqual(set(numpy_values), set(TIE_BREAKS))
+                for name in TIE_BREAKS:
+                    self.assertEqual(numpy_values[name], python_values[name], name)
+
+    def test_final_places_follow_the_tie_breaks(self):
+        tournament = play(33, 7, 0)
+        players = tournament.list_of_players
+        tie_breaks = Crosstable(tournament).tie_breaks()
+        assign_final_places(players, tie_breaks)
+        self.assertEqual(sorted(player.place for player in players), list(range(1, len(players) + 1)))
+        by_place = sorted(range(len(players)), key=lambda num: players[num].place)
+        for better, worse in zip(by_place, by_place[1:]):
+            self.assertGreaterEqual(players[better].points, players[worse].points)
+            better_values = [tie_breaks[name][better] for name in TIE_BREAKS]
+            worse_values = [tie_breaks[name][worse] for name in TIE_BREAKS]
+            self.assertGreaterEqual(better_values, worse_values)
+            if better_values == worse_values:
+                self.assertLessEqual(players[better].rank, players[worse].rank)
+
+
+if __name__ == "__main__":
+    unittest.main()
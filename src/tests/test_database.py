@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests that a database file has a single handler, and a single flush interval,
+that the write-behind storage writes its changes on disk once the interval has passed,
+that the cache of the tournaments is bounded and invalidated by the writes,
+and that each backend gives back the actors and the tournaments it was given.
+"""
+
+
+import datetime
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from tinydb import TinyDB
+
+from chess.models.cache import TournamentCache, approximate_size
+from chess.models.database import DataBaseHandler
+from chess.models.sharded_database import ShardedDataBaseHandler
+from chess.models.sqlite_database import SQLiteDataBaseHandler
+from chess.models.storage import AtomicJSONStorage, shared_storage, release_storage
+from chess.models.tournament import Tournament, NB_ROUND
+
+from tests.fixtures import make_actors, play_tournament
+
+
+class TestHandlerPerFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "db.json")
+        self.handler = DataBaseHandler.open(self.path, write_behind=False)
+
+    def tearDown(self):
+        self.handler.close()
+        self.directory.cleanup()
+
+    def test_open_gives_the_handler_of_the_file(self):
+        self.assertIs(DataBaseHandler.open(self.path), self.handler)
+
+    def test_second_handler_is_refused(self):
+        with self.assertRaises(ValueError):
+            DataBaseHandler(self.path, write_behind=False)
+
+    def test_other_flush_interval_is_refused(self):
+        with self.assertRaises(ValueError):
+            DataBaseHandler.open(self.path, write_behind=True)
+        self.assertEqual(self.handler.storage.flush_interval, 0)
+
+    def test_closed_handler_is_replaced(self):
+        self.handler.export_actors(make_actors(3))
+        self.handler.close()
+        self.handler = DataBaseHandler.open(self.path, write_behind=True)
+        self.assertEqual(len(list(self.handler.iter_actors())), 3)
+
+
+class TestWriteBehind(unittest.TestCase):
+
+    FLUSH_INTERVAL = 0.05
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "db.json")
+        self.storage = shared_storage(self.path, flush_interval=self.FLUSH_INTERVAL)
+        self.database = TinyDB(self.path, storage=self.storage)
+
+    def tearDown(self):
+        release_storage(self.path)
+        self.directory.cleanup()
+
+    def on_disk(self):
+        return AtomicJSONStorage(self.path).read() or {}
+
+    def test_change_is_flushed_without_later_write(self):
+        self.database.table('actors').insert({'name': 'Carlsen'})
+        self.assertNotIn('actors', self.on_disk())
+        deadline = time.monotonic() + 20 * self.FLUSH_INTERVAL
+        while 'actors' not in self.on_disk() and time.monotonic() < deadline:
+            time.sleep(self.FLUSH_INTERVAL)
+        self.assertEqual(list(self.on_disk()['actors'].values()), [{'name': 'Carlsen'}])
+        self.assertIsNone(self.storage.modified_since)
+        self.assertIsNone(self.storage.timer)
+
+    def test_explicit_flush_cancels_the_timer(self):
+        self.database.table('actors').insert({'name': 'Carlsen'})
+        self.storage.flush()
+        self.assertIsNone(self.storage.timer)
+        self.assertEqual(list(self.on_disk()['actors'].values()), [{'name': 'Carlsen'}])
+
+
+class TestTournamentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.actors = make_actors(8)
+        self.tournaments = {name: play_tournament(self.actors, seed=num, name=name)
+                            for num, name in enumerate("abcd")}
+
+    def test_least_recently_used_is_dropped(self):
+        cache = TournamentCache(max_entries=2, max_bytes=0)
+        cache.put("a", self.tournaments["a"])
+        cache.put("b", self.tournaments["b"])
+        self.assertIs(cache.get("a"), self.tournaments["a"])
+        cache.put("c", self.tournaments["c"])
+        self.assertIsNone(cache.get("b"))
+        self.assertIs(cache.get("a"), self.tournaments["a"])
+        self.assertIs(cache.get("c"), self.tournaments["c"])
+        self.assertEqual(cache.stats()['entries'], 2)
+        self.assertEqual((cache.stats()['hits'], cache.stats()['misses']), (3, 1))
+
+    def test_size_in_bytes_is_bounded(self):
+        sizes = {name: approximate_size(tournament) for name, tournament in self.tournaments.items()}
+        cache = TournamentCache(max_entries=10, max_bytes=sizes["a"] + sizes["b"])
+        for name in "abc":
+            cache.put(name, self.tournaments[name])
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()['bytes'], sizes["b"] + sizes["c"])
+        cache.put("b", self.tournaments["b"])
+        self.assertEqual(cache.stats()['bytes'], sizes["b"] + sizes["c"])
+
+    def test_capacity_of_zero_caches_nothing(self):
+        cache = TournamentCache(max_entries=0)
+        cache.put("a", self.tournaments["a"])
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()['bytes'], 0)
+
+    def test_invalidate_and_clear(self):
+        cache = TournamentCache(max_entries=10, max_bytes=0)
+        for name, tournament in self.tournaments.items():
+            cache.put(name, tournament)
+        cache.invalidate("b")
+        self.assertIsNone(cache.get("b"))
+        cache.clear()
+        self.assertEqual(cache.stats()['entries'], 0)
+        self.assertEqual(cache.stats()['bytes'], 0)
+
+
+class TestHandlerCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "db.json")
+        self.handler = DataBaseHandler.open(self.path, write_behind=False)
+        self.actors = make_actors(8)
+        self.handler.export_actors(self.actors)
+        self.tournament = play_tournament(self.actors)
+        self.handler.export_finished_tournament(self.tournament)
+        self.identifier = self.tournament.tournament_id
+
+    def tearDown(self):
+        self.handler.close()
+        self.directory.cleanup()
+
+    def test_found_tournament_is_cached(self):
+        found = self.handler.find_tournament_by_id(self.identifier)
+        self.assertEqual(found.tournament_to_dict(), self.tournament.tournament_to_dict())
+        self.assertIs(self.handler.find_tournament_by_id(self.identifier), found)
+        self.assertEqual(self.handler.cache.stats()['hits'], 1)
+
+    def test_export_invalidates_the_tournament(self):
+        found = self.handler.find_tournament_by_id(self.identifier)
+        self.tournament.name = "Renamed"
+        self.handler.export_tournament(self.tournament)
+        again = self.handler.find_tournament_by_id(self.identifier)
+        self.assertIsNot(again, found)
+        self.assertEqual(again.name, "Renamed")
+
+    def test_change_by_someone_else_clears_the_cache(self):
+        found = self.handler.find_tournament_by_id(self.identifier)
+        storage = AtomicJSONStorage(self.path)
+        data = storage.read()
+        for document in data['tournament'].values():
+            document['name'] = "Changed on disk"
+        storage.write(data)
+        self.handler.refresh()
+        again = self.handler.find_tournament_by_id(self.identifier)
+        self.assertIsNot(again, found)
+        self.assertEqual(again.name, "Changed on disk")
+
+
+class RoundTrip:
+    """ Round trips through a backend, given by open_handler in the subclasses. """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.handler = self.open_handler()
+        self.actors = make_actors(12)
+        self.handler.export_actors(self.actors)
+
+    def tearDown(self):
+        self.handler.close()
+        self.directory.cleanup()
+
+    def reopen(self):
+        self.handler.close()
+        self.handler = self.open_handler()
+
+    def interrupted_tournament(self):
+        generator = random.Random(6)
+        tournament = Tournament("Interrompu", "Lyon", "Bullet", "Deux rondes")
+        tournament.start_date = datetime.date.today()
+        tournament.define_players(self.actors[4:12])
+        tournament.init_round(0)
+        tournament.register_round_results(0, [generator.randint(0, 2) for _ in tournament.rounds[0].matches])
+        tournament.init_round(1)
+        return tournament
+
+    def test_actors(self):
+        self.reopen()
+        for actor in self.actors:
+            self.assertEqual(self.handler.import_actor(actor.actor_id).actor_to_dict(), actor.actor_to_dict())
+        number, actors = self.handler.import_actors()
+        self.assertEqual(number, len(self.actors))
+        self.assertEqual(sorted(actor.actor_id for actor in actors), [actor.actor_id for actor in self.actors])
+
+    def test_interrupted_then_finished_tournament(self):
+        tournament = self.interrupted_tournament()
+        self.handler.export_interrupted_tournament(tournament)
+        self.reopen()
+        self.assertEqual([summary.tournament_id for summary in self.handler.list_interrupted_tournaments()],
+                         [tournament.tournament_id])
+        resumed = self.handler.import_interrupted_tournament(tournament.tournament_id)
+        self.assertEqual(resumed.tournament_to_dict(), tournament.tournament_to_dict())
+        finished = resumed
+        generator = random.Random(7)
+        finished.register_round_results(1, [generator.randint(0, 2) for _ in finished.rounds[1].matches])
+        for num_round in range(2, NB_ROUND):
+            finished.init_round(num_round)
+            winners = [generator.randint(0, 2) for _ in finished.rounds[num_round].matches]
+            finished.register_round_results(num_round, winners)
+        finished.end_tournament()
+        self.handler.export_finished_tournament(finished)
+        self.reopen()
+        self.assertEqual(self.handler.list_interrupted_tournaments(), [])
+        self.assertEqual(self.handler.find_tournament_by_id(finished.tournament_id).tournament_to_dict(),
+                         finished.tournament_to_dict())
+        self.assertEqual([summary.tournament_id for summary in self.handler.list_tournament_summaries()],
+                         [finished.tournament_id])
+
+    def test_finished_tournaments(self):
+        tournaments = [play_tournament(self.actors[start:], seed=start, name=f"Open {start}") for start in (0, 4)]
+        for tournament in tournaments:
+            self.handler.export_finished_tournament(tournament)
+        self.reopen()
+        for tournament in tournaments:
+            self.assertEqual(self.handler.find_tournament_by_id(tournament.tournament_id).tournament_to_dict(),
+                             tournament.tournament_to_dict())
+        self.assertEqual(sorted(found.tournament_id for found in self.handler.iter_tournaments()),
+                         [tournament.tournament_id for tournament in tournaments])
+        self.assertEqual(self.handler.find_tournament_by_id("99999999"), {})
+
+
+class TestTinyDBRoundTrip(RoundTrip, unittest.TestCase):
+
+    def open_handler(self):
+        return DataBaseHandler.open(os.path.join(self.directory.name, "db.json"), write_behind=True)
+
+
+class TestSQLiteRoundTrip(RoundTrip, unittest.TestCase):
+
+    def open_handler(self):
+        return SQLiteDataBaseHandler(os.path.join(self.directory.name, "db.sqlite3"))
+
+
+class TestShardedRoundTrip(RoundTrip, unittest.TestCase):
+
+    def open_handler(self):
+        return ShardedDataBaseHandler.open(os.path.join(self.directory.name, "db.json"),
+                                           directory=os.path.join(self.directory.name, "shards"),
+                                           write_behind=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
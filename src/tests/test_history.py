@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests that the reverse index of the tournaments played by each actor gives the history
+and the head-to-head of a full scan, after tournaments are saved again or deleted.
+"""
+
+
+import itertools
+import os
+import tempfile
+import unittest
+
+from chess.models.database import DataBaseHandler
+from chess.models.history import ActorHistoryIndex
+from chess.models.storage import AtomicJSONStorage
+
+from tests.fixtures import make_actors, play_tournament
+
+
+class TestActorHistoryIndex(unittest.TestCase):
+
+    def test_add_replace_and_remove(self):
+        index = ActorHistoryIndex([("1", [("a", "1"), ("b", "2")]), ("2", [("b", "1"), ("c", "2")])])
+        self.assertEqual(index.tournaments_of("b"), [("1", "2"), ("2", "1")])
+        self.assertEqual(index.common_tournaments("a", "b"), [("1", "1", "2")])
+        index.add("1", [("c", "1"), ("d", "2")])
+        self.assertEqual(index.tournaments_of("a"), [])
+        self.assertEqual(index.tournaments_of("b"), [("2", "1")])
+        self.assertEqual(index.common_tournaments("c", "d"), [("1", "1", "2")])
+        self.assertEqual(index.common_tournaments("b", "c"), [("2", "1", "2")])
+        index.remove("2")
+        index.remove("3")
+        self.assertEqual(index.tournaments_of("b"), [])
+        self.assertEqual(index.tournaments_of("c"), [("1", "1")])
+        self.assertEqual(index.tournaments_of("z"), [])
+
+
+class TestHandlerHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "db.json")
+        self.handler = DataBaseHandler.open(self.path, write_behind=False)
+        self.actors = make_actors(16)
+        self.handler.export_actors(self.actors)
+        self.tournaments = [play_tournament(self.actors[start:], seed=start, name=f"Open {start}")
+                            for start in (0, 2, 4, 8)]
+        for tournament in self.tournaments:
+            self.handler.export_finished_tournament(tournament)
+
+    def tearDown(self):
+        self.handler.close()
+        self.directory.cleanup()
+
+    def scan_history(self, actor_id):
+        return [(tournament.tournament_id, player.player_id)
+                for tournament in sorted(self.handler.import_tournaments(), key=lambda found: found.tournament_id)
+                for player in tournament.list_of_players if player.actor.actor_id == actor_id]
+
+    def scan_head_to_head(self, actor_id, other_actor_id):
+        return [(tournament.tournament_id, r0und.round_nb, match.player1.player_id, match.player2.player_id)
+                for tournament in sorted(self.handler.import_tournaments(), key=lambda found: found.tournament_id)
+                for r0und in tournament.rounds for match in r0und.matches.values()
+                if {match.player1.actor.actor_id, match.player2.actor.actor_id} == {actor_id, other_actor_id}]
+
+    def tournaments_of(self, actor):
+        return [tournament.tournament_id for tournament, player in self.handler.player_history(actor.actor_id)]
+
+    def assert_as_scan(self):
+        for actor in self.actors:
+            self.assertEqual([(tournament.tournament_id, player.player_id)
+                              for tournament, player in self.handler.player_history(actor.actor_id)],
+                             self.scan_history(actor.actor_id))
+        for actor, other in itertools.combinations(self.actors[:10], 2):
+            matches = self.handler.head_to_head(actor.actor_id, other.actor_id)
+            self.assertEqual([(match.player1.player_id, match.player2.player_id) for match in matches],
+                             [entry[2:] for entry in self.scan_head_to_head(actor.actor_id, other.actor_id)])
+
+    def test_history_as_scan(self):
+        self.assert_as_scan()
+        self.assertEqual(len(self.handler.player_history(self.actors[4].actor_id)), 3)
+
+    def test_tournament_saved_again_with_other_players(self):
+        replaced = self.tournaments[0]
+        tournament = play_tournament(self.actors[8:], seed=9, name=replaced.name)
+        tournament.tournament_id = replaced.tournament_id
+        self.handler.export_tournament(tournament)
+        self.assertNotIn(replaced.tournament_id, self.tournaments_of(self.actors[0]))
+        self.assertIn(replaced.tournament_id, self.tournaments_of(self.actors[12]))
+        self.assert_as_scan()
+
+    def test_index_is_rebuilt_after_a_deletion_on_disk(self):
+        deleted = self.tournaments[1].tournament_id
+        storage = AtomicJSONStorage(self.path)
+        data = storage.read()
+        data['tournament'] = {doc_id: document for doc_id, document in data['tournament'].items()
+                              if document['tournament_id'] != deleted}
+        storage.write(data)
+        self.handler.refresh()
+        self.assertEqual(self.tournaments_of(self.actors[2]), [self.tournaments[0].tournament_id])
+        self.assert_as_scan()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests the rebuilding of a tournament in progress from its snapshot and its journal.
+"""
+
+
+import json
+import tempfile
+import unittest
+
+from chess.models.journal import TournamentJournal, load_tournament, journaled_summaries
+from chess.models.tournament import Tournament
+from chess.settings import JOURNAL_SNAPSHOT_EVERY
+
+from tests.fixtures import make_actors
+
+
+class TestCrashRecovery(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.tournament = Tournament("Open", "Paris", "Bz", "")
+        self.tournament.define_players(make_actors(8))
+        self.journal = TournamentJournal.of(self.tournament, self.directory.name)
+
+    def tearDown(self):
+        for journal in list(TournamentJournal.journals.values()):
+            journal.handle.close()
+        TournamentJournal.journals.clear()
+        self.directory.cleanup()
+
+    def play_round(self, num_round, winners):
+        self.tournament.init_round(num_round)
+        self.journal.round_started(self.tournament.rounds[num_round])
+        for match_nb, winner in enumerate(winners):
+            self.journal.result_declared(num_round, match_nb, winner)
+
+    def crash_and_reload(self):
+        self.journal.handle.close()
+        TournamentJournal.journals.clear()
+        return load_tournament(self.tournament.tournament_id, self.directory.name)
+
+    def test_results_declared_before_a_snapshot_are_kept(self):
+        self.assertEqual(JOURNAL_SNAPSHOT_EVERY, 20)
+        for num_round in range(3):
+            self.play_round(num_round, [1, 2, 0, 1])
+            self.tournament.register_round_results(num_round, [1, 2, 0, 1])
+            self.journal.round_finished(self.tournament.rounds[num_round])
+        # Records 19 to 21: the round 4 starts, the result of its first match is the record 20,
+        # which writes the snapshot, then the result of its second match.
+        self.play_round(3, [2, 0])
+        self.assertEqual(self.journal.seq, 21)
+        rebuilt = self.crash_and_reload()
+        matches = rebuilt.rounds[3].matches
+        self.assertEqual([(matches[num].finished, matches[num].winner) for num in range(4)],
+                         [(True, 2), (True, 0), (False, None), (False, None)])
+        self.assertEqual([player.points for player in rebuilt.list_of_players],
+                         [player.points for player in self.tournament.list_of_players])
+
+    def test_finished_round_is_replayed(self):
+        self.play_round(0, [1, 0, 2, 1])
+        self.tournament.register_round_results(0, [1, 0, 2, 1])
+        self.journal.round_finished(self.tournament.rounds[0])
+        rebuilt = self.crash_and_reload()
+        self.assertTrue(rebuilt.rounds[0].finished)
+        self.assertEqual([player.points for player in rebuilt.list_of_players],
+                         [player.points for player in self.tournament.list_of_players])
+
+    def test_summaries_are_read_from_the_first_line(self):
+        self.play_round(0, [1, 0, 2, 1])
+        self.journal.snapshot()
+        with open(self.journal.snapshot_path, encoding="utf-8") as handle:
+            self.assertEqual(list(json.loads(handle.readline())), ["summary"])
+        summaries = journaled_summaries(self.directory.name)
+        self.assertEqual([(summary.tournament_id, summary.name, summary.location) for summary in summaries],
+                         [(self.tournament.tournament_id, "Open", "Paris")])
+        self.assertEqual(len(self.crash_and_reload().rounds), 1)
+
+    def test_snapshot_without_summary_line_is_read(self):
+        self.play_round(0, [1, 0, 2, 1])
+        with open(self.journal.snapshot_path, "w", encoding="utf-8") as handle:
+            json.dump({"journal_seq": self.journal.seq, "tournament": self.tournament.tournament_to_dict()}, handle)
+        self.assertEqual([summary.name for summary in journaled_summaries(self.directory.name)], ["Open"])
+        self.assertEqual(len(self.crash_and_reload().rounds[0].matches), 4)
+
+    def test_records_after_a_cut_line_are_replayed(self):
+        self.play_round(0, [1, 0])
+        self.journal.handle.write('{"seq": 6, "event": "res')
+        self.journal.handle.flush()
+        rebuilt = self.crash_and_reload()
+        self.journal = TournamentJournal.journals[rebuilt.tournament_id]
+        self.tournament = rebuilt
+        for match_nb, winner in [(2, 2), (3, 1)]:
+            self.journal.result_declared(0, match_nb, winner)
+        rebuilt = self.crash_and_reload()
+        matches = rebuilt.rounds[0].matches
+        self.assertEqual([matches[num].winner for num in range(4)], [1, 0, 2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
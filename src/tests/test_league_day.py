@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests the league day: the next rounds of several tournaments paired at once are journaled.
+"""
+
+
+import random
+import tempfile
+import unittest
+
+from chess.controllers.navigation import LeagueDay
+from chess.models.journal import TournamentJournal, load_tournament
+from chess.models.tournament import Tournament
+
+from tests.fixtures import make_actors
+
+
+def describe(r0und):
+    return [(match.player1.player_id, match.player2.player_id) for match in r0und.matches.values()], \
+        None if r0und.bye is None else r0und.bye.player_id
+
+
+class TestLeagueDay(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        generator = random.Random(0)
+        self.tournaments = []
+        for num in range(3):
+            tournament = Tournament(f"Section {num + 1}", "Paris", "Bz", "", f"{num + 1:08d}")
+            tournament.define_players(make_actors(8 + num, seed=num))
+            journal = TournamentJournal.of(tournament, self.directory.name)
+            tournament.init_round(0)
+            journal.round_started(tournament.rounds[0])
+            for match_nb in range(len(tournament.rounds[0].matches)):
+                journal.result_declared(0, match_nb, generator.randint(0, 2))
+            r0und = tournament.rounds[0]
+            tournament.register_round_results(0, [r0und.matches[num].winner for num in sorted(r0und.matches)])
+            journal.round_finished(r0und)
+            self.tournaments.append(tournament)
+
+    def tearDown(self):
+        for journal in list(TournamentJournal.journals.values()):
+            journal.handle.close()
+        TournamentJournal.journals.clear()
+        self.directory.cleanup()
+
+    def test_rounds_started_are_replayed_after_a_crash(self):
+        rounds = LeagueDay.start_next_rounds(self.tournaments)
+        self.assertEqual([r0und.round_nb for r0und in rounds], [1, 1, 1])
+        expected = [describe(r0und) for r0und in rounds]
+        for journal in list(TournamentJournal.journals.values()):
+            journal.handle.close()
+        TournamentJournal.journals.clear()
+        reloaded = [load_tournament(tournament.tournament_id, self.directory.name) for tournament in self.tournaments]
+        self.assertEqual([len(tournament.rounds) for tournament in reloaded], [2, 2, 2])
+        self.assertEqual([describe(tournament.rounds[1]) for tournament in reloaded], expected)
+
+    def test_rounds_are_those_of_init_round(self):
+        rounds = LeagueDay.start_next_rounds(self.tournaments)
+        for tournament, r0und in zip(self.tournaments, rounds):
+            replayed = Tournament(tournament.name, "Paris", "Bz", "", tournament.tournament_id)
+            replayed.define_players(make_actors(len(tournament.list_of_players),
+                                                seed=int(tournament.tournament_id) - 1))
+            replayed.init_round(0)
+            replayed.register_round_results(0, [match.winner for match in tournament.rounds[0].matches.values()])
+            replayed.init_round(1)
+            self.assertEqual(describe(replayed.rounds[1]), describe(r0und))
+
+
+if __name__ == "__main__":
+    unittest.main()
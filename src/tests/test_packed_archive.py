@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests the reading of the actors from the packed archive, and that it can not be written.
+"""
+
+
+import os
+import tempfile
+import unittest
+
+from chess.models.database import DataBaseHandler
+from chess.models.packed_archive import PackedDataBaseHandler, ReadOnlyArchiveError, write_packed_archive
+
+from tests.fixtures import make_actors, play_tournament
+
+
+class TestPackedArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        handler = DataBaseHandler(os.path.join(self.directory.name, "db.json"), write_behind=False)
+        self.actors = make_actors(20)
+        handler.export_actors(self.actors)
+        handler.export_finished_tournament(play_tournament(self.actors))
+        path = os.path.join(self.directory.name, "archive.pack")
+        write_packed_archive(handler, path)
+        handler.close()
+        self.archive = PackedDataBaseHandler(path)
+
+    def tearDown(self):
+        self.archive.close()
+        self.directory.cleanup()
+
+    def test_actors_are_read_at_their_offset(self):
+        for actor in self.actors:
+            self.assertEqual(self.archive.import_actor(actor.actor_id).actor_to_dict(), actor.actor_to_dict())
+        self.assertEqual(self.archive.import_actor("99999999"), {})
+
+    def test_archive_without_offsets_is_scanned(self):
+        del self.archive.index['actor_positions']
+        actor = self.actors[7]
+        self.assertEqual(self.archive.import_actor(actor.actor_id).actor_to_dict(), actor.actor_to_dict())
+
+    def test_all_actors_are_listed(self):
+        self.assertEqual([actor.actor_id for actor in self.archive.iter_actors()],
+                         [actor.actor_id for actor in self.actors])
+
+    def test_writes_are_refused(self):
+        with self.assertRaises(ReadOnlyArchiveError):
+            self.archive.export_actors(self.actors)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests the Swiss pairing of the rounds: byes, rematches, first round and all-draws fields.
+"""
+
+
+import random
+import unittest
+
+from chess.models.batch import init_next_rounds
+from chess.models.tournament import Tournament, NB_ROUND
+
+from tests.fixtures import make_actors
+
+
+def rematch_free_pairing_exists(players):
+    """ Tells whether the players can all be paired without rematch, by exhaustive search.
+
+    :param players: the players to pair, in an even number.
+    :return: True if such a pairing exists.
+    """
+    if not players:
+        return True
+    first, others = players[0], players[1:]
+    return any(rematch_free_pairing_exists(others[:num] + others[num + 1:])
+               for num, other in enumerate(others) if not first.has_played(other))
+
+
+class TestPairing(unittest.TestCase):
+
+    def play(self, nb_players, nb_rounds, seed=0, winners=None, check=None):
+        """ Plays rounds with random results, or the results given by winners, checking each round.
+
+        :return: the tournament.
+        """
+        generator = random.Random(seed)
+        tournament = Tournament("Open", "Paris", "Bz", "")
+        tournament.define_players(make_actors(nb_players, seed=seed))
+        for num_round in range(nb_rounds):
+            tournament.init_round(num_round)
+            r0und = tournament.rounds[num_round]
+            if check is not None:
+                check(tournament, r0und)
+            results = [generator.randint(0, 2) if winners is None else winners
+                       for _ in r0und.matches]
+            tournament.register_round_results(num_round, results)
+        return tournament
+
+    def assert_everybody_paired_once(self, tournament, r0und):
+        paired = [player.player_id for match in r0und.matches.values()
+                  for player in (match.player1, match.player2)]
+        if r0und.bye is not None:
+            paired.append(r0und.bye.player_id)
+        self.assertEqual(sorted(paired), sorted(player.player_id for player in tournament.list_of_players))
+
+    def assert_no_rematch(self, tournament, r0und):
+        for match in r0und.matches.values():
+            self.assertFalse(match.player1.has_played(match.player2))
+
+    def test_first_round_pairs_top_half_against_bottom_half(self):
+        for nb_players in (8, 9, 16):
+            tournament = Tournament("Open", "Paris", "Bz", "")
+            tournament.define_players(make_actors(nb_players))
+            tournament.init_round(0)
+            r0und = tournament.rounds[0]
+            standings = sorted(tournament.list_of_players, key=lambda player: player.place)
+            if nb_players % 2:
+                self.assertIs(r0und.bye, standings.pop())
+            half = len(standings) // 2
+            self.assertEqual([(match.player1, match.player2) for match in r0und.matches.values()],
+                             list(zip(standings[:half], standings[half:])))
+
+    def test_each_player_has_at_most_one_bye(self):
+        for nb_players in (5, 7, 9, 11):
+            for seed in range(5):
+                tournament = self.play(nb_players, nb_players, seed, check=self.assert_everybody_paired_once)
+                byes = tournament.byes()
+                self.assertEqual(len(byes), nb_players)
+                self.assertEqual(len(set(byes)), len(byes))
+
+    def test_no_rematch_in_a_tournament(self):
+        for nb_players in (8, 9, 16, 33, 64):
+            for seed in range(5):
+                self.play(nb_players, NB_ROUND, seed, check=self.assert_no_rematch)
+
+    def test_no_avoidable_rematch_over_n_minus_1_rounds(self):
+        """ Round by round, a rematch-free schedule of n-1 rounds is not always reachable:
+        a rematch is only allowed in a round where no pairing avoids it. """
+        def check(tournament, r0und):
+            self.assert_everybody_paired_once(tournament, r0und)
+            if any(match.player1.has_played(match.player2) for match in r0und.matches.values()):
+                players = [player for player in tournament.list_of_players if player is not r0und.bye]
+                self.assertFalse(rematch_free_pairing_exists(players))
+        for nb_players in (6, 8, 10, 12):
+            for seed in range(10):
+                self.play(nb_players, nb_players - 1, seed, check=check)
+
+    def test_all_draws(self):
+        def check(tournament, r0und):
+            self.assert_everybody_paired_once(tournament, r0und)
+            self.assert_no_rematch(tournament, r0und)
+        tournament = self.play(101, 10, winners=0, check=check)
+        self.assertTrue(all(player.points == 5 or player.player_id in tournament.byes()
+                            for player in tournament.list_of_players))
+        self.assertEqual(len(set(tournament.byes())), 10)
+
+    def test_batch_pairing_in_processes_gives_the_rounds_of_init_round(self):
+        tournaments = [self.play(nb_players, 3, seed) for seed, nb_players in enumerate((8, 9, 33))]
+        expected = []
+        for tournament in tournaments:
+            tournament.init_round(3)
+            r0und = tournament.rounds.pop()
+            expected.append(([(match.player1, match.player2) for match in r0und.matches.values()], r0und.bye))
+        rounds = init_next_rounds(tournaments, max_workers=2)
+        self.assertEqual([([(match.player1, match.player2) for match in r0und.matches.values()], r0und.bye)
+                          for r0und in rounds], expected)
+        self.assertEqual([len(tournament.rounds) for tournament in tournaments], [4, 4, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests that the queries of the tournaments by the secondary indexes give the tournaments
+of a full scan, after headers are added, replaced and removed.
+"""
+
+
+import datetime
+import os
+import random
+import tempfile
+import unittest
+
+from chess.models.database import DataBaseHandler
+from chess.models.query import TournamentQueryIndex
+from chess.models.storage import AtomicJSONStorage
+
+from tests.fixtures import make_actors, play_tournament
+
+
+LOCATIONS = ["Paris", "Lyon", "Nantes"]
+TIMER_TYPES = ["Bz", "Bullet", "Coup rapide"]
+NAMES = ["Open", "open de Lyon", "Opération", "Blitz", "Championnat", "Coupe"]
+
+
+def scan(headers, start_after=None, start_before=None, end_after=None, end_before=None,
+         location=None, timer_type=None, name_prefix=None):
+    """ The identifiers of the matching tournaments, found by checking every header. """
+    def in_range(date, low, high):
+        if low is None and high is None:
+            return True
+        return date != 'None' and (low is None or date >= str(low)) and (high is None or date <= str(high))
+
+    return sorted(header['tournament_id'] for header in headers
+                  if (location is None or header['location'] == location)
+                  and (timer_type is None or header['timer_type'] == timer_type)
+                  and in_range(header['start_date'], start_after, start_before)
+                  and in_range(header['end_date'], end_after, end_before)
+                  and (not name_prefix or header['name'].casefold().startswith(name_prefix.casefold())))
+
+
+class TestQueryIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(18)
+
+    def date(self):
+        if self.random.random() < 0.1:
+            return None
+        return datetime.date(2021, 1, 1) + datetime.timedelta(days=self.random.randint(0, 60))
+
+    def header(self, identifier):
+        start, end = self.date(), self.date()
+        return {'tournament_id': identifier,
+                'name': self.random.choice(NAMES) + self.random.choice(["", " 2021", " B"]),
+                'location': self.random.choice(LOCATIONS),
+                'timer_type': self.random.choice(TIMER_TYPES),
+                'description': "",
+                'start_date': str(start),
+                'end_date': str(end)}
+
+    def criteria(self):
+        criteria = {}
+        for name in ['start_after', 'start_before', 'end_after', 'end_before']:
+            if self.random.random() < 0.3:
+                criteria[name] = self.date() or datetime.date(2021, 2, 1)
+        if self.random.random() < 0.3:
+            criteria['location'] = self.random.choice(LOCATIONS + ["Brest"])
+        if self.random.random() < 0.3:
+            criteria['timer_type'] = self.random.choice(TIMER_TYPES)
+        if self.random.random() < 0.3:
+            criteria['name_prefix'] = self.random.choice(["op", "OPEN", "Opé", "c", "z", ""])
+        return criteria
+
+    def assert_as_scan(self, index, headers):
+        for _ in range(50):
+            criteria = self.criteria()
+            with self.subTest(criteria=criteria):
+                self.assertEqual(index.query(**criteria), scan(headers.values(), **criteria))
+
+    def test_queries_after_insert_update_and_delete(self):
+        headers = {f"{num:08d}": self.header(f"{num:08d}") for num in range(200)}
+        index = TournamentQueryIndex(headers.values())
+        self.assert_as_scan(index, headers)
+        for identifier in self.random.sample(sorted(headers), 60):
+            headers[identifier] = self.header(identifier)
+            index.add(headers[identifier])
+        self.assert_as_scan(index, headers)
+        for identifier in self.random.sample(sorted(headers), 80):
+            del headers[identifier]
+            index.remove(identifier)
+        index.remove("99999999")
+        self.assert_as_scan(index, headers)
+        self.assertEqual(len(index.start_dates), sum(header['start_date'] != 'None' for header in headers.values()))
+        self.assertEqual(len(index.names), len(headers))
+
+    def test_equality_lookups(self):
+        headers = {f"{num:08d}": self.header(f"{num:08d}") for num in range(100)}
+        index = TournamentQueryIndex(headers.values())
+        for header in headers.values():
+            for criteria in [{'start_after': header['start_date'], 'start_before': header['start_date']},
+                             {'end_after': header['end_date'], 'end_before': header['end_date']},
+                             {'name_prefix': header['name']},
+                             {'location': header['location'], 'timer_type': header['timer_type']}]:
+                if 'None' in criteria.values():
+                    continue
+                result = index.query(**criteria)
+                self.assertIn(header['tournament_id'], result)
+                self.assertEqual(result, scan(headers.values(), **criteria))
+
+
+class TestHandlerQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "db.json")
+        self.handler = DataBaseHandler.open(self.path, write_behind=False)
+        actors = make_actors(8)
+        self.handler.export_actors(actors)
+        self.tournaments = [play_tournament(actors, seed=num, name=name)
+                            for num, name in enumerate(["Open", "Blitz", "Open B"])]
+        for tournament in self.tournaments:
+            self.handler.export_finished_tournament(tournament)
+
+    def tearDown(self):
+        self.handler.close()
+        self.directory.cleanup()
+
+    def identifiers(self, **criteria):
+        return [summary.tournament_id for summary in self.handler.query_tournaments(**criteria)]
+
+    def test_update_moves_the_tournament(self):
+        first, second, third = [tournament.tournament_id for tournament in self.tournaments]
+        self.assertEqual(self.identifiers(name_prefix="open"), [first, third])
+        self.tournaments[1].name = "Open de Lyon"
+        self.tournaments[1].location = "Lyon"
+        self.handler.export_tournament(self.tournaments[1])
+        self.assertEqual(self.identifiers(name_prefix="open"), [first, second, third])
+        self.assertEqual(self.identifiers(location="Lyon"), [second])
+        self.assertEqual(self.identifiers(location="Paris"), [first, third])
+
+    def test_index_is_rebuilt_after_a_deletion_on_disk(self):
+        storage = AtomicJSONStorage(self.path)
+        data = storage.read()
+        deleted = self.tournaments[0].tournament_id
+        data['tournament'] = {doc_id: document for doc_id, document in data['tournament'].items()
+                              if document['tournament_id'] != deleted}
+        storage.write(data)
+        self.handler.refresh()
+        self.assertEqual(self.identifiers(name_prefix="open"), [self.tournaments[2].tournament_id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests the sharded database: the catalog of the shards, the archiving of the shards
+with each compression, and the move of the tournaments of a TinyDB file into shards.
+"""
+
+
+import os
+import tempfile
+import unittest
+
+from chess.models.database import DataBaseHandler
+from chess.models.sharded_database import ShardedDataBaseHandler, shard_database, CATALOG_NAME, SHARD_SUFFIX
+from chess.models.storage import AtomicJSONStorage, CompressedJSONStorage, json_storage
+
+from tests.fixtures import make_actors, play_tournament
+
+
+CODECS = ["xz", "gz", "zz"]
+DATA = {'tournament': {'1': {'name': "Open d'été", 'points': [0.5, 1, 0], 'bye': None, 'finished': True}}}
+
+
+class TestCompressedStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_with_each_codec(self):
+        for codec in CODECS:
+            with self.subTest(codec=codec):
+                path = os.path.join(self.directory.name, "shard.json." + codec)
+                storage = json_storage(path)
+                self.assertIsInstance(storage, CompressedJSONStorage)
+                storage.write(DATA)
+                self.assertEqual(json_storage(path).read(), DATA)
+                with open(path, "rb") as handle:
+                    self.assertNotIn(b"Open", handle.read())
+                self.assertEqual(storage.decompressed_size(), self.json_size())
+
+    def json_size(self):
+        """ The size of DATA in an uncompressed shard. """
+        path = os.path.join(self.directory.name, "shard.json")
+        storage = json_storage(path)
+        self.assertNotIsInstance(storage, CompressedJSONStorage)
+        storage.write(DATA)
+        return os.path.getsize(path)
+
+
+class TestShardedDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "db.json")
+        self.shards = os.path.join(self.directory.name, "shards")
+        self.handler = ShardedDataBaseHandler.open(self.path, directory=self.shards, write_behind=False)
+        self.actors = make_actors(12)
+        self.handler.export_actors(self.actors)
+        self.tournaments = [play_tournament(self.actors[start:], seed=start, name=f"Open {start}")
+                            for start in (0, 2, 4)]
+        for tournament in self.tournaments:
+            self.handler.export_finished_tournament(tournament)
+
+    def tearDown(self):
+        self.handler.close()
+        self.directory.cleanup()
+
+    def reopen(self):
+        self.handler.close()
+        self.handler = ShardedDataBaseHandler.open(self.path, directory=self.shards, write_behind=False)
+
+    def assert_tournaments_read_back(self):
+        for tournament in self.tournaments:
+            self.assertEqual(self.handler.find_tournament_by_id(tournament.tournament_id).tournament_to_dict(),
+                             tournament.tournament_to_dict())
+
+    def test_catalog_lists_the_shards(self):
+        catalog = AtomicJSONStorage(os.path.join(self.shards, CATALOG_NAME)).read()
+        identifiers = [tournament.tournament_id for tournament in self.tournaments]
+        self.assertEqual(sorted(catalog), identifiers)
+        for identifier, entry in catalog.items():
+            self.assertEqual(entry['shard'], identifier + SHARD_SUFFIX)
+            self.assertTrue(os.path.exists(os.path.join(self.shards, entry['shard'])))
+        self.assertEqual(sorted(os.listdir(self.shards)),
+                         sorted([CATALOG_NAME] + [identifier + SHARD_SUFFIX for identifier in identifiers]))
+        self.assertEqual(sorted(summary.tournament_id for summary in self.handler.list_tournament_summaries()),
+                         identifiers)
+        self.assertNotIn('tournament', AtomicJSONStorage(self.path).read())
+
+    def test_archive_and_restore_with_each_codec(self):
+        for codec in CODECS:
+            with self.subTest(codec=codec):
+                archived = self.handler.archive_tournaments(days=0, compression=codec)
+                self.assertEqual(len(archived), len(self.tournaments))
+                for identifier, former_size, new_size in archived:
+                    self.assertLess(new_size, former_size)
+                self.reopen()
+                self.assertEqual(sorted(os.listdir(self.shards)),
+                                 sorted([CATALOG_NAME] + [tournament.tournament_id + SHARD_SUFFIX + "." + codec
+                                                          for tournament in self.tournaments]))
+                self.assert_tournaments_read_back()
+                report = self.handler.storage_report()
+                self.assertEqual(list(report), ["." + codec])
+                number, size, json_size = report["." + codec]
+                self.assertEqual(number, len(self.tournaments))
+                self.assertLess(size, json_size)
+                self.assertEqual(len(self.handler.restore_tournaments()), len(self.tournaments))
+                self.reopen()
+                self.assertEqual(list(self.handler.storage_report()), [SHARD_SUFFIX])
+                self.assert_tournaments_read_back()
+
+    def test_archived_tournament_is_saved_in_its_archive(self):
+        self.handler.archive_tournaments(days=0, compression="gz")
+        tournament = self.tournaments[1]
+        tournament.name = "Open renommé"
+        self.handler.export_tournament(tournament)
+        self.reopen()
+        self.assert_tournaments_read_back()
+        self.assertEqual(list(self.handler.storage_report()), [".gz"])
+
+    def test_unknown_codec_is_refused(self):
+        with self.assertRaises(ValueError):
+            self.handler.archive_tournaments(days=0, compression="bz2")
+
+
+class TestShardDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "db.json")
+        self.shards = os.path.join(self.directory.name, "shards")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_tournaments_are_moved_into_shards(self):
+        handler = DataBaseHandler(self.path, write_behind=False)
+        actors = make_actors(10)
+        handler.export_actors(actors)
+        tournaments = [play_tournament(actors[start:], seed=start) for start in (0, 2)]
+        for tournament in tournaments:
+            handler.export_finished_tournament(tournament)
+        handler.close()
+        self.assertEqual(shard_database(self.path, self.shards), 2)
+        handler = ShardedDataBaseHandler.open(self.path, directory=self.shards, write_behind=False)
+        try:
+            self.assertNotIn('tournament', AtomicJSONStorage(self.path).read())
+            for tournament in tournaments:
+                self.assertEqual(handler.find_tournament_by_id(tournament.tournament_id).tournament_to_dict(),
+                                 tournament.tournament_to_dict())
+            self.assertEqual(len(handler.import_actors()[1]), len(actors))
+        finally:
+            handler.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
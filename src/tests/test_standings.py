@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests that the incremental standings give the order of a full sort, after each result and each round.
+"""
+
+
+import random
+import unittest
+from types import SimpleNamespace
+
+from chess.models import standings
+from chess.models.standings import Standings, standing_key
+
+
+class TestStandings(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(23)
+
+    def make_players(self, nb_players):
+        ranks = self.random.sample(range(1, 3 * nb_players), nb_players)
+        return [SimpleNamespace(player_id=player_id, rank=rank, points=0.0, place=None)
+                for player_id, rank in enumerate(ranks)]
+
+    def assert_sorted(self, players, ranking):
+        expected = sorted(players, key=standing_key)
+        ranking.assign_places()
+        self.assertEqual([player.player_id for player in ranking],
+                         [player.player_id for player in expected])
+        for place, player in enumerate(expected, 1):
+            self.assertEqual(player.place, place)
+            self.assertEqual(ranking.place_of(player), place)
+
+    def play_rounds(self, nb_players, nb_rounds, live):
+        players = self.make_players(nb_players)
+        ranking = Standings(players)
+        for _ in range(nb_rounds):
+            for player in players:
+                ranking.add_points(player, self.random.choice([0, 0.5, 1]))
+                if live:
+                    self.assert_sorted(players, ranking)
+            self.assert_sorted(players, ranking)
+        self.assertEqual(len(ranking), nb_players)
+
+    def test_rounds_with_small_blocks(self):
+        block_size = standings.BLOCK_SIZE
+        standings.BLOCK_SIZE = 2
+        try:
+            for nb_players in (1, 2, 5, 17, 40):
+                self.play_rounds(nb_players, 7, live=False)
+            self.play_rounds(23, 3, live=True)
+        finally:
+            standings.BLOCK_SIZE = block_size
+
+    def test_rounds_of_a_large_tournament(self):
+        self.play_rounds(500, 9, live=False)
+
+    def test_live_results(self):
+        self.play_rounds(150, 2, live=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
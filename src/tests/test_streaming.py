@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+
+"""
+Tests that the incremental reader of TinyDB files gives the values of json.load,
+with chunks small enough to cut every string, escape sequence and number.
+"""
+
+
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from chess.models.streaming import JSONStreamReader, iter_tables, iter_documents
+
+
+CHUNK_SIZES = range(1, 8)
+CHARACTERS = 'ab Zé"\\/\n\t{}[]:,€\U0001F600\x01'
+
+
+class Fuzzer:
+    """ Random JSON values, with the strings, numbers and nestings which are hard to cut. """
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+
+    def string(self):
+        return "".join(self.random.choice(CHARACTERS) for _ in range(self.random.randint(0, 12)))
+
+    def number(self):
+        return self.random.choice([
+            self.random.randint(-10 ** 12, 10 ** 12),
+            self.random.uniform(-1e6, 1e6),
+            self.random.uniform(-1, 1) * 10 ** self.random.randint(-30, 30),
+            0, -0.5, 1e-7,
+        ])
+
+    def value(self, depth=0):
+        kind = self.random.randint(0, 7 if depth < 3 else 4)
+        if kind == 0:
+            return self.string()
+        if kind in (1, 2):
+            return self.number()
+        if kind == 3:
+            return self.random.choice([True, False, None])
+        if kind == 4:
+            return self.random.randint(0, 9)
+        if kind == 5:
+            return [self.value(depth + 1) for _ in range(self.random.randint(0, 4))]
+        return {self.string(): self.value(depth + 1) for _ in range(self.random.randint(0, 4))}
+
+    def database(self):
+        return {self.string() or "_default": {str(doc_id): {self.string(): self.value(1)
+                                                           for _ in range(self.random.randint(0, 4))}
+                                              for doc_id in range(1, self.random.randint(1, 6))}
+                for _ in range(self.random.randint(0, 4))}
+
+    def dumps(self, value):
+        return json.dumps(value, ensure_ascii=self.random.random() < 0.5,
+                          indent=self.random.choice([None, 0, 2]),
+                          separators=self.random.choice([None, (",", ":"), (" , ", " : ")]))
+
+
+class TestStreaming(unittest.TestCase):
+
+    NB_FILES = 40
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "db.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def fuzzed_files(self):
+        for seed in range(self.NB_FILES):
+            fuzzer = Fuzzer(seed)
+            with open(self.path, "w", encoding="utf-8") as handle:
+                handle.write(fuzzer.dumps(fuzzer.database()))
+            with open(self.path, encoding="utf-8") as handle:
+                yield seed, json.load(handle)
+
+    def test_values_are_read_as_json_loads(self):
+        fuzzer = Fuzzer(0)
+        for _ in range(200):
+            text = fuzzer.dumps(fuzzer.value())
+            for chunk_size in CHUNK_SIZES:
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    reader = JSONStreamReader(io.StringIO(text), chunk_size)
+                    self.assertEqual(reader.read_value(), json.loads(text))
+                    self.assertEqual(reader.peek(), "")
+
+    def test_values_are_skipped(self):
+        fuzzer = Fuzzer(1)
+        for _ in range(200):
+            values = [fuzzer.value() for _ in range(3)]
+            text = fuzzer.dumps(values)
+            for chunk_size in CHUNK_SIZES:
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    reader = JSONStreamReader(io.StringIO(text), chunk_size)
+                    reader.expect("[")
+                    reader.skip_value()
+                    reader.expect(",")
+                    self.assertEqual(reader.read_value(), json.loads(text)[1])
+                    reader.expect(",")
+                    reader.skip_value()
+                    reader.expect("]")
+                    self.assertEqual(reader.peek(), "")
+
+    def test_tables_are_read_as_json_load(self):
+        for seed, expected in self.fuzzed_files():
+            for chunk_size in CHUNK_SIZES:
+                with self.subTest(seed=seed, chunk_size=chunk_size):
+                    tables = {name: dict(documents) for name, documents in iter_tables(self.path, chunk_size)}
+                    self.assertEqual(tables, expected)
+
+    def test_tables_partly_walked_or_skipped(self):
+        for seed, expected in self.fuzzed_files():
+            for chunk_size in CHUNK_SIZES:
+                with self.subTest(seed=seed, chunk_size=chunk_size):
+                    names = []
+                    for num, (name, documents) in enumerate(iter_tables(self.path, chunk_size)):
+                        names.append(name)
+                        if num % 2:
+                            self.assertEqual(next(documents, None), next(iter(expected[name].items()), None))
+                    self.assertEqual(names, list(expected))
+
+    def test_documents_of_a_table(self):
+        for seed, expected in self.fuzzed_files():
+            for name in expected:
+                for chunk_size in CHUNK_SIZES:
+                    with self.subTest(seed=seed, table=name, chunk_size=chunk_size):
+                        self.assertEqual(list(iter_documents(self.path, name, chunk_size)),
+                                         list(expected[name].values()))
+            self.assertEqual(list(iter_documents(self.path, "missing table")), [])
+
+    def test_empty_file(self):
+        open(self.path, "w").close()
+        self.assertEqual(list(iter_tables(self.path, 1)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()